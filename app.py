@@ -1,8 +1,14 @@
-from flask import Flask, send_from_directory, render_template_string, request, jsonify
+from flask import Flask, abort, render_template_string, request, jsonify, Response, g
+from flask.json.provider import DefaultJSONProvider
 import os
+import json
 import sys
+import time
 import logging
 from dotenv import load_dotenv
+import metrics
+from static_content import PrebuiltResponse, StaticAssets
+from smart_receipt_tracker.receipt_records import json_default as receipt_json_default
 
 # Add correct module paths (use underscores, not hyphens or mixed case)
 sys.path.append(os.path.join(os.path.dirname(__file__), 'seo_content_analyzer'))
@@ -13,24 +19,109 @@ logger = logging.getLogger(__name__)
 
 # Import SEO Content Analyzer
 try:
-    from seo_content_analyzer import get_seo_insights
+    from seo_content_analyzer import (
+        get_seo_insights, get_seo_insights_incremental, get_client_pool_stats, get_cache_stats
+    )
     logger.info("SEO Content Analyzer service imported successfully")
 except ImportError as e:
     logger.error(f"Could not import SEO Content Analyzer: {e}")
     def get_seo_insights(*args, **kwargs):
         raise ImportError("seo_content_analyzer.seo_content_processor not found")
+    get_seo_insights_incremental = get_seo_insights
+    def get_client_pool_stats():
+        return {}
+    def get_cache_stats():
+        return {}
 
 # Import Smart Receipt Tracker
 try:
-    from smart_receipt_tracker.smart_receipt_processor import process_receipt_image, process_multiple_receipts
+    from smart_receipt_tracker.smart_receipt_processor import (
+        process_receipt_file, process_multiple_receipts, submit_receipt_job, get_receipt_job,
+        compact_store, preprocessing_enabled,
+        get_processor_stats as get_receipt_processor_stats
+    )
+    from smart_receipt_tracker.receipt_jobs import JobExpiredError, JobQueueFullError
+    from smart_receipt_tracker.receipt_export import ExportFormatError, export_results
+    from smart_receipt_tracker.uploads import spool_upload
     logger.info("Document Intelligence service imported successfully")
 except ImportError as e:
     logger.warning(f"Document Intelligence service not available: {e}")
+    def get_receipt_processor_stats():
+        return {}
+    def compact_store():
+        pass
+    def preprocessing_enabled():
+        return False
+    class JobQueueFullError(Exception):
+        pass
+    class JobExpiredError(Exception):
+        pass
+    class ExportFormatError(Exception):
+        pass
 
 # Load environment variables
 load_dotenv(os.path.join(os.path.dirname(__file__), 'smart_receipt_tracker', '.env'))
 
+class JSONProvider(DefaultJSONProvider):
+    # Receipt records serialize to their API shape wherever jsonify meets them
+    @staticmethod
+    def default(o):
+        try:
+            return receipt_json_default(o)
+        except TypeError:
+            return DefaultJSONProvider.default(o)
+
 app = Flask(__name__)
+app.json = JSONProvider(app)
+
+# The only files served from the repo root; everything else there (source, .env files) is never exposed
+STATIC_MANIFEST = [
+    'README.md',
+    'meeting-analyst/README.md',
+    'serverless-chatbot/README.md',
+    'image-captioning-app/README.md',
+    'smart_receipt_tracker/README.md',
+    'seo_content_analyzer/README.md',
+]
+static_assets = StaticAssets(os.path.dirname(os.path.abspath(__file__)), STATIC_MANIFEST)
+# Templates link files through asset_url() so browsers cache them as immutable until their content changes
+app.jinja_env.globals['asset_url'] = static_assets.url
+
+# Per-route latency histograms for /metrics; the hooks are not installed at all when metrics are disabled
+if metrics.ENABLED:
+    @app.before_request
+    def _start_request_timer():
+        g.request_started = time.perf_counter()
+
+    @app.after_request
+    def _record_request_latency(response):
+        started = g.pop('request_started', None)
+        if started is not None:
+            # Streamed responses are timed until their first byte, not until the stream ends
+            route = request.url_rule.rule if request.url_rule else 'unmatched'
+            metrics.observe("http_request_duration_seconds", time.perf_counter() - started,
+                            route=route, method=request.method, status=str(response.status_code))
+        return response
+
+def _collect_service_metrics():
+    # Cache hit ratios and pipeline state, read from the services' stats at scrape time
+    for name, stats in get_cache_stats().items():
+        yield "cache_hit_ratio", {"cache": f"seo_{name}"}, stats.get("hit_ratio")
+    yield "azure_connection_reuse_ratio", {"service": "text_analytics"}, get_client_pool_stats().get("reuse_ratio")
+
+    receipt = get_receipt_processor_stats()
+    for name, stats in receipt.get("cache", {}).items():
+        yield "cache_hit_ratio", {"cache": f"receipt_{name}"}, stats.get("hit_ratio")
+    yield "receipt_concurrency_limit", {}, receipt.get("rate_limiter", {}).get("limit")
+    yield "receipt_analyses_in_flight", {}, receipt.get("rate_limiter", {}).get("in_flight")
+    yield "receipt_queued_files", {}, receipt.get("jobs", {}).get("queued_files")
+
+metrics.register_collector(_collect_service_metrics)
+metrics.describe("cache_hit_ratio", "gauge", "Cache hits over lookups since the worker started")
+metrics.describe("azure_connection_reuse_ratio", "gauge", "Share of Azure HTTP requests sent on a reused connection")
+metrics.describe("receipt_concurrency_limit", "gauge", "Current adaptive limit on concurrent receipt analyses")
+metrics.describe("receipt_analyses_in_flight", "gauge", "Receipt analyses currently holding a limiter slot")
+metrics.describe("receipt_queued_files", "gauge", "Receipt files queued or running in background jobs")
 
 # Template for the main portfolio page
 portfolio_template = """
@@ -292,19 +383,19 @@ portfolio_template = """
             <div class="project-card">
                 <h3>Meeting Analyst</h3>
                 <p>Convert meetings into structured insights with Azure Speech-to-Text. Automatically transcribe, analyze sentiment, and extract key action items from recordings.</p>
-                <a href="/meeting-analyst" class="project-link">Discover</a>
+                <a href="{{ asset_url('meeting-analyst/README.md') }}" class="project-link">Discover</a>
             </div>
             
             <div class="project-card">
                 <h3>Serverless Chatbot</h3>
                 <p>Intelligent conversational AI built with Azure Bot Framework. Natural language understanding, context-aware responses, and seamless integration with Azure services.</p>
-                <a href="/serverless-chatbot" class="project-link">Chat Now</a>
+                <a href="{{ asset_url('serverless-chatbot/README.md') }}" class="project-link">Chat Now</a>
             </div>
             
             <div class="project-card">
                 <h3>Image Captioning App</h3>
                 <p>Automatically generate descriptive captions for images using Azure Computer Vision. Perfect for accessibility, content creation, and image analysis workflows.</p>
-                <a href="/image-captioning-app" class="project-link">Try It</a>
+                <a href="{{ asset_url('image-captioning-app/README.md') }}" class="project-link">Try It</a>
             </div>
         </div>
     </div>
@@ -580,6 +671,29 @@ smart_receipt_template = """
             return parseFloat((bytes / Math.pow(k, i)).toFixed(2)) + ' ' + sizes[i];
         }
 
+        // Downscale and grayscale photos before upload when the server applies the same normalization
+        const SHRINK_UPLOADS = {{ 'true' if shrink_uploads else 'false' }};
+        const MAX_UPLOAD_DIMENSION = 2048;
+        async function shrinkImage(file) {
+            if (!SHRINK_UPLOADS || !file.type.startsWith('image/') || !window.createImageBitmap) return file;
+            try {
+                const bitmap = await createImageBitmap(file, { imageOrientation: 'from-image' });
+                const scale = Math.min(1, MAX_UPLOAD_DIMENSION / Math.max(bitmap.width, bitmap.height));
+                const canvas = document.createElement('canvas');
+                canvas.width = Math.round(bitmap.width * scale);
+                canvas.height = Math.round(bitmap.height * scale);
+                const ctx = canvas.getContext('2d');
+                ctx.filter = 'grayscale(1)';
+                ctx.drawImage(bitmap, 0, 0, canvas.width, canvas.height);
+                bitmap.close();
+                const blob = await new Promise(resolve => canvas.toBlob(resolve, 'image/jpeg', 0.8));
+                if (!blob || blob.size >= file.size) return file;
+                return new File([blob], file.name, { type: 'image/jpeg' });
+            } catch (error) {
+                return file;
+            }
+        }
+
         // Single receipt processing
         async function processReceipt() {
             const file = fileInput.files[0];
@@ -591,7 +705,7 @@ smart_receipt_template = """
 
             try {
                 const formData = new FormData();
-                formData.append('file', file);
+                formData.append('file', await shrinkImage(file));
                 
                 const response = await fetch('/api/process_receipt', {
                     method: 'POST',
@@ -602,6 +716,11 @@ smart_receipt_template = """
                 
                 if (result.error) {
                     displayError(result.error);
+                } else if (result.results) {
+                    // Several receipts in one file
+                    bulkProcessingResults = result;
+                    displayBulkResults(result);
+                    downloadBtn.disabled = false;
                 } else {
                     displayResults(result);
                 }
@@ -625,20 +744,50 @@ smart_receipt_template = """
 
             try {
                 const formData = new FormData();
-                for (let i = 0; i < files.length; i++) {
-                    formData.append('files', files[i]);
+                const uploads = await Promise.all(Array.from(files, shrinkImage));
+                for (let i = 0; i < uploads.length; i++) {
+                    formData.append('files', uploads[i]);
                 }
                 
-                const response = await fetch('/api/process_multiple', {
+                const response = await fetch('/api/process_multiple?stream=1', {
                     method: 'POST',
                     body: formData
                 });
 
-                const result = await response.json();
+                if (!response.ok || !response.body) {
+                    const result = await response.json();
+                    displayError(result.error || 'Processing failed');
+                    return;
+                }
+
+                // Results arrive as NDJSON lines in completion order; render each one as it lands.
+                // A file holding several receipts sends one line per receipt under the same index.
+                const perFile = new Array(files.length).fill(null);
+                const result = { results: perFile };
                 bulkProcessingResults = result;
+                const reader = response.body.getReader();
+                const decoder = new TextDecoder();
+                let buffered = '';
+                while (true) {
+                    const { value, done } = await reader.read();
+                    if (done) break;
+                    buffered += decoder.decode(value, { stream: true });
+                    const lines = buffered.split('\\n');
+                    buffered = lines.pop();
+                    for (const line of lines) {
+                        if (!line.trim()) continue;
+                        const message = JSON.parse(line);
+                        if (message.error) throw new Error(message.error);
+                        if (message.done) continue;
+                        perFile[message.index] = (perFile[message.index] || []).concat([message.result]);
+                        result.results = perFile.flatMap(receipts => receipts || [null]);
+                        displayBulkResults(result);
+                    }
+                }
+                result.results = result.results.filter(receipt => receipt);
                 displayBulkResults(result);
                 downloadBtn.disabled = false;
-                
+
             } catch (error) {
                 displayError('Network error: ' + error.message);
             } finally {
@@ -691,8 +840,11 @@ smart_receipt_template = """
             let totalAmounts = {}; // Store totals by currency
             let successCount = 0;
             
+            // Entries are null while a streamed batch is still processing
+            const pendingCount = data.results.filter(receipt => !receipt).length;
+            
             data.results.forEach(receipt => {
-                if (receipt.success && receipt.total) {
+                if (receipt && receipt.success && receipt.total) {
                     // Extract currency and amount from strings like "CHF 54.50" or "$ 117.00"
                     const totalStr = receipt.total.trim();
                     console.log('Processing total:', totalStr); // Debug log
@@ -732,11 +884,12 @@ smart_receipt_template = """
             let html = `
                 <div style="background: linear-gradient(45deg, #28a745, #20c997); color: white; padding: 15px; border-radius: 8px; text-align: center; margin-bottom: 15px;">
                     <h4 style="margin: 0 0 5px 0; font-size: 1.1rem;">Total Amount: ${totalDisplay}</h4>
-                    <p style="margin: 0; font-size: 0.85rem; opacity: 0.9;">Successfully processed: ${successCount} out of ${data.results.length} receipts</p>
+                    <p style="margin: 0; font-size: 0.85rem; opacity: 0.9;">Successfully processed: ${successCount} out of ${data.results.length} receipts${pendingCount ? ` (${pendingCount} still processing)` : ''}</p>
                 </div>
             `;
             
             data.results.forEach((receipt, index) => {
+                if (!receipt) return;
                 const statusColor = receipt.success ? '#28a745' : '#dc3545';
                 const statusIcon = receipt.success ? 'Success' : 'Error';
                 
@@ -1046,6 +1199,7 @@ seo_content_analyzer_template = """
                                 </li>
                                 <li>
                                     <strong>Tone Consistency:</strong> ${data.tone_consistent ? "<span style='color:#28a745;'>Consistent</span>" : "<span style='color:#dc3545;'>Inconsistent</span>"}
+                                    ${data.tone_partial ? `<span style="font-size:0.9em;color:#888;">Some sentences could not be analyzed.</span>` : ""}
                                 </li>
                                 <li>
                                     <strong>Long Sentences (&gt;25 words):</strong> <span style="color:#dc3545;">${data.long_sentences.length}</span>
@@ -1090,18 +1244,26 @@ seo_content_analyzer_template = """
 </html>
 """
 
+# The page templates only use startup settings: render each once and serve the precompressed bytes
+with app.app_context():
+    portfolio_page = PrebuiltResponse(render_template_string(portfolio_template), 'text/html')
+    smart_receipt_page = PrebuiltResponse(
+        render_template_string(smart_receipt_template, shrink_uploads=preprocessing_enabled()), 'text/html'
+    )
+    seo_content_analyzer_page = PrebuiltResponse(render_template_string(seo_content_analyzer_template), 'text/html')
+
 # Routes
 @app.route('/')
 def portfolio():
-    return render_template_string(portfolio_template)
+    return portfolio_page.response()
 
 @app.route('/smart-receipt-tracker')
 def smart_receipt_tracker():
-    return render_template_string(smart_receipt_template)
+    return smart_receipt_page.response()
 
 @app.route('/seo-content-analyzer')
 def seo_content_analyzer_alias():
-    return render_template_string(seo_content_analyzer_template)
+    return seo_content_analyzer_page.response()
 
 @app.route('/api/process_receipt', methods=['POST', 'OPTIONS'])
 def process_receipt():
@@ -1120,14 +1282,19 @@ def process_receipt():
         if file.filename == '':
             return jsonify({"error": "No file selected"}), 400
 
-        # Read and process file
-        image_data = file.read();
-        result = process_receipt_image(image_data, file.filename);
+        # Spool and hash the upload in chunks rather than reading it into memory
+        with spool_upload(file.stream, file.filename) as upload:
+            records = process_receipt_file(upload, file.filename);
 
         # Debug: log what we're sending to frontend
-        logger.info(f"Sending to frontend: {result}")
+        logger.info(f"Sending to frontend: {records}")
         
-        response = jsonify(result);
+        # A file holding several receipts (a multi-page PDF, a photo of a few slips) gets the bulk response shape
+        if len(records) == 1:
+            body = records[0].to_json()
+        else:
+            body = '{"results":[' + ",".join(record.to_json() for record in records) + ']}'
+        response = Response(body, mimetype='application/json')
         response.headers.add('Access-Control-Allow-Origin', '*');
         return response;
 
@@ -1147,64 +1314,220 @@ def process_multiple():
         return response
 
     try:
-        if 'files' not in request.files:
-            return jsonify({"error": "No files provided"}), 400
-
-        files = request.files.getlist('files')
-        if not files or all(f.filename == '' for f in files):
-            return jsonify({"error": "No files selected"}), 400
-
-        # Prepare images data for processing
-        images_data = []
-        for file in files:
-            if file.filename == '':
-                continue
-            images_data.append({
-                'filename': file.filename,
-                'data': file.read()
-            })
+        images_data, error = _read_uploaded_files()
+        if error:
+            return jsonify({"error": error}), 400
+
+        # ?stream=1 (or Accept: application/x-ndjson) sends each receipt as soon as it finishes;
+        # the job is queued before the response starts, so a full queue still gets its 503. It is
+        # retained like an API job, so the job_id in the last line can be passed to the export
+        if request.args.get('stream') == '1' or request.accept_mimetypes.best == 'application/x-ndjson':
+            job = submit_receipt_job(images_data)
+            return _ndjson_results_response(job.iter_results(), len(images_data), job.id)
 
         result = process_multiple_receipts(images_data);
 
-        response = jsonify(result);
+        response = Response(
+            '{"results":[' + ",".join(record.to_json() for record in result["results"]) + ']}',
+            mimetype='application/json'
+        )
         response.headers.add('Access-Control-Allow-Origin', '*');
         return response;
 
+    except JobQueueFullError as e:
+        response = jsonify({"error": str(e)})
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        return response, 503
     except Exception as e:
         logger.error(f"Error processing multiple receipts: {e}")
         response = jsonify({"error": "An unexpected error occurred"})
         response.headers.add('Access-Control-Allow-Origin', '*')
         return response, 500
 
+def _read_uploaded_files():
+    """Collect the 'files' uploads as processor input; returns (images_data, error)"""
+    if 'files' not in request.files:
+        return None, "No files provided"
+
+    files = request.files.getlist('files')
+    if not files or all(f.filename == '' for f in files):
+        return None, "No files selected"
+
+    # Spool each upload so a batch never holds every file's bytes in memory at once;
+    # the spools outlive the request and the job deletes each one after its receipt is processed
+    images_data = []
+    for file in files:
+        if file.filename == '':
+            continue
+        images_data.append({
+            'filename': file.filename,
+            'data': spool_upload(file.stream, file.filename)
+        })
+    return images_data, None
+
+@app.route('/api/jobs', methods=['POST', 'OPTIONS'])
+def create_receipt_job():
+    if request.method == 'OPTIONS':
+        response = jsonify({})
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        response.headers.add('Access-Control-Allow-Headers', 'Content-Type')
+        response.headers.add('Access-Control-Allow-Methods', 'POST, OPTIONS')
+        return response
+
+    try:
+        images_data, error = _read_uploaded_files()
+        if error:
+            return jsonify({"error": error}), 400
+
+        job = submit_receipt_job(images_data)
+        response = jsonify({
+            "job_id": job.id,
+            "total": job.total,
+            "status_url": f"/api/jobs/{job.id}",
+            "stream_url": f"/api/jobs/{job.id}/stream"
+        })
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        return response, 202
+
+    except JobQueueFullError as e:
+        response = jsonify({"error": str(e)})
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        return response, 503
+    except Exception as e:
+        logger.error(f"Error creating receipt job: {e}")
+        response = jsonify({"error": "An unexpected error occurred"})
+        response.headers.add('Access-Control-Allow-Origin', '*')
+        return response, 500
+
+@app.route('/api/jobs/<job_id>')
+def receipt_job_status(job_id):
+    # Poll with ?since=<next from the previous response> to receive only newly finished files
+    job = get_receipt_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found or expired"}), 404
+    response = jsonify(job.status(since=request.args.get('since', 0, type=int)))
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    return response
+
+@app.route('/api/jobs/<job_id>/stream')
+def receipt_job_stream(job_id):
+    # NDJSON: one {"index", "result"} line per file as it finishes, then a final {"done": true}
+    job = get_receipt_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found or expired"}), 404
+
+    return _ndjson_results_response(job.iter_results(), job.total, job.id)
+
+def _ndjson_results_response(results, total, job_id):
+    """Stream (index, result) pairs as NDJSON lines, ending with {"done": true} or {"error": ...}"""
+    def generate():
+        try:
+            for index, result in results:
+                yield f'{{"index":{index},"result":{result.to_json()}}}\n'
+        except JobExpiredError as e:
+            yield json.dumps({"error": str(e), "job_id": job_id}) + "\n"
+            return
+        yield json.dumps({"done": True, "total": total, "job_id": job_id}) + "\n"
+
+    response = Response(generate(), mimetype='application/x-ndjson')
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    response.headers['Cache-Control'] = 'no-cache'
+    response.headers['X-Accel-Buffering'] = 'no'  # keep reverse proxies from buffering the stream
+    return response
+
+@app.route('/api/receipts/stats')
+def receipt_stats():
+    # Per-worker numbers: each gunicorn worker process keeps its own cache, queue and limiter
+    return jsonify(get_receipt_processor_stats())
+
+@app.route('/api/receipts/export')
+def export_receipts():
+    # ?job_id= (required), ?format=csv|arrow|parquet, ?rows=receipt|item. Only a job the caller
+    # created is exported: the shared result store holds every visitor's receipts
+    job_id = request.args.get('job_id')
+    if not job_id:
+        return jsonify({"error": "job_id is required"}), 400
+    job = get_receipt_job(job_id)
+    if job is None:
+        return jsonify({"error": "Job not found or expired"}), 404
+    # If the job expires mid-export, JobExpiredError ends the stream without its final chunk, so the
+    # download fails visibly instead of arriving as a complete-looking but truncated file
+    results = (result.to_dict() for _, result in job.iter_results())
+
+    try:
+        chunks, mimetype, extension, compressed = export_results(
+            results,
+            fmt=request.args.get('format', 'csv'),
+            per=request.args.get('rows', 'receipt'),
+            compress=request.accept_encodings['gzip'] > 0,
+        )
+    except ExportFormatError as e:
+        return jsonify({"error": str(e)}), 400
+
+    response = Response(chunks, mimetype=mimetype)
+    response.headers.add('Access-Control-Allow-Origin', '*')
+    response.headers['Content-Disposition'] = f'attachment; filename="receipts_{time.strftime("%Y-%m-%d")}.{extension}"'
+    if compressed:
+        response.headers['Content-Encoding'] = 'gzip'
+    response.vary.add('Accept-Encoding')
+    response.headers['X-Accel-Buffering'] = 'no'
+    return response
+
 @app.route('/meeting-analyst')
 def meeting_analyst():
-    return send_from_directory('meeting-analyst', 'README.md')
+    return static_assets.response('meeting-analyst/README.md')
 
 @app.route('/serverless-chatbot')
 def serverless_chatbot():
-    return send_from_directory('serverless-chatbot', 'README.md')
+    return static_assets.response('serverless-chatbot/README.md')
 
 @app.route('/image-captioning-app')
 def image_captioning_app():
-    return send_from_directory('image-captioning-app', 'README.md')
+    return static_assets.response('image-captioning-app/README.md')
 
 @app.route('/api/seo-insights', methods=['POST'])
 def seo_insights_route():
     data = request.get_json()
     content = data.get("content", "");
-    if not content:
+    if not content.strip():
         return jsonify({"error": "No content provided"}), 400
     try:
-        insights = get_seo_insights(content)
+        # Incremental mode only re-sends changed paragraphs; previous_token comes from the last response
+        previous_token = data.get("previous_token")
+        if data.get("incremental") or previous_token:
+            insights = get_seo_insights_incremental(content, previous_token=previous_token)
+        else:
+            insights = get_seo_insights(content)
         return jsonify(insights)
     except Exception as e:
         logger.error(f"SEO Insights error: {e}", exc_info=True)  # Add this for full traceback
         return jsonify({"error": str(e)}), 500
 
-# Serve static files
+@app.route('/api/seo-insights/stats')
+def seo_insights_stats():
+    # Per-worker numbers: each gunicorn worker process keeps its own client pool
+    return jsonify({"client_pool": get_client_pool_stats(), "cache": get_cache_stats()})
+
+@app.route('/metrics')
+def metrics_route():
+    # Prometheus text format; each gunicorn worker reports only its own numbers
+    if not metrics.ENABLED:
+        return jsonify({"error": "Metrics are disabled"}), 404
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+# Serve static files from the manifest; versioned URLs (see static_assets.url) are cached as immutable
+@app.route('/static/<version>/<path:filename>')
+def serve_versioned_static(version, filename):
+    return static_assets.response(filename, version) or abort(404)
+
 @app.route('/<path:filename>')
 def serve_static(filename):
-    return send_from_directory('.', filename)
+    return static_assets.response(filename) or abort(404)
+
+@app.cli.command('compact-receipt-store')
+def compact_receipt_store_command():
+    """Evict over-budget receipts and compact the persistent result store now"""
+    compact_store()
 
 if __name__ == '__main__':
     app.run(debug=True)
\ No newline at end of file
@@ -0,0 +1,285 @@
+"""Local stand-ins for the Azure clients used by the benchmark scripts.
+
+The fakes mimic the response shapes the analyzers read and sleep for a
+configurable round-trip latency, so benchmarks can run without credentials.
+"""
+import asyncio
+import io
+import re
+import threading
+import time
+from collections import Counter
+from types import SimpleNamespace
+
+_POSITIVE_WORDS = {"great", "love", "best", "easy", "fast", "happy", "excellent", "improve"}
+_NEGATIVE_WORDS = {"bad", "slow", "hard", "broken", "worst", "angry", "fail", "problem"}
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+def _label(text):
+    words = set(re.findall(r"[a-z]+", text.lower()))
+    positive = len(words & _POSITIVE_WORDS)
+    negative = len(words & _NEGATIVE_WORDS)
+    if positive and negative:
+        return "mixed"
+    if positive:
+        return "positive"
+    if negative:
+        return "negative"
+    return "neutral"
+
+
+def _scores(label):
+    return SimpleNamespace(
+        positive=0.9 if label == "positive" else 0.05,
+        neutral=0.9 if label == "neutral" else 0.05,
+        negative=0.9 if label == "negative" else 0.05,
+    )
+
+
+class FakeTextAnalyticsClient:
+    """Thread-safe fake TextAnalyticsClient that counts round trips"""
+
+    # Synchronous per-request document limits of the real service; analyze actions jobs take 25
+    max_documents = {
+        "analyze_sentiment": 10,
+        "extract_key_phrases": 10,
+        "recognize_entities": 5,
+        "begin_analyze_actions": 25,
+    }
+    max_characters = 50000
+
+    def __init__(self, latency=0.05, per_document_latency=0.002, job_overhead=0.0, supports_actions=True):
+        self.latency = latency
+        self.per_document_latency = per_document_latency
+        self.job_overhead = job_overhead
+        self.supports_actions = supports_actions
+        self.calls = Counter()
+        self._lock = threading.Lock()
+
+    @property
+    def round_trips(self):
+        return sum(self.calls.values())
+
+    def _round_trip(self, operation, documents):
+        limit = self.max_documents[operation]
+        if len(documents) > limit:
+            raise ValueError(f"{operation}: {len(documents)} documents exceeds the limit of {limit}")
+        if sum(len(d) for d in documents) > self.max_characters:
+            raise ValueError(f"{operation}: request exceeds {self.max_characters} characters")
+        with self._lock:
+            self.calls[operation] += 1
+        time.sleep(self.latency + self.per_document_latency * len(documents))
+
+    def analyze_sentiment(self, documents, **kwargs):
+        self._round_trip("analyze_sentiment", documents)
+        results = []
+        for index, document in enumerate(documents):
+            sentences = [
+                SimpleNamespace(text=s, sentiment="neutral" if _label(s) == "mixed" else _label(s),
+                                confidence_scores=_scores(_label(s)))
+                for s in _SENTENCE_SPLIT.split(document) if s.strip()
+            ]
+            label = _label(document)
+            results.append(SimpleNamespace(
+                id=str(index), is_error=False, sentiment=label,
+                confidence_scores=_scores(label), sentences=sentences,
+            ))
+        return results
+
+    def extract_key_phrases(self, documents, **kwargs):
+        self._round_trip("extract_key_phrases", documents)
+        results = []
+        for index, document in enumerate(documents):
+            phrases = re.findall(r"\b[a-z]+ [a-z]+ing\b|\b[a-z]+ (?:content|search|traffic)\b", document.lower())
+            results.append(SimpleNamespace(id=str(index), is_error=False, key_phrases=phrases))
+        return results
+
+    def recognize_entities(self, documents, **kwargs):
+        self._round_trip("recognize_entities", documents)
+        results = []
+        for index, document in enumerate(documents):
+            entities = [
+                SimpleNamespace(text=match, category="Organization", confidence_score=0.95)
+                for match in re.findall(r"\b[A-Z][a-z]+(?: [A-Z][a-z]+)+\b", document)
+            ]
+            results.append(SimpleNamespace(id=str(index), is_error=False, entities=entities))
+        return results
+
+    def begin_analyze_actions(self, documents, actions, **kwargs):
+        if not self.supports_actions:
+            raise AttributeError("begin_analyze_actions is not supported by this fake")
+        self._round_trip("begin_analyze_actions", documents)
+        handlers = {
+            "ExtractKeyPhrasesAction": self.extract_key_phrases,
+            "AnalyzeSentimentAction": self.analyze_sentiment,
+            "RecognizeEntitiesAction": self.recognize_entities,
+        }
+        # The job's own limit applies to every action in it
+        fake = FakeTextAnalyticsClient(latency=0, per_document_latency=0)
+        fake.max_documents = dict.fromkeys(self.max_documents, self.max_documents["begin_analyze_actions"])
+        per_action = [getattr(fake, handlers[type(a).__name__].__name__)(documents) for a in actions]
+        return _FakePoller([list(results) for results in zip(*per_action)], self.job_overhead)
+
+
+class _FakePoller:
+    def __init__(self, value, delay):
+        self._value = value
+        self._delay = delay
+
+    def result(self):
+        # The service runs the actions in parallel; polling adds a fixed overhead on top
+        time.sleep(self._delay)
+        return iter(self._value)
+
+
+_ARTICLE_SENTENCES = [
+    "Search engines reward pages that answer questions quickly.",
+    "Our team at Contoso Media found that short intros improve engagement!",
+    "Slow pages are a problem for organic traffic.",
+    "Writing for people first is still the best strategy.",
+    "Broken links make crawling hard for search bots.",
+    "Keyword stuffing content rarely helps rankings.",
+    "Internal linking helps readers discover related guides.",
+    "Do you measure dwell time on every landing page?",
+]
+
+
+def make_article(sentence_count, sentences_per_paragraph=5):
+    """Build a deterministic markdown article with the given number of sentences"""
+    sentences = [_ARTICLE_SENTENCES[i % len(_ARTICLE_SENTENCES)] for i in range(sentence_count)]
+    paragraphs = [
+        " ".join(sentences[i:i + sentences_per_paragraph])
+        for i in range(0, len(sentences), sentences_per_paragraph)
+    ]
+    return "# Technical SEO checklist\n\n" + "\n\n".join(paragraphs) + "\n\nContact us to learn more."
+
+
+def _currency_field(amount, symbol="$"):
+    return SimpleNamespace(
+        content=f"{symbol}{amount:.2f}",
+        value_currency={"amount": amount, "currencySymbol": symbol, "currencyCode": "USD"},
+    )
+
+
+def make_receipt_result(merchant="Contoso Market", item_count=5, seed=0):
+    """Build an analyze result shaped like the prebuilt-receipt model output"""
+    items = []
+    total = 0.0
+    for index in range(item_count):
+        price = round(1.25 + ((index + seed) * 7 % 40) / 4, 2)
+        total += price
+        items.append(SimpleNamespace(value_object={
+            "Description": SimpleNamespace(content=f"Item {(index + seed) % max(item_count // 2, 1)}"),
+            "TotalPrice": _currency_field(price),
+            "Quantity": SimpleNamespace(content=None, value_number=1),
+        }))
+    fields = {
+        "MerchantName": SimpleNamespace(content=merchant),
+        "Total": _currency_field(round(total, 2)),
+        "TransactionDate": SimpleNamespace(content="2024-03-14"),
+        "Items": SimpleNamespace(value_array=items),
+    }
+    return SimpleNamespace(documents=[SimpleNamespace(fields=fields)])
+
+
+def fake_ocr_text(image_bytes, seconds=0.2):
+    """Stand-in for Tesseract: spends `seconds` of CPU time and returns the text of a printed receipt"""
+    deadline = time.process_time() + seconds
+    while time.process_time() < deadline:
+        pass
+    seed = sum(image_bytes[:64]) % 40
+    prices = [round(1.25 + ((index + seed) * 7 % 40) / 4, 2) for index in range(5)]
+    lines = ["CONTOSO MARKET", "123 Main Street, Redmond", f"03/14/2024 12:{seed:02d}"]
+    lines += [f"Item {index}    ${price:.2f}" for index, price in enumerate(prices)]
+    lines += [f"SUBTOTAL    ${sum(prices):.2f}", "TAX    $0.00", f"TOTAL    ${sum(prices):.2f}", "VISA    ****1234"]
+    return "\n".join(lines)
+
+
+class _FakeAnalyzePoller:
+    def __init__(self, result, latency):
+        self._result = result
+        self._latency = latency
+
+    def result(self):
+        time.sleep(self._latency)
+        return self._result
+
+
+class FakeDocumentIntelligenceClient:
+    """Thread-safe fake DocumentIntelligenceClient; each analysis takes `latency` seconds"""
+
+    def __init__(self, latency=0.5, item_count=5):
+        self.latency = latency
+        self.item_count = item_count
+        self.calls = 0
+        self.bytes_received = 0
+        self._lock = threading.Lock()
+
+    def begin_analyze_document(self, model_id, body, **kwargs):
+        # Consume file bodies in chunks, as the HTTP transport would when uploading them
+        size = 0
+        if hasattr(body, "read"):
+            while True:
+                chunk = body.read(64 * 1024)
+                if not chunk:
+                    break
+                size += len(chunk)
+        else:
+            size = len(body)
+        with self._lock:
+            self.calls += 1
+            self.bytes_received += size
+        return _FakeAnalyzePoller(make_receipt_result(item_count=self.item_count), self.latency)
+
+
+class FakePdfDocumentIntelligenceClient(FakeDocumentIntelligenceClient):
+    """Fake client for PDF uploads: one receipt per page, with analysis time growing with the page count"""
+
+    def __init__(self, latency=0.2, page_latency=0.3, item_count=5):
+        super().__init__(latency, item_count)
+        self.page_latency = page_latency
+        self.pages_received = 0
+
+    def begin_analyze_document(self, model_id, body, **kwargs):
+        from pypdf import PdfReader
+
+        data = body.read() if hasattr(body, "read") else body
+        # Each page's receipt is derived from its width, so a page gives the same receipt in any range
+        widths = [int(page.mediabox.width) for page in PdfReader(io.BytesIO(data)).pages]
+        with self._lock:
+            self.calls += 1
+            self.bytes_received += len(data)
+            self.pages_received += len(widths)
+        documents = [make_receipt_result(f"Merchant {width}", self.item_count, width).documents[0]
+                     for width in widths]
+        return _FakeAnalyzePoller(SimpleNamespace(documents=documents), self.latency + self.page_latency * len(widths))
+
+
+class _FakeAsyncAnalyzePoller:
+    def __init__(self, result, latency):
+        self._result = result
+        self._latency = latency
+
+    async def result(self):
+        await asyncio.sleep(self._latency)
+        return self._result
+
+
+class FakeAsyncDocumentIntelligenceClient:
+    """Fake of the aio DocumentIntelligenceClient; each analysis takes `latency` seconds"""
+
+    def __init__(self, latency=0.5, item_count=5):
+        self.latency = latency
+        self.item_count = item_count
+        self.calls = 0
+
+    async def begin_analyze_document(self, model_id, body, **kwargs):
+        self.calls += 1
+        return _FakeAsyncAnalyzePoller(make_receipt_result(item_count=self.item_count), self.latency)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        pass
@@ -0,0 +1,286 @@
+"""Load-test the Flask endpoints under several gunicorn worker/thread configurations.
+
+Starts gunicorn on loadtest_app.py (app.py with replayed Azure backends) once
+per configuration, drives /api/process_receipt, /api/process_multiple and
+/api/seo-insights with a weighted request mix from concurrent clients, and
+reports requests per second, latency percentiles and the peak RSS of every
+worker process. RSS is read from /proc, so worker memory is reported on Linux
+only. Usage:
+
+    python benchmarks/loadtest.py [--configs sync:2x1 gthread:2x8] [--mix receipt=4,multiple=1,seo=5]
+                                  [--concurrency 32] [--duration 20] [--save results.json]
+"""
+import argparse
+import json
+import math
+import os
+import random
+import signal
+import socket
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+sys.path.append(os.path.dirname(__file__))
+
+from fakes import make_article  # noqa: E402
+
+DEFAULT_CONFIGS = ["sync:2x1", "sync:4x1", "gthread:2x4", "gthread:2x8", "gthread:4x8"]
+
+
+def parse_config(text):
+    # "gthread:4x8" -> ("gthread", 4 workers, 8 threads)
+    worker_class, _, shape = text.partition(":")
+    workers, _, threads = shape.partition("x")
+    return worker_class, int(workers), int(threads or 1)
+
+
+def parse_mix(text):
+    mix = {}
+    for part in text.split(","):
+        name, _, weight = part.partition("=")
+        mix[name.strip()] = float(weight)
+    unknown = set(mix) - set(REQUESTS)
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown request types: {', '.join(sorted(unknown))}")
+    return mix
+
+
+def percentile(sorted_values, p):
+    return sorted_values[max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))]
+
+
+def latency_summary(timings):
+    timings = sorted(timings)
+    if not timings:
+        return {"requests": 0}
+    return {
+        "requests": len(timings),
+        "p50_ms": round(percentile(timings, 50) * 1000, 1),
+        "p95_ms": round(percentile(timings, 95) * 1000, 1),
+        "p99_ms": round(percentile(timings, 99) * 1000, 1),
+    }
+
+
+def receipt_image(counter):
+    # Unique bytes per upload so the result cache never answers in place of the stubbed service
+    return f"load test receipt {counter} {time.time_ns()}".encode() * 64
+
+
+def send_receipt(session, base_url, counter, args):
+    files = {"file": (f"receipt-{counter}.jpg", receipt_image(counter), "image/jpeg")}
+    return session.post(f"{base_url}/api/process_receipt", files=files)
+
+
+def send_multiple(session, base_url, counter, args):
+    files = [("files", (f"receipt-{counter}-{i}.jpg", receipt_image(f"{counter}-{i}"), "image/jpeg"))
+             for i in range(args.batch_size)]
+    return session.post(f"{base_url}/api/process_multiple", files=files)
+
+
+def send_seo(session, base_url, counter, args):
+    content = f"{args.article}\n\nRequest {counter}."
+    return session.post(f"{base_url}/api/seo-insights", json={"content": content})
+
+
+REQUESTS = {"receipt": send_receipt, "multiple": send_multiple, "seo": send_seo}
+
+
+def worker_pids(master_pid):
+    pids = []
+    for entry in os.listdir("/proc"):
+        if not entry.isdigit():
+            continue
+        try:
+            with open(f"/proc/{entry}/stat") as f:
+                # The command name is parenthesised and may contain spaces; ppid is the 2nd field after it
+                if int(f.read().rsplit(")", 1)[1].split()[1]) == master_pid:
+                    pids.append(int(entry))
+        except (OSError, IndexError, ValueError):
+            continue
+    return pids
+
+
+def rss_mb(pid):
+    try:
+        with open(f"/proc/{pid}/status") as f:
+            for line in f:
+                if line.startswith("VmRSS:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_gunicorn(worker_class, workers, threads, port, args):
+    env = dict(os.environ,
+               LOADTEST_LATENCY=str(args.latency),
+               LOADTEST_ANALYSIS_SECONDS=str(args.analysis_seconds))
+    command = [
+        sys.executable, "-m", "gunicorn",
+        "--chdir", os.path.dirname(os.path.abspath(__file__)),
+        "--bind", f"127.0.0.1:{port}",
+        "--worker-class", worker_class,
+        "--workers", str(workers),
+        "--threads", str(threads),
+        "--timeout", "120",
+        "--log-level", "warning",
+        "loadtest_app:app",
+    ]
+    # Log to a file: an unread pipe fills up under load and blocks the workers on their next log line
+    log = tempfile.TemporaryFile()
+    process = subprocess.Popen(command, env=env, stdout=log, stderr=subprocess.STDOUT)
+    process.log = log
+    deadline = time.monotonic() + 60
+    while time.monotonic() < deadline:
+        if process.poll() is not None:
+            log.seek(0)
+            raise RuntimeError(f"gunicorn exited: {log.read().decode(errors='replace')[-2000:]}")
+        try:
+            requests.get(f"http://127.0.0.1:{port}/api/receipts/stats", timeout=1)
+            # Every worker must have booted, or the first seconds of the run measure imports
+            if len(worker_pids(process.pid)) >= workers:
+                return process
+        except requests.RequestException:
+            pass
+        time.sleep(0.2)
+    process.kill()
+    raise RuntimeError("gunicorn did not start within 60s")
+
+
+def stop_gunicorn(process):
+    process.send_signal(signal.SIGTERM)
+    try:
+        process.wait(timeout=30)
+    except subprocess.TimeoutExpired:
+        process.kill()
+        process.wait()
+    process.log.close()
+
+
+def run_load(base_url, args):
+    names = list(args.mix)
+    weights = [args.mix[name] for name in names]
+    timings = defaultdict(list)
+    errors = defaultdict(int)
+    counter = iter(range(sys.maxsize))
+    lock = threading.Lock()
+    deadline = time.monotonic() + args.duration
+
+    def client(seed):
+        rng = random.Random(seed)
+        session = requests.Session()
+        while time.monotonic() < deadline:
+            name = rng.choices(names, weights)[0]
+            with lock:
+                number = next(counter)
+            start = time.perf_counter()
+            try:
+                response = REQUESTS[name](session, base_url, number, args)
+                ok = response.status_code == 200
+            except requests.RequestException:
+                ok = False
+            elapsed = time.perf_counter() - start
+            with lock:
+                if ok:
+                    timings[name].append(elapsed)
+                else:
+                    errors[name] += 1
+
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=args.concurrency) as executor:
+        list(executor.map(client, range(args.concurrency)))
+    return timings, errors, time.perf_counter() - start
+
+
+def run_config(config, args):
+    worker_class, workers, threads = parse_config(config)
+    port = free_port()
+    process = start_gunicorn(worker_class, workers, threads, port, args)
+    peak_rss = {}
+    sampling = threading.Event()
+
+    def sample_rss():
+        while not sampling.wait(0.5):
+            for pid in worker_pids(process.pid):
+                rss = rss_mb(pid)
+                if rss is not None:
+                    peak_rss[pid] = max(peak_rss.get(pid, 0), rss)
+
+    sampler = threading.Thread(target=sample_rss, daemon=True)
+    sampler.start()
+    try:
+        timings, errors, elapsed = run_load(f"http://127.0.0.1:{port}", args)
+    finally:
+        sampling.set()
+        sampler.join()
+        stop_gunicorn(process)
+
+    all_timings = [t for values in timings.values() for t in values]
+    return {
+        "config": config,
+        "worker_class": worker_class,
+        "workers": workers,
+        "threads": threads,
+        "rps": round(len(all_timings) / elapsed, 2),
+        "errors": sum(errors.values()),
+        "latency": latency_summary(all_timings),
+        "endpoints": {name: dict(latency_summary(timings[name]), errors=errors[name]) for name in args.mix},
+        "worker_rss_mb": sorted(round(rss, 1) for rss in peak_rss.values()),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--configs", nargs="+", default=DEFAULT_CONFIGS,
+                        help="worker_class:WORKERSxTHREADS, e.g. sync:4x1 or gthread:2x8")
+    parser.add_argument("--mix", type=parse_mix, default=parse_mix("receipt=4,multiple=1,seo=5"),
+                        help="relative weights of receipt, multiple and seo requests")
+    parser.add_argument("--concurrency", type=int, default=32, help="concurrent clients")
+    parser.add_argument("--duration", type=float, default=20, help="seconds of load per configuration")
+    parser.add_argument("--batch-size", type=int, default=4, help="files per /api/process_multiple request")
+    parser.add_argument("--sentences", type=int, default=60, help="sentences per SEO article")
+    parser.add_argument("--latency", type=float, default=0.05, help="replayed Azure round-trip latency")
+    parser.add_argument("--analysis-seconds", type=float, default=1.0,
+                        help="time before a replayed receipt analysis succeeds")
+    parser.add_argument("--save", help="write results to this JSON file")
+    args = parser.parse_args()
+    args.article = make_article(args.sentences)
+
+    results = []
+    print(f"{args.concurrency} clients for {args.duration:g}s per configuration, mix {args.mix}")
+    print(f"{'config':<14} {'rps':>7} {'errors':>6} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8}  worker RSS MB")
+    for config in args.configs:
+        result = run_config(config, args)
+        results.append(result)
+        latency = result["latency"]
+        print(f"{config:<14} {result['rps']:>7.1f} {result['errors']:>6} {latency.get('p50_ms', 0):>8.1f} "
+              f"{latency.get('p95_ms', 0):>8.1f} {latency.get('p99_ms', 0):>8.1f}  "
+              f"{', '.join(f'{rss:.0f}' for rss in result['worker_rss_mb'])}")
+
+    print(f"\n{'config':<14} " + " ".join(f"{name + ' p95 ms':>18}" for name in args.mix))
+    for result in results:
+        print(f"{result['config']:<14} " + " ".join(
+            f"{result['endpoints'][name].get('p95_ms', 0):>18.1f}" for name in args.mix))
+
+    if args.save:
+        settings = {k: v for k, v in vars(args).items() if k not in ("save", "article")}
+        with open(args.save, "w") as f:
+            json.dump({"settings": settings, "results": results}, f, indent=2)
+        print(f"\nsaved to {args.save}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+"""gunicorn entry point serving app.py with the Azure clients replaced by replay stubs.
+
+Used by loadtest.py (`gunicorn loadtest_app:app`). Each worker imports this
+module after forking, so each gets its own replay clients, just as each worker
+creates its own real clients. Replay latency comes from the environment:
+LOADTEST_LATENCY (seconds per round trip) and LOADTEST_ANALYSIS_SECONDS (time
+before a receipt analysis succeeds).
+"""
+import os
+import sys
+
+# Every request must reach the stubbed backends: no persistent store, no re-encoding of fake image bytes
+os.environ.setdefault("RECEIPT_STORE_PATH", "")
+os.environ.setdefault("RECEIPT_PREPROCESS", "false")
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'seo_content_analyzer'))
+
+import seo_content_analyzer  # noqa: E402
+from app import app  # noqa: E402
+from replay import replay_document_intelligence_client, replay_text_analytics_client  # noqa: E402
+from smart_receipt_tracker import smart_receipt_processor  # noqa: E402
+
+# gunicorn looks up loadtest_app:app
+__all__ = ["app"]
+
+_latency = float(os.environ.get("LOADTEST_LATENCY", "0.05"))
+_analysis_seconds = float(os.environ.get("LOADTEST_ANALYSIS_SECONDS", "1.0"))
+
+smart_receipt_processor._client, _ = replay_document_intelligence_client(_latency, _analysis_seconds)
+_text_analytics_client, _ = replay_text_analytics_client(_latency)
+seo_content_analyzer.get_text_analytics_client = lambda: _text_analytics_client
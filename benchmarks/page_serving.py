@@ -0,0 +1,66 @@
+"""Benchmark page-serving throughput and bytes sent: per-request rendering vs prebuilt pages.
+
+Drives the Flask app in-process with its test client, so only the worker's own
+cost is measured. Usage:
+
+    python benchmarks/page_serving.py [--requests 2000]
+"""
+import argparse
+import os
+import sys
+import time
+
+from flask import render_template_string
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+import app as portfolio_app  # noqa: E402
+
+PAGES = {
+    "/": portfolio_app.portfolio_template,
+    "/smart-receipt-tracker": portfolio_app.smart_receipt_template,
+    "/seo-content-analyzer": portfolio_app.seo_content_analyzer_template,
+}
+
+CLIENTS = {
+    "identity": {},
+    "gzip": {"Accept-Encoding": "gzip, deflate"},
+    "br": {"Accept-Encoding": "gzip, deflate, br"},
+}
+
+
+def rate(func, requests):
+    start = time.perf_counter()
+    sent = sum(func() for _ in range(requests))
+    elapsed = time.perf_counter() - start
+    return requests / elapsed, sent / requests
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=2000, help="requests per page and variant")
+    args = parser.parse_args()
+
+    client = portfolio_app.app.test_client()
+    print(f"{'page':<24} {'variant':<17} {'req/s':>9} {'bytes':>8}")
+    for path, template in PAGES.items():
+        def rendered():
+            # What every page hit used to cost: a Jinja render of the inline template
+            with portfolio_app.app.test_request_context(path):
+                return len(render_template_string(template).encode("utf-8"))
+
+        per_second, size = rate(rendered, args.requests)
+        print(f"{path:<24} {'rendered':<17} {per_second:>9.0f} {size:>8.0f}")
+
+        for name, headers in CLIENTS.items():
+            per_second, size = rate(lambda: len(client.get(path, headers=headers).data), args.requests)
+            print(f"{path:<24} {'prebuilt ' + name:<17} {per_second:>9.0f} {size:>8.0f}")
+
+        etag = client.get(path, headers=CLIENTS["br"]).headers["ETag"]
+        revalidate = dict(CLIENTS["br"], **{"If-None-Match": etag})
+        per_second, size = rate(lambda: len(client.get(path, headers=revalidate).data), args.requests)
+        print(f"{path:<24} {'304':<17} {per_second:>9.0f} {size:>8.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+"""Benchmark receipt batch throughput as in-flight concurrency grows.
+
+Compares the thread pool pipeline with the asyncio pipeline on fake Document
+Intelligence clients. Usage:
+
+    python benchmarks/receipt_async_concurrency.py [--receipts 64] [--latency 0.5]
+"""
+import argparse
+import asyncio
+import os
+import sys
+import time
+
+# Keep the benchmark off the persistent store so every receipt reaches the fake client, and pin the
+# adaptive limiter high so the pipelines themselves set the concurrency being measured
+os.environ["RECEIPT_STORE_PATH"] = ""
+os.environ["RECEIPT_CONCURRENCY_INITIAL"] = os.environ["RECEIPT_CONCURRENCY_MAX"] = "1024"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fakes import FakeAsyncDocumentIntelligenceClient, FakeDocumentIntelligenceClient  # noqa: E402
+from smart_receipt_tracker import smart_receipt_processor as processor  # noqa: E402
+from smart_receipt_tracker.async_processor import process_multiple_receipts_async  # noqa: E402
+from smart_receipt_tracker.receipt_jobs import ReceiptJobManager  # noqa: E402
+
+
+def make_batch(count, run):
+    # Unique bytes per receipt and per run, so caches never short-circuit the analysis
+    return [{"filename": f"receipt-{i}.jpg", "data": f"run {run} receipt {i}".encode()} for i in range(count)]
+
+
+def bench_threads(receipts, latency, workers, run):
+    processor._client = FakeDocumentIntelligenceClient(latency=latency)
+    manager = ReceiptJobManager(processor.process_receipt_file, max_workers=workers,
+                                max_queued_files=receipts)
+    start = time.perf_counter()
+    job = manager.submit(processor._build_tasks(make_batch(receipts, run)), retain=False)
+    results = job.ordered_results()
+    elapsed = time.perf_counter() - start
+    assert all(r.success for r in results)
+    return elapsed
+
+
+def bench_async(receipts, latency, concurrency, run):
+    client = FakeAsyncDocumentIntelligenceClient(latency=latency)
+    start = time.perf_counter()
+    output = asyncio.run(process_multiple_receipts_async(make_batch(receipts, run), concurrency, client=client))
+    elapsed = time.perf_counter() - start
+    assert all(r.success for r in output["results"])
+    return elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--receipts", type=int, default=64)
+    parser.add_argument("--latency", type=float, default=0.5, help="fake analysis time in seconds")
+    parser.add_argument("--concurrency", type=int, nargs="+", default=[4, 8, 16, 32, 64])
+    args = parser.parse_args()
+
+    print(f"{args.receipts} receipts, {args.latency:.2f}s per analysis")
+    print(f"{'pipeline':<9} {'in flight':>9} {'wall (s)':>9} {'receipts/s':>11}")
+    run = 0
+    for concurrency in args.concurrency:
+        for name, bench in (("threads", bench_threads), ("async", bench_async)):
+            run += 1
+            elapsed = bench(args.receipts, args.latency, concurrency, run)
+            print(f"{name:<9} {concurrency:>9} {elapsed:>9.2f} {args.receipts / elapsed:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
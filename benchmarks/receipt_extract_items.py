@@ -0,0 +1,180 @@
+"""Benchmark extract_items on long synthetic receipts against the baseline dict-based version it replaced.
+
+Receipts are built two ways: as SDK AnalyzeResult models from the recorded
+receipt in fixtures/ with its line items repeated (with some repeated
+lines made distinct), and as the attribute-only fakes the other benchmarks
+use. Both must return the same description, printed price and quantity for
+every line. Usage:
+
+    python benchmarks/receipt_extract_items.py [--items 500] [--runs 20]
+"""
+import argparse
+import copy
+import logging
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from azure.ai.documentintelligence.models import AnalyzeResult  # noqa: E402
+from fakes import make_receipt_result  # noqa: E402
+from replay import load_fixture  # noqa: E402
+from smart_receipt_tracker.smart_receipt_processor import extract_items  # noqa: E402
+
+logger = logging.getLogger(__name__)
+
+
+def legacy_extract_field(field):
+    """extract_field as it was before the records change, verbatim"""
+    if not field:
+        return None
+    
+    # Try different field attributes in order of likelihood
+    if hasattr(field, 'content') and field.content:
+        return str(field.content).strip()
+    if hasattr(field, 'value_string') and field.value_string:
+        return str(field.value_string).strip()
+    if hasattr(field, 'value_date') and field.value_date:
+        return str(field.value_date)
+    if hasattr(field, 'value_number') and field.value_number is not None:
+        return str(field.value_number)
+    if hasattr(field, 'value_currency') and field.value_currency:
+        currency = field.value_currency
+        symbol = currency.get('currencySymbol', '')
+        amount = currency.get('amount', '')
+        try:
+            amount = f"{float(amount):.2f}"
+        except Exception:
+            amount = str(amount)
+        return f"{symbol} {amount}" if symbol and amount else str(currency)
+    if hasattr(field, 'value') and field.value is not None:
+        return str(field.value).strip()
+    if isinstance(field, dict):
+        # Simplified dict handling
+        if "content" in field:
+            return str(field["content"]).strip()
+    
+    return str(field).strip() if field else None
+
+
+def legacy_extract_items(items_field):
+    """extract_items as it was before the records change, verbatim: a dict per line, then a grouping pass"""
+    items = []
+    
+    try:
+        # Get items list based on field type
+        items_list = None
+        if hasattr(items_field, 'value_array'):
+            items_list = items_field.value_array
+        elif hasattr(items_field, 'value') and isinstance(items_field.value, list):
+            items_list = items_field.value
+            
+        if not items_list:
+            return items
+        
+        # Process each item
+        for idx, item in enumerate(items_list):
+            if not item or not hasattr(item, 'value_object'):
+                continue
+                
+            fields = item.value_object
+            
+            # Extract item fields
+            description = (legacy_extract_field(fields.get('Description')) or 
+                          legacy_extract_field(fields.get('Name')) or 
+                          legacy_extract_field(fields.get('ProductName')) or 
+                          legacy_extract_field(fields.get('ItemName')) or 
+                          f'Item {idx + 1}')
+            
+            price = (legacy_extract_field(fields.get('TotalPrice')) or 
+                    legacy_extract_field(fields.get('Price')) or 
+                    legacy_extract_field(fields.get('Amount')))
+            
+            quantity = legacy_extract_field(fields.get('Quantity'))
+            
+            items.append({
+                'description': description,
+                'total_price': price,
+                'quantity': quantity or "1"
+            })
+        
+        # Group identical items
+        grouped = {}
+        for item in items:
+            key = f"{item['description']}|{item['total_price']}"
+            
+            if key in grouped:
+                current_qty = int(grouped[key]['quantity']) if grouped[key]['quantity'].isdigit() else 1
+                new_qty = int(item['quantity']) if item['quantity'].isdigit() else 1
+                grouped[key]['quantity'] = str(current_qty + new_qty)
+            else:
+                grouped[key] = item.copy()
+        
+        # Format descriptions with quantity prefix
+        final_items = []
+        for item in grouped.values():
+            qty = item['quantity']
+            desc = item['description']
+            
+            if qty != "1" and not desc.startswith(f"{qty}x "):
+                item['description'] = f"{qty}x {desc}"
+            
+            final_items.append(item)
+        
+        return final_items
+    
+    except Exception as e:
+        logger.error(f"Error extracting items: {str(e)}")
+        return items  # Return empty list on error
+
+
+def sdk_receipt(item_count, seed=0):
+    """AnalyzeResult of the fixture receipt with item_count lines, some of them made distinct"""
+    payload = copy.deepcopy(load_fixture("document_intelligence_receipt.json")["analyzeResult"])
+    items_field = payload["documents"][0]["fields"]["Items"]
+    base = items_field["valueArray"]
+    rng = random.Random(seed)
+    lines = []
+    for index in range(item_count):
+        line = copy.deepcopy(rng.choice(base))
+        if rng.random() < 0.3:
+            line["valueObject"]["Description"]["content"] += f" #{index % 37}"
+        quantity = rng.randint(1, 4)
+        line["valueObject"]["Quantity"] = {"type": "number", "valueNumber": quantity, "content": str(quantity)}
+        lines.append(line)
+    items_field["valueArray"] = lines
+    return AnalyzeResult(payload)
+
+
+def per_call_ms(func, arg, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        func(arg)
+    return (time.perf_counter() - start) / runs * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--items", type=int, default=500, help="line items per receipt")
+    parser.add_argument("--runs", type=int, default=20, help="extractions per timing")
+    args = parser.parse_args()
+
+    receipts = {
+        "sdk model": sdk_receipt(args.items).documents[0].fields["Items"],
+        "attribute fake": make_receipt_result(item_count=args.items).documents[0].fields["Items"],
+    }
+    print(f"{args.items} line items per receipt")
+    print(f"{'receipt':<16} {'legacy ms':>10} {'current ms':>11} {'speedup':>8} {'lines':>6}")
+    for name, items_field in receipts.items():
+        current = extract_items(items_field)
+        assert [{key: item.to_dict()[key] for key in ("description", "total_price", "quantity")}
+                for item in current] == legacy_extract_items(items_field), f"{name}: extracted items differ"
+        legacy_ms = per_call_ms(legacy_extract_items, items_field, args.runs)
+        current_ms = per_call_ms(extract_items, items_field, args.runs)
+        print(f"{name:<16} {legacy_ms:>10.2f} {current_ms:>11.2f} {legacy_ms / current_ms:>7.1f}x {len(current):>6}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""Benchmark receipt batches when Document Intelligence is healthy, down or backed up, with and without local OCR.
+
+Runs entirely offline: Document Intelligence is the replay client (set to
+reject every analysis with 503 for the outage), and Tesseract is replaced by a
+fake OCR function that burns CPU in the process pool. Usage:
+
+    python benchmarks/receipt_fallback.py [--receipts 32] [--analysis-seconds 1.0] [--ocr-seconds 0.2]
+"""
+import argparse
+import functools
+import logging
+import os
+import sys
+import time
+from collections import Counter
+
+# Keep the benchmark off the persistent store, and fail fast instead of backing off on the replayed outage
+os.environ["RECEIPT_STORE_PATH"] = ""
+os.environ["RECEIPT_MAX_RETRIES"] = "0"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fakes import fake_ocr_text  # noqa: E402
+from replay import replay_document_intelligence_client  # noqa: E402
+from smart_receipt_tracker import smart_receipt_processor as processor  # noqa: E402
+from smart_receipt_tracker.analyzer_backends import BackendRouter, LocalOcrBackend  # noqa: E402
+from smart_receipt_tracker.rate_limiter import AdaptiveConcurrencyLimiter, CircuitBreaker  # noqa: E402
+
+SCENARIOS = (
+    # name, Document Intelligence failing, concurrency limit, local OCR on, queue depth that sheds to it
+    ("healthy", False, 16, True, 32),
+    ("outage", True, 16, False, 0),
+    ("outage + local OCR", True, 16, True, 0),
+    ("burst", False, 2, False, 0),
+    ("burst + shedding", False, 2, True, 4),
+)
+
+
+def run_scenario(args, run, failing, limit, local_ocr, queue_depth):
+    processor._client, adapter = replay_document_intelligence_client(args.latency, args.analysis_seconds)
+    adapter.fail_status = 503 if failing else None
+    processor._limiter = AdaptiveConcurrencyLimiter(initial_limit=limit, max_limit=limit)
+    processor._router = BackendRouter(
+        processor.DocumentIntelligenceBackend(),
+        LocalOcrBackend(enabled=local_ocr, max_workers=args.ocr_workers,
+                        ocr=functools.partial(fake_ocr_text, seconds=args.ocr_seconds)),
+        CircuitBreaker(failure_threshold=5, reset_seconds=30),
+        queue_depth=lambda: processor._limiter.waiting,
+        max_queue_depth=queue_depth,
+    )
+    # Unique bytes per receipt and run keep the cache out of the measurement
+    batch = [{"filename": f"receipt-{i}.jpg", "data": f"run {run} receipt {i} {time.time_ns()}".encode()}
+             for i in range(args.receipts)]
+    start = time.perf_counter()
+    results = processor.process_multiple_receipts(batch)["results"]
+    elapsed = time.perf_counter() - start
+    engines = Counter(r.engine for r in results if r.success)
+    return elapsed, sum(r.success for r in results), engines, processor._router.breaker.state
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--receipts", type=int, default=32)
+    parser.add_argument("--latency", type=float, default=0.02, help="replayed round-trip latency in seconds")
+    parser.add_argument("--analysis-seconds", type=float, default=1.0, help="replayed analysis time")
+    parser.add_argument("--ocr-seconds", type=float, default=0.2, help="CPU time of one fake OCR call")
+    parser.add_argument("--ocr-workers", type=int, default=2, help="local OCR processes")
+    args = parser.parse_args()
+    # Every receipt in the outage scenarios logs its failure; the table is the output
+    logging.disable(logging.ERROR)
+
+    print(f"{args.receipts} receipts, {args.analysis_seconds:.2f}s per analysis, {args.ocr_seconds:.2f}s per OCR call")
+    print(f"{'scenario':<20} {'ok':>4} {'wall (s)':>9} {'receipts/s':>11} {'di':>4} {'ocr':>4}  breaker")
+    for run, (name, failing, limit, local_ocr, queue_depth) in enumerate(SCENARIOS):
+        elapsed, ok, engines, breaker = run_scenario(args, run, failing, limit, local_ocr, queue_depth)
+        print(f"{name:<20} {ok:>4} {elapsed:>9.2f} {args.receipts / elapsed:>11.1f} "
+              f"{engines['document_intelligence']:>4} {engines['local_ocr']:>4}  {breaker}")
+
+
+if __name__ == "__main__":
+    main()
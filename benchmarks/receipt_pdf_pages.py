@@ -0,0 +1,70 @@
+"""Benchmark multi-page PDF receipts analyzed whole against page ranges analyzed in parallel.
+
+Builds a PDF with one blank page per receipt and runs it through
+process_receipt_file on a fake client whose analysis time grows with the page
+count. Both runs must extract every receipt. Usage:
+
+    python benchmarks/receipt_pdf_pages.py [--pages 30] [--pages-per-range 1 2 5]
+"""
+import argparse
+import io
+import os
+import sys
+import time
+
+# Keep the benchmark off the persistent store, and pin the adaptive limiter so ranges are not queued behind it
+os.environ["RECEIPT_STORE_PATH"] = ""
+os.environ["RECEIPT_CONCURRENCY_INITIAL"] = os.environ["RECEIPT_CONCURRENCY_MAX"] = "64"
+os.environ["RECEIPT_PDF_RANGE_WORKERS"] = "64"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from pypdf import PdfWriter  # noqa: E402
+from fakes import FakePdfDocumentIntelligenceClient  # noqa: E402
+from smart_receipt_tracker import smart_receipt_processor as processor  # noqa: E402
+from smart_receipt_tracker.pdf_pages import PdfPageSplitter  # noqa: E402
+
+
+def make_pdf(pages, run):
+    # Page widths identify the receipts; the run number keeps every PDF off the result cache
+    writer = PdfWriter()
+    for page in range(pages):
+        writer.add_blank_page(width=200 + page, height=400)
+    writer.add_metadata({"/Title": f"run {run}"})
+    buffer = io.BytesIO()
+    writer.write(buffer)
+    return buffer.getvalue()
+
+
+def run_once(pdf, pages_per_range, args):
+    processor._pdf_splitter = PdfPageSplitter(enabled=pages_per_range > 0, pages_per_range=pages_per_range, min_pages=1)
+    processor._client = client = FakePdfDocumentIntelligenceClient(args.latency, args.page_latency)
+    start = time.perf_counter()
+    records = processor.process_receipt_file(pdf, "expenses.pdf")
+    elapsed = time.perf_counter() - start
+    assert len(records) == args.pages and all(r.success for r in records), "receipts missing"
+    return elapsed, client.calls, records
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pages", type=int, default=30, help="receipts (pages) in the PDF")
+    parser.add_argument("--pages-per-range", type=int, nargs="+", default=[1, 2, 5])
+    parser.add_argument("--latency", type=float, default=0.2, help="fake time per analysis in seconds")
+    parser.add_argument("--page-latency", type=float, default=0.1, help="fake analysis time per page")
+    args = parser.parse_args()
+
+    print(f"{args.pages}-page PDF, {args.latency:.2f}s + {args.page_latency:.2f}s/page per analysis")
+    print(f"{'pages/range':>11} {'analyses':>9} {'wall (s)':>9} {'receipts/s':>11}")
+    baseline = None
+    for run, pages_per_range in enumerate([0] + args.pages_per_range):
+        elapsed, calls, records = run_once(make_pdf(args.pages, run), pages_per_range, args)
+        merchants = [record.merchant_name for record in records]
+        if baseline is None:
+            baseline = merchants
+        assert merchants == baseline, "page ranges changed the extracted receipts"
+        label = "whole" if pages_per_range == 0 else str(pages_per_range)
+        print(f"{label:>11} {calls:>9} {elapsed:>9.2f} {args.pages / elapsed:>11.1f}")
+
+
+if __name__ == "__main__":
+    main()
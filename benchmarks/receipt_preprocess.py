@@ -0,0 +1,106 @@
+"""Benchmark upload bytes saved by receipt image preprocessing.
+
+Runs every image in a fixture directory (or a synthetic camera-sized set) through
+the preprocessor and reports bytes and encode time. With Document Intelligence
+credentials in the environment, --compare also analyzes the original and the
+preprocessed image and checks that the extracted fields match. Usage:
+
+    python benchmarks/receipt_preprocess.py [--fixtures DIR] [--compare]
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from io import BytesIO
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from PIL import Image, ImageDraw  # noqa: E402
+from smart_receipt_tracker.image_preprocess import ImagePreprocessor  # noqa: E402
+
+COMPARED_FIELDS = ("merchant_name", "total", "date")
+
+
+def make_photo(index, width=3024, height=4032):
+    # A phone-sized colour photo of a receipt: noisy background, white paper, dark text lines
+    rng = random.Random(index)
+    image = Image.effect_noise((width, height), 40).convert("RGB")
+    draw = ImageDraw.Draw(image)
+    draw.rectangle((width // 6, height // 10, width * 5 // 6, height * 9 // 10), fill=(245, 242, 235))
+    for line in range(40):
+        y = height // 10 + 60 + line * 80
+        text = f"ITEM {rng.randint(100, 999)} ........ {rng.randint(1, 99)}.{rng.randint(0, 99):02d}"
+        draw.text((width // 6 + 60, y), text, fill=(30, 30, 30))
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=92)
+    return f"synthetic-{index}.jpg", buffer.getvalue()
+
+
+def load_fixtures(directory):
+    fixtures = []
+    for name in sorted(os.listdir(directory)):
+        path = os.path.join(directory, name)
+        if os.path.isfile(path):
+            with open(path, "rb") as f:
+                fixtures.append((name, f.read()))
+    return fixtures
+
+
+def summarize(result):
+    summary = {field: getattr(result, field) for field in COMPARED_FIELDS}
+    summary["items"] = [(item.description, item.total_price) for item in result.items]
+    return summary
+
+
+def compare_fields(fixtures, preprocessor):
+    from smart_receipt_tracker import smart_receipt_processor as processor
+
+    client = processor.get_client()
+
+    def analyze(data, name):
+        poller = client.begin_analyze_document(
+            model_id="prebuilt-receipt", body=data, content_type="application/octet-stream"
+        )
+        return processor.extract_receipt_data(poller.result(), name)
+
+    mismatches = 0
+    for name, data in fixtures:
+        original = analyze(data, name)
+        shrunk = analyze(preprocessor.process(data), name)
+        diff = [k for k, v in summarize(original).items() if summarize(shrunk)[k] != v]
+        mismatches += bool(diff)
+        print(f"{name:<30} {'match' if not diff else 'differs: ' + ', '.join(diff)}")
+    print(f"{len(fixtures) - mismatches}/{len(fixtures)} receipts extract identical fields")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--fixtures", help="directory of receipt images (default: synthetic photos)")
+    parser.add_argument("--synthetic", type=int, default=5, help="synthetic photos when no fixtures are given")
+    parser.add_argument("--max-dimension", type=int, default=2048)
+    parser.add_argument("--quality", type=int, default=80)
+    parser.add_argument("--compare", action="store_true",
+                        help="analyze original and preprocessed images (needs DOCUMENT_INTELLIGENCE_* env)")
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixtures) if args.fixtures else [make_photo(i) for i in range(args.synthetic)]
+    preprocessor = ImagePreprocessor(max_dimension=args.max_dimension, quality=args.quality)
+
+    print(f"{'image':<30} {'original':>10} {'upload':>10} {'saved':>7} {'ms':>7}")
+    for name, data in fixtures:
+        start = time.perf_counter()
+        output = preprocessor.process(data)
+        elapsed = (time.perf_counter() - start) * 1000
+        saved = 1 - len(output) / len(data)
+        print(f"{name:<30} {len(data):>10} {len(output):>10} {saved:>6.0%} {elapsed:>7.1f}")
+    stats = preprocessor.stats()
+    print(f"total: {stats['bytes_in']} -> {stats['bytes_out']} bytes ({stats['saved_ratio']:.0%} saved), "
+          f"{stats['converted']}/{stats['images']} converted")
+
+    if args.compare:
+        compare_fields(fixtures, preprocessor)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""Benchmark per-result memory and serialization cost of ReceiptRecord against the dict results it replaced.
+
+Uses the recorded receipt in fixtures/ (12 line items). Memory is measured with
+tracemalloc over many live copies. Usage:
+
+    python benchmarks/receipt_records.py [--copies 2000] [--runs 5000]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+from flask import Flask, jsonify
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from azure.ai.documentintelligence.models import AnalyzeResult  # noqa: E402
+from replay import load_fixture  # noqa: E402
+from smart_receipt_tracker.receipt_records import ReceiptRecord  # noqa: E402
+from smart_receipt_tracker.smart_receipt_processor import extract_receipt_data  # noqa: E402
+
+
+def per_copy_bytes(make, copies):
+    tracemalloc.start()
+    kept = [make() for _ in range(copies)]
+    size = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    del kept
+    return size / copies
+
+
+def per_call_us(func, runs):
+    start = time.perf_counter()
+    for _ in range(runs):
+        func()
+    return (time.perf_counter() - start) / runs * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--copies", type=int, default=2000, help="live results for the memory measurement")
+    parser.add_argument("--runs", type=int, default=5000, help="calls per timing")
+    args = parser.parse_args()
+
+    record = extract_receipt_data(AnalyzeResult(load_fixture("document_intelligence_receipt.json")["analyzeResult"]),
+                                  "receipt.jpg")
+    legacy = record.to_dict()
+    packed = record.to_bytes()
+    text = json.dumps(legacy)
+    app = Flask(__name__)
+
+    print(f"{'form':<28} {'bytes/result':>12}")
+    print(f"{'dict (JSON-decoded)':<28} {per_copy_bytes(lambda: json.loads(text), args.copies):>12.0f}")
+    print(f"{'ReceiptRecord':<28} {per_copy_bytes(lambda: ReceiptRecord.from_bytes(packed), args.copies):>12.0f}")
+    print(f"{'packed (cache entry)':<28} {per_copy_bytes(lambda: bytes(bytearray(packed)), args.copies):>12.0f}")
+
+    with app.app_context():
+        print(f"\n{'operation':<28} {'us/call':>12}")
+        print(f"{'jsonify(dict)':<28} {per_call_us(lambda: jsonify(legacy), args.runs):>12.1f}")
+        print(f"{'ReceiptRecord.to_json':<28} {per_call_us(record.to_json, args.runs):>12.1f}")
+        print(f"{'cache size: json.dumps':<28} {per_call_us(lambda: len(json.dumps(legacy)), args.runs):>12.1f}")
+        print(f"{'cache pack: to_bytes':<28} {per_call_us(record.to_bytes, args.runs):>12.1f}")
+        print(f"{'cache unpack: from_bytes':<28} {per_call_us(lambda: ReceiptRecord.from_bytes(packed), args.runs):>12.1f}")
+
+
+if __name__ == "__main__":
+    main()
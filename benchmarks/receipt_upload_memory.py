@@ -0,0 +1,84 @@
+"""Benchmark peak Python memory while ingesting and processing receipt batches.
+
+Posts multipart batches to /api/process_multiple and compares reading every
+upload into memory (the previous ingestion) with spooling uploads to temp files.
+Uploads are served from disk and analyses run on the fake client, so only the
+server-side handling is measured. Usage:
+
+    python benchmarks/receipt_upload_memory.py [--file-mb 4] [--batches 10 25 50]
+"""
+import argparse
+import os
+import sys
+import tempfile
+import tracemalloc
+
+# Keep receipts off the persistent store, and send raw bytes so preprocessing does not skew memory
+os.environ["RECEIPT_STORE_PATH"] = ""
+os.environ["RECEIPT_PREPROCESS"] = "false"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+
+from fakes import FakeDocumentIntelligenceClient  # noqa: E402
+import app as receipt_app  # noqa: E402
+from flask import request  # noqa: E402
+from smart_receipt_tracker import smart_receipt_processor as processor  # noqa: E402
+
+
+def buffered_ingest():
+    # What /api/process_multiple did before: every upload read into memory at once
+    return [{"filename": f.filename, "data": f.read()} for f in request.files.getlist("files")]
+
+
+def spooled_ingest():
+    images_data, _ = receipt_app._read_uploaded_files()
+    return images_data
+
+
+def run(ingest, paths, run_id):
+    handles = [open(path, "rb") for path in paths]
+    try:
+        data = {"files": [(handle, f"run{run_id}-{i}.jpg") for i, handle in enumerate(handles)]}
+        with receipt_app.app.test_request_context(
+                "/api/process_multiple", method="POST", data=data, content_type="multipart/form-data"):
+            request.files  # parse the form before measuring, as Werkzeug does before the view runs
+            tracemalloc.start()
+            results = processor.process_multiple_receipts(ingest())["results"]
+            _, peak = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+    finally:
+        for handle in handles:
+            handle.close()
+    assert all(r.success for r in results)
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--file-mb", type=float, default=4)
+    parser.add_argument("--batches", type=int, nargs="+", default=[10, 25, 50])
+    args = parser.parse_args()
+
+    processor._client = FakeDocumentIntelligenceClient(latency=0.05)
+    size = int(args.file_mb * 1024 * 1024)
+    print(f"{args.file_mb:g} MB per file")
+    print(f"{'files':>6} {'buffered peak (MB)':>19} {'spooled peak (MB)':>18}")
+    with tempfile.TemporaryDirectory() as directory:
+        paths = []
+        for i in range(max(args.batches)):
+            path = os.path.join(directory, f"receipt-{i}.jpg")
+            with open(path, "wb") as f:
+                f.write(os.urandom(size))
+            paths.append(path)
+        run_id = 0
+        for count in args.batches:
+            peaks = []
+            for ingest in (buffered_ingest, spooled_ingest):
+                # The same files are reused across runs, so clear the cache to make every receipt reach the client
+                processor._receipt_cache.clear()
+                run_id += 1
+                peaks.append(run(ingest, paths[:count], run_id) / (1024 * 1024))
+            print(f"{count:>6} {peaks[0]:>19.1f} {peaks[1]:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+"""Replay recorded Azure REST responses through the real SDK clients.
+
+A requests transport adapter answers Text Analytics and Document Intelligence
+calls from the JSON fixtures in `fixtures/` after a configurable latency, so
+the SDK's serialization, polling and deserialization all run as they would
+against the service. Fixture files hold raw REST response bodies; a
+succeeded Document Intelligence `analyzeResults` response saved from the REST
+API or Studio can replace the bundled one directly.
+"""
+import io
+import json
+import http
+import os
+import re
+import threading
+import time
+import uuid
+
+import requests
+from requests.adapters import BaseAdapter
+from azure.ai.documentintelligence import DocumentIntelligenceClient
+from azure.ai.textanalytics import TextAnalyticsClient
+from azure.core.credentials import AzureKeyCredential
+from azure.core.pipeline.transport import RequestsTransport
+
+FIXTURES = os.path.join(os.path.dirname(__file__), "fixtures")
+_ENDPOINT = "https://replay.cognitiveservices.azure.com"
+_SENTENCE_SPLIT = re.compile(r'(?<=[.!?])\s+')
+
+
+def load_fixture(name):
+    with open(os.path.join(FIXTURES, name)) as f:
+        return json.load(f)
+
+
+def _response(request, status, body=None, headers=None):
+    content = json.dumps(body).encode() if body is not None else b""
+    response = requests.Response()
+    response.status_code = status
+    response.reason = http.HTTPStatus(status).phrase
+    response._content = content
+    response.raw = io.BytesIO(content)
+    response.url = request.url
+    response.request = request
+    response.headers["Content-Type"] = "application/json"
+    response.headers["Content-Length"] = str(len(content))
+    response.headers.update(headers or {})
+    return response
+
+
+class _ReplayAdapter(BaseAdapter):
+    """Thread-safe transport adapter that counts requests and sleeps `latency` per round trip"""
+
+    def __init__(self, latency):
+        super().__init__()
+        self.latency = latency
+        self.requests = 0
+        self._lock = threading.Lock()
+
+    def send(self, request, **kwargs):
+        with self._lock:
+            self.requests += 1
+        time.sleep(self.latency)
+        return self.respond(request)
+
+    def close(self):
+        pass
+
+
+class TextAnalyticsReplayAdapter(_ReplayAdapter):
+    """Answers analyze-text calls with the recorded document result for every input document"""
+
+    def __init__(self, latency=0.05, fixture="text_analytics.json"):
+        super().__init__(latency)
+        self.fixture = load_fixture(fixture)
+
+    def respond(self, request):
+        payload = json.loads(request.body)
+        recorded = self.fixture[payload["kind"]]
+        documents = [self._document(payload["kind"], recorded, d) for d in payload["analysisInput"]["documents"]]
+        return _response(request, 200, {
+            "kind": recorded["kind"],
+            "results": {"documents": documents, "errors": [], "modelVersion": recorded["modelVersion"]},
+        })
+
+    @staticmethod
+    def _document(kind, recorded, document):
+        result = dict(recorded["document"], id=document["id"])
+        if kind == "SentimentAnalysis":
+            # Sentence results must echo the request text, since the analyzer matches sentences by text
+            sentences = []
+            offset = 0
+            for index, text in enumerate(_SENTENCE_SPLIT.split(document["text"])):
+                offset = document["text"].find(text, offset)
+                sentences.append(dict(recorded["sentences"][index % len(recorded["sentences"])],
+                                      text=text, offset=offset, length=len(text)))
+                offset += len(text)
+            result["sentences"] = sentences
+        return result
+
+
+class DocumentIntelligenceReplayAdapter(_ReplayAdapter):
+    """Accepts analyze requests and serves the recorded result once `analysis_seconds` have passed"""
+
+    def __init__(self, latency=0.05, analysis_seconds=1.0, fixture="document_intelligence_receipt.json"):
+        super().__init__(latency)
+        self.analysis_seconds = analysis_seconds
+        self.fixture = load_fixture(fixture)
+        self._operations = {}
+        # Set to 429 or 503 to have analyze requests rejected, as during throttling or an outage
+        self.fail_status = None
+
+    def respond(self, request):
+        if request.method == "POST" and self.fail_status:
+            return _response(request, self.fail_status, {"error": {"code": "ServiceUnavailable",
+                                                                   "message": "Replayed outage"}})
+        if request.method == "POST":
+            operation_id = uuid.uuid4().hex
+            with self._lock:
+                self._operations[operation_id] = time.monotonic()
+            location = f"{request.url.split(':analyze')[0]}/analyzeResults/{operation_id}?api-version=2024-11-30"
+            return _response(request, 202, headers={"Operation-Location": location, "Retry-After": "1"})
+
+        operation_id = request.url.split("/analyzeResults/")[1].split("?")[0]
+        with self._lock:
+            started = self._operations[operation_id]
+        if time.monotonic() - started < self.analysis_seconds:
+            return _response(request, 200, {"status": "running", "createdDateTime": self.fixture["createdDateTime"],
+                                            "lastUpdatedDateTime": self.fixture["createdDateTime"]},
+                             headers={"Retry-After": "1"})
+        with self._lock:
+            self._operations.pop(operation_id, None)
+        return _response(request, 200, self.fixture)
+
+
+def _transport(adapter):
+    session = requests.Session()
+    session.mount("https://", adapter)
+    return RequestsTransport(session=session, session_owner=False)
+
+
+def replay_text_analytics_client(latency=0.05):
+    """Real TextAnalyticsClient backed by the replay adapter; returns (client, adapter)"""
+    adapter = TextAnalyticsReplayAdapter(latency)
+    client = TextAnalyticsClient(_ENDPOINT, AzureKeyCredential("replay"), transport=_transport(adapter))
+    return client, adapter
+
+
+def replay_document_intelligence_client(latency=0.05, analysis_seconds=1.0):
+    """Real DocumentIntelligenceClient backed by the replay adapter; returns (client, adapter)"""
+    adapter = DocumentIntelligenceReplayAdapter(latency, analysis_seconds)
+    client = DocumentIntelligenceClient(_ENDPOINT, AzureKeyCredential("replay"), transport=_transport(adapter))
+    return client, adapter
@@ -0,0 +1,44 @@
+"""Benchmark get_seo_insights end-to-end latency for each remote analysis mode.
+
+Usage: python benchmarks/seo_pipeline.py [--latency 0.2] [--sentences 60] [--repeat 5]
+"""
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'seo_content_analyzer'))
+
+from fakes import FakeTextAnalyticsClient, make_article  # noqa: E402
+from seo_content_analyzer import ANALYSIS_MODES, get_seo_insights  # noqa: E402
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.2, help="fake round-trip latency in seconds")
+    parser.add_argument("--job-overhead", type=float, default=0.1,
+                        help="extra polling delay of a multi-action job in seconds")
+    parser.add_argument("--sentences", type=int, default=60)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    content = make_article(args.sentences)
+    print(f"single call latency: {args.latency:.3f}s, article: {args.sentences} sentences")
+    print(f"{'mode':<11} {'median (s)':>10} {'round trips':>11}")
+    baseline = None
+    for mode in ANALYSIS_MODES:
+        timings = []
+        for _ in range(args.repeat):
+            client = FakeTextAnalyticsClient(latency=args.latency, job_overhead=args.job_overhead)
+            start = time.perf_counter()
+            insights = get_seo_insights(content, client=client, mode=mode, use_cache=False)
+            timings.append(time.perf_counter() - start)
+        baseline = baseline or insights
+        assert insights == baseline, f"{mode} produced different insights"
+        print(f"{mode:<11} {statistics.median(timings):>10.3f} {client.round_trips:>11}")
+
+
+if __name__ == "__main__":
+    main()
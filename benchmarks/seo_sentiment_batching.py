@@ -0,0 +1,63 @@
+"""Benchmark per-sentence sentiment round trips against batched requests.
+
+Usage: python benchmarks/seo_sentiment_batching.py [--latency 0.05] [--lengths 10 100 400]
+"""
+import argparse
+import os
+import re
+import sys
+import time
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'seo_content_analyzer'))
+
+from fakes import FakeTextAnalyticsClient, make_article  # noqa: E402
+from seo_content_analyzer import analyze_sentence_sentiments  # noqa: E402
+
+
+def per_sentence(client, sentences, document_result):
+    return [client.analyze_sentiment([s])[0].sentiment for s in sentences]
+
+
+def batched(client, sentences, document_result):
+    return analyze_sentence_sentiments(client, sentences)
+
+
+def batched_with_reuse(client, sentences, document_result):
+    return analyze_sentence_sentiments(client, sentences, document_result)
+
+
+STRATEGIES = [
+    ("per-sentence", per_sentence),
+    ("batched", batched),
+    ("batched+reuse", batched_with_reuse),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--latency", type=float, default=0.05, help="fake round-trip latency in seconds")
+    parser.add_argument("--lengths", type=int, nargs="+", default=[10, 50, 100, 400])
+    args = parser.parse_args()
+
+    print(f"{'sentences':>9}  {'strategy':<14} {'round trips':>11} {'wall (s)':>9}")
+    for length in args.lengths:
+        content = make_article(length)
+        sentences = [s for s in re.split(r'(?<=[.!?])\s+', content) if s.strip()]
+        # Whole-document sentiment is already paid for by get_seo_insights, so it is not counted
+        document_result = FakeTextAnalyticsClient(latency=0).analyze_sentiment([content])[0]
+        expected = None
+        for name, strategy in STRATEGIES:
+            client = FakeTextAnalyticsClient(latency=args.latency)
+            start = time.perf_counter()
+            labels = strategy(client, sentences, document_result)
+            elapsed = time.perf_counter() - start
+            if name != "batched+reuse":
+                # Reused labels come from document context, so only the isolated strategies must agree
+                expected = expected or labels
+                assert labels == expected, f"{name} returned different sentiments"
+            print(f"{len(sentences):>9}  {name:<14} {client.round_trips:>11} {elapsed:>9.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,181 @@
+"""Offline benchmark suite replaying recorded Azure responses through both analyzers.
+
+Runs single-receipt, receipt-batch, receipt-extraction, long-article and
+key-phrase workloads against the real SDK clients on a replay transport, and
+reports throughput and p50/p95/p99 latency. Results can be saved and later
+runs compared against them to catch regressions. Usage:
+
+    python benchmarks/suite.py [--latency 0.02] [--save results.json] [--compare baseline.json]
+"""
+import argparse
+import json
+import math
+import os
+import platform
+import sys
+import time
+
+# Every receipt must reach the replay client: no persistent store, and no re-encoding of fake image bytes
+os.environ["RECEIPT_STORE_PATH"] = ""
+os.environ["RECEIPT_PREPROCESS"] = "false"
+sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', 'seo_content_analyzer'))
+
+from azure.ai.documentintelligence.models import AnalyzeResult  # noqa: E402
+from fakes import make_article  # noqa: E402
+from replay import load_fixture, replay_document_intelligence_client, replay_text_analytics_client  # noqa: E402
+from seo_content_analyzer import clean_key_phrases, get_seo_insights  # noqa: E402
+from smart_receipt_tracker import smart_receipt_processor as processor  # noqa: E402
+
+COMPARED_STATS = ("p50_ms", "p95_ms")
+
+
+def percentile(sorted_values, p):
+    # Nearest-rank percentile
+    return sorted_values[max(0, min(len(sorted_values) - 1, math.ceil(p / 100 * len(sorted_values)) - 1))]
+
+
+def summarize(timings, items_per_run=1):
+    timings = sorted(timings)
+    total = sum(timings)
+    return {
+        "runs": len(timings),
+        "throughput_per_s": round(len(timings) * items_per_run / total, 2) if total else None,
+        "mean_ms": round(total / len(timings) * 1000, 3),
+        "p50_ms": round(percentile(timings, 50) * 1000, 3),
+        "p95_ms": round(percentile(timings, 95) * 1000, 3),
+        "p99_ms": round(percentile(timings, 99) * 1000, 3),
+    }
+
+
+def measure(func, runs):
+    # One untimed run first, so imports, pools and caches of the code under test are warm
+    func(-1)
+    timings = []
+    for run in range(runs):
+        start = time.perf_counter()
+        func(run)
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def receipt_bytes(run, index=0):
+    # Unique bytes per receipt, so the result cache and coalescing never short-circuit an analysis
+    return f"receipt run {run} index {index} {time.time_ns()}".encode()
+
+
+def bench_receipt_single(args):
+    processor._client, _ = replay_document_intelligence_client(args.latency, args.analysis_seconds)
+
+    def run(i):
+        assert processor.process_receipt_image(receipt_bytes(i), f"receipt-{i}.jpg").success
+    return summarize(measure(run, args.receipt_runs))
+
+
+def bench_receipt_batch(args):
+    processor._client, _ = replay_document_intelligence_client(args.latency, args.analysis_seconds)
+
+    def run(i):
+        batch = [{"filename": f"receipt-{n}.jpg", "data": receipt_bytes(i, n)} for n in range(args.batch_size)]
+        assert all(r.success for r in processor.process_multiple_receipts(batch)["results"])
+    return summarize(measure(run, args.batch_runs), items_per_run=args.batch_size)
+
+
+def bench_receipt_extract(args):
+    result = AnalyzeResult(load_fixture("document_intelligence_receipt.json")["analyzeResult"])
+
+    def run(i):
+        assert processor.extract_receipt_data(result, "receipt.jpg").success
+    return summarize(measure(run, args.cpu_runs))
+
+
+def bench_seo_long_article(args):
+    client, _ = replay_text_analytics_client(args.latency)
+    content = make_article(args.sentences)
+
+    def run(i):
+        # A distinct trailing sentence per run keeps every analysis off the cache
+        get_seo_insights(f"{content}\n\nRun {i}.", client=client, use_cache=False)
+    return summarize(measure(run, args.seo_runs))
+
+
+def bench_seo_clean_key_phrases(args):
+    phrases = load_fixture("text_analytics.json")["KeyPhraseExtraction"]["document"]["keyPhrases"] * 20
+    content = make_article(args.sentences)
+
+    def run(i):
+        clean_key_phrases(phrases, content)
+    return summarize(measure(run, args.cpu_runs))
+
+
+WORKLOADS = {
+    "receipt_single": bench_receipt_single,
+    "receipt_batch": bench_receipt_batch,
+    "receipt_extract": bench_receipt_extract,
+    "seo_long_article": bench_seo_long_article,
+    "seo_clean_key_phrases": bench_seo_clean_key_phrases,
+}
+
+
+def compare(results, baseline, threshold):
+    """Print the change against a saved run; returns the workloads that regressed"""
+    regressions = []
+    print(f"\n{'workload':<22} {'stat':<7} {'baseline':>10} {'current':>10} {'change':>8}")
+    for name, stats in results.items():
+        previous = baseline.get("results", {}).get(name)
+        if not previous:
+            continue
+        for stat in COMPARED_STATS:
+            change = stats[stat] / previous[stat] - 1 if previous[stat] else 0.0
+            flag = " REGRESSION" if change > threshold else ""
+            if flag:
+                regressions.append(name)
+            print(f"{name:<22} {stat:<7} {previous[stat]:>10.3f} {stats[stat]:>10.3f} {change:>+8.1%}{flag}")
+    return sorted(set(regressions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--workloads", nargs="+", choices=list(WORKLOADS), default=list(WORKLOADS))
+    parser.add_argument("--latency", type=float, default=0.02, help="replayed round-trip latency in seconds")
+    parser.add_argument("--analysis-seconds", type=float, default=0.5,
+                        help="time before a replayed receipt analysis succeeds")
+    parser.add_argument("--receipt-runs", type=int, default=20)
+    parser.add_argument("--batch-size", type=int, default=16)
+    parser.add_argument("--batch-runs", type=int, default=5)
+    parser.add_argument("--sentences", type=int, default=200, help="sentences in the long article")
+    parser.add_argument("--seo-runs", type=int, default=10)
+    parser.add_argument("--cpu-runs", type=int, default=500, help="runs of the CPU-only workloads")
+    parser.add_argument("--save", help="write results to this JSON file")
+    parser.add_argument("--compare", help="compare against results saved with --save")
+    parser.add_argument("--threshold", type=float, default=0.10,
+                        help="relative p50/p95 increase reported as a regression")
+    args = parser.parse_args()
+
+    results = {}
+    print(f"{'workload':<22} {'runs':>5} {'per s':>9} {'p50 ms':>9} {'p95 ms':>9} {'p99 ms':>9}")
+    for name in args.workloads:
+        stats = results[name] = WORKLOADS[name](args)
+        print(f"{name:<22} {stats['runs']:>5} {stats['throughput_per_s']:>9.1f} "
+              f"{stats['p50_ms']:>9.3f} {stats['p95_ms']:>9.3f} {stats['p99_ms']:>9.3f}")
+
+    if args.save:
+        with open(args.save, "w") as f:
+            json.dump({
+                "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+                "python": platform.python_version(),
+                "settings": {k: v for k, v in vars(args).items() if k not in ("save", "compare")},
+                "results": results,
+            }, f, indent=2)
+        print(f"\nsaved to {args.save}")
+
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"\nregressed: {', '.join(regressions)}")
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+import os
+import time
+import logging
+import threading
+from bisect import bisect_left
+from azure.core.pipeline.policies import SansIOHTTPPolicy
+
+logger = logging.getLogger(__name__)
+
+# Set METRICS_ENABLED=false to turn every timer, counter and policy below into a no-op
+ENABLED = os.environ.get("METRICS_ENABLED", "true").lower() == "true"
+
+# Latency histogram upper bounds in seconds, from cache hits up to long Azure analyses
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+_lock = threading.Lock()
+_histograms = {}  # (name, labels) -> [count per bucket..., count above the last bucket, sum]
+_counters = {}  # (name, labels) -> value
+_descriptions = {}  # name -> (type, help text)
+_collectors = []
+
+
+def describe(name, kind, text):
+    """Register the Prometheus TYPE ("counter", "gauge" or "histogram") and HELP text for a metric"""
+    _descriptions[name] = (kind, text)
+
+
+def observe(name, value, **labels):
+    """Record a value (usually seconds) in a histogram"""
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    index = bisect_left(DEFAULT_BUCKETS, value)
+    with _lock:
+        histogram = _histograms.get(key)
+        if histogram is None:
+            histogram = _histograms[key] = [0] * (len(DEFAULT_BUCKETS) + 1) + [0.0]
+        histogram[index] += 1
+        histogram[-1] += value
+
+
+def increment(name, amount=1, **labels):
+    """Add to a counter"""
+    if not ENABLED:
+        return
+    key = (name, tuple(sorted(labels.items())))
+    with _lock:
+        _counters[key] = _counters.get(key, 0) + amount
+
+
+class _Timer:
+    """Context manager that observes its elapsed wall time into a histogram"""
+
+    __slots__ = ("name", "labels", "started")
+
+    def __init__(self, name, labels):
+        self.name = name
+        self.labels = labels
+
+    def __enter__(self):
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        observe(self.name, time.perf_counter() - self.started, **self.labels)
+
+
+class _NullTimer:
+    """Shared stand-in for _Timer when metrics are disabled"""
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        pass
+
+
+_NULL_TIMER = _NullTimer()
+
+
+def timer(name, **labels):
+    """`with timer("stage_duration_seconds", stage="x"):` times the block"""
+    if not ENABLED:
+        return _NULL_TIMER
+    return _Timer(name, labels)
+
+
+def register_collector(collect):
+    """Register a function returning (name, labels, value) gauge samples, evaluated at scrape time"""
+    _collectors.append(collect)
+
+
+class AzureCallMetricsPolicy(SansIOHTTPPolicy):
+    """Pipeline policy counting and timing every Azure SDK call (submissions and polls alike)"""
+
+    def __init__(self, service):
+        self.service = service
+
+    def on_request(self, request):
+        if ENABLED:
+            request.context["metrics_started"] = time.perf_counter()
+
+    def on_response(self, request, response):
+        started = request.context.get("metrics_started")
+        if started is None:
+            return
+        method = request.http_request.method
+        increment("azure_requests_total", service=self.service, method=method,
+                  status=str(response.http_response.status_code))
+        observe("azure_request_duration_seconds", time.perf_counter() - started,
+                service=self.service, method=method)
+
+    def on_exception(self, request):
+        if request.context.get("metrics_started") is not None:
+            increment("azure_requests_total", service=self.service, method=request.http_request.method,
+                      status="error")
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labels):
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels) + "}"
+
+
+def _format_value(value):
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render():
+    """All metrics in the Prometheus text exposition format"""
+    samples = {}
+    with _lock:
+        histograms = {key: list(value) for key, value in _histograms.items()}
+        counters = dict(_counters)
+
+    for (name, labels), histogram in sorted(histograms.items()):
+        lines = samples.setdefault(name, [])
+        cumulative = 0
+        for bound, count in zip(DEFAULT_BUCKETS + ("+Inf",), histogram[:-1]):
+            cumulative += count
+            le = bound if bound == "+Inf" else repr(float(bound))
+            lines.append(f"{name}_bucket{_format_labels(labels + (('le', le),))} {cumulative}")
+        lines.append(f"{name}_sum{_format_labels(labels)} {_format_value(histogram[-1])}")
+        lines.append(f"{name}_count{_format_labels(labels)} {cumulative}")
+
+    for (name, labels), value in sorted(counters.items()):
+        samples.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+
+    for collect in list(_collectors):
+        try:
+            for name, labels, value in collect():
+                if value is None:
+                    continue
+                labels = tuple(sorted(labels.items()))
+                samples.setdefault(name, []).append(f"{name}{_format_labels(labels)} {_format_value(value)}")
+        except Exception as e:
+            logger.warning(f"Metrics collector failed: {str(e)}")
+
+    output = []
+    for name in sorted(samples):
+        kind, text = _descriptions.get(name, ("untyped", name))
+        output.append(f"# HELP {name} {text}")
+        output.append(f"# TYPE {name} {kind}")
+        output.extend(samples[name])
+    return "\n".join(output) + "\n"
+
+
+describe("http_request_duration_seconds", "histogram", "Flask request handling time by route")
+describe("seo_stage_duration_seconds", "histogram", "SEO insight pipeline stage time")
+describe("receipt_stage_duration_seconds", "histogram", "Receipt pipeline stage time")
+describe("azure_requests_total", "counter", "Azure SDK HTTP calls by service, method and status")
+describe("azure_request_duration_seconds", "histogram", "Azure SDK HTTP call time")
@@ -1,17 +1,144 @@
 import re
 import os
+import json
+import time
+import socket
+import uuid
+import hashlib
+import atexit
+import logging
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection
+from urllib3.util.retry import Retry
 from dotenv import load_dotenv
 from azure.core.credentials import AzureKeyCredential
-from azure.ai.textanalytics import TextAnalyticsClient
+from azure.core.exceptions import HttpResponseError
+from azure.core.pipeline.transport import RequestsTransport
+from azure.ai.textanalytics import (
+    TextAnalyticsClient,
+    ExtractKeyPhrasesAction,
+    AnalyzeSentimentAction,
+    RecognizeEntitiesAction,
+)
 import textstat
-from collections import Counter
+from collections import Counter, OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from metrics import AzureCallMetricsPolicy, timer
 
 load_dotenv()
 
-def create_text_analytics_client():
+logger = logging.getLogger(__name__)
+
+# Azure Language synchronous limits for a single sentiment request
+_MAX_DOCUMENTS_PER_REQUEST = 10
+# Per-operation document limits of the synchronous endpoints; entity recognition takes only 5
+_MAX_DOCUMENTS_PER_OPERATION = {"key_phrases": 10, "sentiment": 10, "entities": 5}
+_MAX_CHARACTERS_PER_REQUEST = 50000
+_SENTIMENT_BATCH_WORKERS = int(os.environ.get("SEO_SENTIMENT_BATCH_WORKERS", "4"))
+
+# How the key phrase, sentiment and entity analyses are issued: "concurrent", "actions" or "serial"
+ANALYSIS_MODES = ("concurrent", "actions", "serial")
+_DEFAULT_ANALYSIS_MODE = os.environ.get("SEO_ANALYSIS_MODE", "concurrent")
+
+# Shared client settings: HTTP connection pool size per worker and TCP keep-alive idle time (0 disables)
+_CLIENT_POOL_SIZE = int(os.environ.get("SEO_CLIENT_POOL_SIZE", "10"))
+_CLIENT_KEEPALIVE_SECONDS = int(os.environ.get("SEO_CLIENT_KEEPALIVE_SECONDS", "60"))
+
+# Process-wide client registry
+_client = None
+_client_session = None
+_client_pid = None
+_client_lock = threading.Lock()
+_client_stats = {"clients_created": 0, "client_requests": 0}
+
+class _PooledHTTPAdapter(HTTPAdapter):
+    # HTTP adapter with TCP keep-alive on pooled sockets; retries are left to the Azure pipeline
+    def __init__(self, pool_size, keepalive_seconds):
+        self._socket_options = list(HTTPConnection.default_socket_options)
+        if keepalive_seconds > 0:
+            self._socket_options.append((socket.SOL_SOCKET, socket.SO_KEEPALIVE, 1))
+            if hasattr(socket, "TCP_KEEPIDLE"):
+                self._socket_options.append((socket.IPPROTO_TCP, socket.TCP_KEEPIDLE, keepalive_seconds))
+        super().__init__(
+            pool_connections=4,
+            pool_maxsize=pool_size,
+            max_retries=Retry(total=False, redirect=False, raise_on_status=False),
+        )
+
+    def init_poolmanager(self, *args, **kwargs):
+        kwargs["socket_options"] = self._socket_options
+        super().init_poolmanager(*args, **kwargs)
+
+def _create_session(pool_size=_CLIENT_POOL_SIZE, keepalive_seconds=_CLIENT_KEEPALIVE_SECONDS):
+    session = requests.Session()
+    adapter = _PooledHTTPAdapter(pool_size, keepalive_seconds)
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    return session
+
+def create_text_analytics_client(session=None):
     endpoint = os.environ.get("AZURE_LANGUAGE_ENDPOINT")
     key = os.environ.get("AZURE_LANGUAGE_KEY")
-    return TextAnalyticsClient(endpoint=endpoint, credential=AzureKeyCredential(key))
+    # Counts and times every Text Analytics call for /metrics
+    kwargs = {"per_call_policies": [AzureCallMetricsPolicy("text_analytics")]}
+    if session is not None:
+        kwargs["transport"] = RequestsTransport(session=session, session_owner=False)
+    return TextAnalyticsClient(endpoint=endpoint, credential=AzureKeyCredential(key), **kwargs)
+
+def get_text_analytics_client():
+    # Thread-safe singleton per process; a client inherited across fork is replaced, never shared
+    global _client, _client_session, _client_pid
+    client = _client
+    if client is None or _client_pid != os.getpid():
+        with _client_lock:
+            if _client is None or _client_pid != os.getpid():
+                _client_session = _create_session()
+                _client = create_text_analytics_client(_client_session)
+                _client_pid = os.getpid()
+                _client_stats["clients_created"] += 1
+            client = _client
+    with _client_lock:
+        _client_stats["client_requests"] += 1
+    return client
+
+def close_text_analytics_client():
+    # Shutdown hook: closes the shared client and its connection pool
+    global _client, _client_session, _client_pid
+    with _client_lock:
+        if _client is not None and _client_pid == os.getpid():
+            _client.close()
+            _client_session.close()
+        _client = None
+        _client_session = None
+        _client_pid = None
+
+atexit.register(close_text_analytics_client)
+
+def get_client_pool_stats():
+    # urllib3 counts opened connections and requests per host pool; the difference is reuse
+    http_requests = 0
+    connections_opened = 0
+    session = _client_session
+    if session is not None and _client_pid == os.getpid():
+        for adapter in set(session.adapters.values()):
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is not None:
+                    http_requests += pool.num_requests
+                    connections_opened += pool.num_connections
+    return {
+        "pid": os.getpid(),
+        "pool_size": _CLIENT_POOL_SIZE,
+        "clients_created": _client_stats["clients_created"],
+        "client_requests": _client_stats["client_requests"],
+        "http_requests": http_requests,
+        "connections_opened": connections_opened,
+        "connections_reused": max(http_requests - connections_opened, 0),
+        "reuse_ratio": round(1 - connections_opened / http_requests, 3) if http_requests else 0.0,
+    }
 
 def clean_key_phrases(raw_phrases, content):
     # Lowercase, strip, remove very long/verbose, group by frequency
@@ -53,48 +180,286 @@ def filter_entities(raw_entities):
     # Only return top 8 unique entities
     return list(dict.fromkeys(normalized))[:8]
 
-def get_seo_insights(content):
-    client = create_text_analytics_client()
-    # 1. Key Phrase Extraction (Azure uses NER, key phrase extraction, TF-IDF style weighting)
-    key_phrases_raw = client.extract_key_phrases([content])[0].key_phrases
-    key_phrases = clean_key_phrases(key_phrases_raw, content)
-
-    # 2. Sentiment Analysis
-    sentiment_result = client.analyze_sentiment([content])[0]
-    sentiment = sentiment_result.sentiment
-    sentiment_scores = sentiment_result.confidence_scores
-
-    # 3. Entity Recognition (Azure does NER + normalization)
-    entities_raw = [
-        {
-            "text": e.text,
-            "category": e.category,
-            "confidenceScore": e.confidence_score
-        }
-        for e in client.recognize_entities([content])[0].entities
-    ]
-    entities = filter_entities(entities_raw)
+class _LRUCache:
+    # Thread-safe LRU with a per-entry TTL and a total byte budget (entries are sized as JSON)
+    def __init__(self, max_bytes, ttl_seconds):
+        self.max_bytes = max_bytes
+        self.ttl_seconds = ttl_seconds
+        self._entries = OrderedDict()  # key -> (expires_at, size, value)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[2]
+
+    def put(self, key, value):
+        size = len(json.dumps(value).encode('utf-8'))
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = (time.monotonic() + self.ttl_seconds, size, value)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                self._remove(next(iter(self._entries)))
+                self._stats["evictions"] += 1
+
+    def _remove(self, key):
+        _, size, _ = self._entries.pop(key)
+        self._bytes -= size
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        with self._lock:
+            lookups = self._stats["hits"] + self._stats["misses"]
+            return dict(
+                self._stats,
+                entries=len(self._entries),
+                bytes=self._bytes,
+                max_bytes=self.max_bytes,
+                hit_ratio=round(self._stats["hits"] / lookups, 3) if lookups else 0.0,
+            )
 
+# Remote results (key phrases, entities, sentiment) are expensive and cached separately from the
+# cheap local metrics (textstat, structure counts), so evicting one tier never forces the other to rerun
+_CACHE_TTL_SECONDS = int(os.environ.get("SEO_CACHE_TTL_SECONDS", "3600"))
+_remote_cache = _LRUCache(int(os.environ.get("SEO_REMOTE_CACHE_MAX_BYTES", str(16 * 1024 * 1024))), _CACHE_TTL_SECONDS)
+_local_cache = _LRUCache(int(os.environ.get("SEO_LOCAL_CACHE_MAX_BYTES", str(2 * 1024 * 1024))), _CACHE_TTL_SECONDS)
+
+# Incremental mode keeps remote results per paragraph, plus the paragraph results of each analysis by token
+_paragraph_cache = _LRUCache(int(os.environ.get("SEO_PARAGRAPH_CACHE_MAX_BYTES", str(16 * 1024 * 1024))), _CACHE_TTL_SECONDS)
+_analysis_tokens = _LRUCache(int(os.environ.get("SEO_ANALYSIS_TOKEN_MAX_BYTES", str(8 * 1024 * 1024))), _CACHE_TTL_SECONDS)
+
+def get_cache_stats():
+    return {
+        "remote": _remote_cache.stats(),
+        "local": _local_cache.stats(),
+        "paragraphs": _paragraph_cache.stats(),
+    }
+
+def chunk_documents(documents, max_documents=_MAX_DOCUMENTS_PER_REQUEST, max_characters=_MAX_CHARACTERS_PER_REQUEST):
+    # Pack document indices into request-sized chunks, preserving input order.
+    # A single oversized document still gets its own chunk so the service reports the error for it.
+    chunks = []
+    current = []
+    current_characters = 0
+    for index, document in enumerate(documents):
+        if current and (len(current) >= max_documents or current_characters + len(document) > max_characters):
+            chunks.append(current)
+            current = []
+            current_characters = 0
+        current.append(index)
+        current_characters += len(document)
+    if current:
+        chunks.append(current)
+    return chunks
+
+def analyze_sentence_sentiments(client, sentences, *document_results):
+    # Reuse sentence labels from document-level sentiment calls where the text matches exactly
+    known = {}
+    for document_result in document_results:
+        for sentence in getattr(document_result, "sentences", None) or []:
+            known.setdefault(sentence.text.strip(), sentence.sentiment)
+    sentiments = [known.get(s.strip()) for s in sentences]
+
+    pending = [i for i, sentiment in enumerate(sentiments) if sentiment is None]
+    if not pending:
+        return sentiments
+
+    pending_texts = [sentences[i] for i in pending]
+    chunks = [[pending_texts[i] for i in chunk] for chunk in chunk_documents(pending_texts)]
+
+    def analyze_chunk(chunk):
+        # Documents that fail (e.g. too long) come back as DocumentError and are left as None;
+        # callers count them so a tone verdict from the remaining sentences is marked partial
+        labels = []
+        for result in client.analyze_sentiment(chunk):
+            if result.is_error:
+                logger.warning(f"Sentence sentiment analysis failed: {result.error.message}")
+                labels.append(None)
+            else:
+                labels.append(result.sentiment)
+        return labels
+
+    if len(chunks) == 1:
+        chunk_results = [analyze_chunk(chunks[0])]
+    else:
+        with ThreadPoolExecutor(max_workers=min(_SENTIMENT_BATCH_WORKERS, len(chunks))) as executor:
+            chunk_results = list(executor.map(analyze_chunk, chunks))
+
+    # Results come back in request order, so flattening the chunks lines up with pending
+    for index, sentiment in zip(pending, (s for chunk in chunk_results for s in chunk)):
+        sentiments[index] = sentiment
+    return sentiments
+
+def _first_result(results, operation):
+    result = results[0]
+    if result.is_error:
+        raise HttpResponseError(message=f"{operation} failed: {result.error.message}")
+    return result
+
+def _timed_call(stage, operation, documents):
+    with timer("seo_stage_duration_seconds", stage=stage):
+        return operation(documents)
+
+def _analyze_serial(client, content):
+    return (
+        _first_result(_timed_call("key_phrases", client.extract_key_phrases, [content]), "Key phrase extraction"),
+        _first_result(_timed_call("sentiment", client.analyze_sentiment, [content]), "Sentiment analysis"),
+        _first_result(_timed_call("entities", client.recognize_entities, [content]), "Entity recognition"),
+    )
+
+def _analyze_concurrent(client, content):
+    # The three analyses are independent, so latency is bounded by the slowest call
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        key_phrases = executor.submit(_timed_call, "key_phrases", client.extract_key_phrases, [content])
+        sentiment = executor.submit(_timed_call, "sentiment", client.analyze_sentiment, [content])
+        entities = executor.submit(_timed_call, "entities", client.recognize_entities, [content])
+        return (
+            _first_result(key_phrases.result(), "Key phrase extraction"),
+            _first_result(sentiment.result(), "Sentiment analysis"),
+            _first_result(entities.result(), "Entity recognition"),
+        )
+
+def _analyze_actions(client, content):
+    # One multi-action job; action results come back in the order the actions were given
+    with timer("seo_stage_duration_seconds", stage="analyze_actions"):
+        poller = client.begin_analyze_actions(
+            [content],
+            actions=[ExtractKeyPhrasesAction(), AnalyzeSentimentAction(), RecognizeEntitiesAction()],
+        )
+        document_results = next(iter(poller.result()))
+    return (
+        _first_result([document_results[0]], "Key phrase extraction"),
+        _first_result([document_results[1]], "Sentiment analysis"),
+        _first_result([document_results[2]], "Entity recognition"),
+    )
+
+def run_remote_analyses(client, content, mode=None):
+    # Returns (key_phrases_result, sentiment_result, entities_result) for a single document
+    mode = mode or _DEFAULT_ANALYSIS_MODE
+    if mode not in ANALYSIS_MODES:
+        raise ValueError(f"Unknown SEO analysis mode: {mode}")
+    if mode == "serial":
+        return _analyze_serial(client, content)
+    if mode == "actions":
+        try:
+            return _analyze_actions(client, content)
+        except (AttributeError, HttpResponseError) as e:
+            # Multi-action jobs are not available on every resource/tier; fall back to concurrent calls
+            logger.warning(f"Analyze actions unavailable, running analyses concurrently: {e}")
+    return _analyze_concurrent(client, content)
+
+def _normalize_content(content):
+    # Line endings and surrounding whitespace do not change the analysis, so they do not change the
+    # remote cache key; the text sent to Azure is always the content as given
+    return content.replace('\r\n', '\n').strip()
+
+def _content_key(content):
+    return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+def _remote_insights(client, content, mode):
+    # Everything that needs Azure Language; cached as plain data so entries are cheap to size and copy
+    key_phrases_result, sentiment_result, entities_result = run_remote_analyses(client, content, mode)
+    sentences = re.split(r'(?<=[.!?])\s+', content)
+    sentence_texts = [s for s in sentences if s.strip()]
+    scores = sentiment_result.confidence_scores
+    with timer("seo_stage_duration_seconds", stage="sentence_sentiment"):
+        sentence_sentiments = analyze_sentence_sentiments(client, sentence_texts, sentiment_result)
+    return {
+        "key_phrases_raw": list(key_phrases_result.key_phrases),
+        "sentiment": sentiment_result.sentiment,
+        "sentiment_scores": {
+            "positive": scores.positive,
+            "neutral": scores.neutral,
+            "negative": scores.negative
+        },
+        "entities_raw": [
+            {
+                "text": e.text,
+                "category": e.category,
+                "confidenceScore": e.confidence_score
+            }
+            for e in entities_result.entities
+        ],
+        "sentence_sentiments": [s for s in sentence_sentiments if s],
+        "failed_sentences": sentence_sentiments.count(None),
+    }
+
+def _local_insights(content):
     # 4. Readability & Grade Level
-    readability = int(round(textstat.flesch_reading_ease(content)))  # Ensure whole number
-    grade_level = textstat.text_standard(content)
+    with timer("seo_stage_duration_seconds", stage="readability"):
+        readability = int(round(textstat.flesch_reading_ease(content)))  # Ensure whole number
+        grade_level = textstat.text_standard(content)
 
     # 5. Content Structure Feedback
     headings = len(re.findall(r'^\s*#+\s+\w+', content, re.MULTILINE))  # Markdown headings
     bullet_points = len(re.findall(r'^\s*[-*+]\s+\w+', content, re.MULTILINE))
     short_paragraphs = sum(1 for p in content.split('\n\n') if len(p.split()) < 40)
-    structure_feedback = {
-        "headings": headings,
-        "bullet_points": bullet_points,
-        "short_paragraphs": short_paragraphs
+    return {
+        "readability": readability,
+        "grade_level": grade_level,
+        "structure_feedback": {
+            "headings": headings,
+            "bullet_points": bullet_points,
+            "short_paragraphs": short_paragraphs
+        },
     }
 
+def get_seo_insights(content, client=None, mode=None, use_cache=True):
+    if not content.strip():
+        raise ValueError("No content provided")
+    key = _content_key(_normalize_content(content))
+
+    remote = _remote_cache.get(key) if use_cache else None
+    if remote is None:
+        remote = _remote_insights(client or get_text_analytics_client(), content, mode)
+        # Partial results are returned but not cached, so the next request retries the failed sentences
+        if use_cache and not remote["failed_sentences"]:
+            _remote_cache.put(key, remote)
+
+    return _build_insights(content, remote, use_cache)
+
+def _build_insights(content, remote, use_cache=True):
+    # Local metrics depend on exact whitespace (paragraph counts), so they are keyed by the content as given
+    key = _content_key(content)
+    local = _local_cache.get(key) if use_cache else None
+    if local is None:
+        local = _local_insights(content)
+        if use_cache:
+            _local_cache.put(key, local)
+
+    # 1. Key Phrase Extraction (Azure uses NER, key phrase extraction, TF-IDF style weighting)
+    key_phrases = clean_key_phrases(remote["key_phrases_raw"], content)
+
+    # 2. Sentiment Analysis / 3. Entity Recognition (Azure does NER + normalization)
+    entities = filter_entities(remote["entities_raw"])
+
     # Additional: Tone Consistency (simple check: are all sentences same sentiment?)
-    sentences = re.split(r'(?<=[.!?])\s+', content)
-    sentence_sentiments = [client.analyze_sentiment([s])[0].sentiment for s in sentences if s.strip()]
+    # tone_partial: some sentences could not be analyzed, so the verdict covers only the rest
+    sentence_sentiments = remote["sentence_sentiments"]
     tone_consistent = len(set(sentence_sentiments)) == 1 if sentence_sentiments else True
+    tone_partial = remote.get("failed_sentences", 0) > 0
 
     # Additional: Clarity Suggestions (long sentences > 25 words)
+    sentences = re.split(r'(?<=[.!?])\s+', content)
     long_sentences = [s for s in sentences if len(s.split()) > 25]
 
     # Additional: Content Gaps (suggest if key phrases/entities are missing from intro/conclusion)
@@ -111,19 +476,146 @@ def get_seo_insights(content):
 
     return {
         "key_phrases": key_phrases,
-        "sentiment": sentiment,
-        "sentiment_scores": {
-            "positive": sentiment_scores.positive,
-            "neutral": sentiment_scores.neutral,
-            "negative": sentiment_scores.negative
-        },
+        "sentiment": remote["sentiment"],
+        "sentiment_scores": dict(remote["sentiment_scores"]),
         "entities": entities,
-        "readability": readability,
-        "grade_level": grade_level,
-        "structure_feedback": structure_feedback,
+        "readability": local["readability"],
+        "grade_level": local["grade_level"],
+        "structure_feedback": dict(local["structure_feedback"]),
         "tone_consistent": tone_consistent,
+        "tone_partial": tone_partial,
         "long_sentences": long_sentences,
         "missing_key_phrases_intro": missing_in_intro,
         "missing_key_phrases_conclusion": missing_in_conclusion,
         "call_to_action_found": cta_found
-    }
\ No newline at end of file
+    }
+
+def split_paragraphs(content):
+    # Same paragraph boundaries as short_paragraphs; blank paragraphs carry nothing to analyze
+    return [p.strip() for p in content.split('\n\n') if p.strip()]
+
+def _analyze_paragraphs(client, paragraphs):
+    # Key phrases, sentiment and entities for many paragraphs, packed into multi-document requests
+    operations = [
+        ("Key phrase extraction", "key_phrases", client.extract_key_phrases),
+        ("Sentiment analysis", "sentiment", client.analyze_sentiment),
+        ("Entity recognition", "entities", client.recognize_entities),
+    ]
+    # Each operation is chunked to its own document limit
+    operation_chunks = [
+        [[paragraphs[i] for i in chunk] for chunk in chunk_documents(paragraphs, _MAX_DOCUMENTS_PER_OPERATION[stage])]
+        for _, stage, _ in operations
+    ]
+    request_count = sum(len(chunks) for chunks in operation_chunks)
+    with ThreadPoolExecutor(max_workers=min(request_count, 3 * _SENTIMENT_BATCH_WORKERS)) as executor:
+        futures = [
+            [executor.submit(_timed_call, stage, call, chunk) for chunk in chunks]
+            for (_, stage, call), chunks in zip(operations, operation_chunks)
+        ]
+        key_phrase_results, sentiment_results, entity_results = [
+            [_first_result([r], name) for future in operation_futures for r in future.result()]
+            for (name, _, _), operation_futures in zip(operations, futures)
+        ]
+
+    sentence_lists = [[s for s in re.split(r'(?<=[.!?])\s+', p) if s.strip()] for p in paragraphs]
+    with timer("seo_stage_duration_seconds", stage="sentence_sentiment"):
+        labels = analyze_sentence_sentiments(
+            client, [s for sentences in sentence_lists for s in sentences], *sentiment_results
+        )
+
+    results = []
+    offset = 0
+    for sentences, key_phrases, sentiment, entities in zip(
+            sentence_lists, key_phrase_results, sentiment_results, entity_results):
+        scores = sentiment.confidence_scores
+        results.append({
+            "key_phrases_raw": list(key_phrases.key_phrases),
+            "sentiment": sentiment.sentiment,
+            "sentiment_scores": {
+                "positive": scores.positive,
+                "neutral": scores.neutral,
+                "negative": scores.negative
+            },
+            "entities_raw": [
+                {
+                    "text": e.text,
+                    "category": e.category,
+                    "confidenceScore": e.confidence_score
+                }
+                for e in entities.entities
+            ],
+            "sentence_sentiments": [label for label in labels[offset:offset + len(sentences)] if label],
+            "failed_sentences": labels[offset:offset + len(sentences)].count(None),
+        })
+        offset += len(sentences)
+    return results
+
+def _combine_paragraph_results(paragraphs, results):
+    # Rebuild document-level remote results; the label follows the service rule for combining sentences
+    labels = {r["sentiment"] for r in results}
+    if "mixed" in labels or {"positive", "negative"} <= labels:
+        sentiment = "mixed"
+    elif "positive" in labels:
+        sentiment = "positive"
+    elif "negative" in labels:
+        sentiment = "negative"
+    else:
+        sentiment = "neutral"
+
+    # Document scores are the paragraph scores weighted by paragraph length
+    total_length = sum(len(p) for p in paragraphs) or 1
+    sentiment_scores = {
+        label: round(sum(r["sentiment_scores"][label] * len(p) for p, r in zip(paragraphs, results)) / total_length, 2)
+        for label in ("positive", "neutral", "negative")
+    }
+    return {
+        "key_phrases_raw": [phrase for r in results for phrase in r["key_phrases_raw"]],
+        "sentiment": sentiment,
+        "sentiment_scores": sentiment_scores,
+        "entities_raw": [entity for r in results for entity in r["entities_raw"]],
+        "sentence_sentiments": [label for r in results for label in r["sentence_sentiments"]],
+        "failed_sentences": sum(r.get("failed_sentences", 0) for r in results),
+    }
+
+def get_seo_insights_incremental(content, previous_token=None, client=None):
+    # Pass the analysis_token of an earlier response as previous_token: paragraphs unchanged since
+    # that analysis are reused from it, others from the shared paragraph cache, and only the rest
+    # are sent to Azure
+    if not content.strip():
+        raise ValueError("No content provided")
+    paragraphs = split_paragraphs(content.replace('\r\n', '\n'))
+    fingerprints = [_content_key(p) for p in paragraphs]
+
+    previous = _analysis_tokens.get(previous_token) if previous_token else None
+    previous_results = previous["results"] if previous is not None else {}
+    results = [previous_results.get(f) for f in fingerprints]
+    from_previous = sum(1 for result in results if result is not None)
+    results = [result if result is not None else _paragraph_cache.get(f) for f, result in zip(fingerprints, results)]
+    pending = [i for i, result in enumerate(results) if result is None]
+    if pending:
+        fresh = _analyze_paragraphs(client or get_text_analytics_client(), [paragraphs[i] for i in pending])
+        for i, result in zip(pending, fresh):
+            results[i] = result
+            if not result["failed_sentences"]:
+                _paragraph_cache.put(fingerprints[i], result)
+
+    insights = _build_insights(content, _combine_paragraph_results(paragraphs, results))
+
+    # The token keeps this analysis's complete paragraph results for the next edit of the article
+    token = uuid.uuid4().hex
+    _analysis_tokens.put(token, {
+        "fingerprints": fingerprints,
+        "results": {f: r for f, r in zip(fingerprints, results) if not r.get("failed_sentences")},
+    })
+    insights["analysis_token"] = token
+    insights["incremental"] = {
+        "paragraphs": len(paragraphs),
+        "analyzed_paragraphs": len(pending),
+        "reused_paragraphs": len(paragraphs) - len(pending),
+        "reused_from_previous": from_previous,
+        "reused_from_cache": len(paragraphs) - len(pending) - from_previous,
+        "previous_token_found": previous is not None,
+        "changed_paragraphs": len(set(fingerprints) - set(previous["fingerprints"])) if previous is not None else None,
+        "removed_paragraphs": len(set(previous["fingerprints"]) - set(fingerprints)) if previous is not None else None,
+    }
+    return insights
@@ -0,0 +1,319 @@
+import io
+import os
+import re
+import asyncio
+import logging
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor
+from smart_receipt_tracker.pdf_pages import is_pdf
+from smart_receipt_tracker.rate_limiter import is_outage
+from smart_receipt_tracker.uploads import SpooledUpload
+from smart_receipt_tracker.receipt_records import LOCAL_OCR, LineItem, ReceiptRecord, parse_amount, parse_currency
+
+try:
+    import pytesseract
+    from PIL import Image
+except ImportError:
+    pytesseract = None
+    Image = None
+
+logger = logging.getLogger(__name__)
+
+_MONEY = re.compile(r"[$€£]?\s?-?\d{1,3}(?:[,.]?\d{3})*[.,]\d{2}(?!\d)")
+_DATE = re.compile(r"\b(\d{4}-\d{2}-\d{2}|\d{1,2}[/.-]\d{1,2}[/.-]\d{2,4})\b")
+_TOTAL_LINE = re.compile(r"\b(total|amount\s+due|balance\s+due)\b", re.IGNORECASE)
+_SUBTOTAL_LINE = re.compile(r"\bsub\s*-?\s*total", re.IGNORECASE)
+# Priced lines that are payment or summary rows rather than purchased items
+_NOT_ITEM = re.compile(r"\b(sub\s*-?\s*total|total|tax|vat|change|cash|card|visa|mastercard|balance|tip|due|tender)\b",
+                       re.IGNORECASE)
+_QUANTITY_PREFIX = re.compile(r"^(\d{1,3})\s*[xX@]\s+")
+_LETTERS = re.compile(r"[^\W\d_]{3,}")
+
+
+def parse_receipt_text(text, filename):
+    """ReceiptRecord from OCR text: merchant from the top lines, the last total, a printed date and priced lines"""
+    lines = [line.strip() for line in text.splitlines() if line.strip()]
+    merchant_name = next((line for line in lines[:5] if _LETTERS.search(line) and not _MONEY.search(line)), None)
+    total = None
+    for line in lines:
+        if _TOTAL_LINE.search(line) and not _SUBTOTAL_LINE.search(line):
+            amounts = _MONEY.findall(line)
+            if amounts:
+                total = amounts[-1].strip()
+    date = next((match.group(1) for match in map(_DATE.search, lines) if match), None)
+
+    grouped = {}  # (description, printed price) -> LineItem
+    for line in lines:
+        amounts = _MONEY.findall(line)
+        if not amounts or line == merchant_name or _NOT_ITEM.search(line):
+            continue
+        price = amounts[-1].strip()
+        description = line[:line.rfind(amounts[-1])].strip(" .:-\t")
+        quantity = "1"
+        match = _QUANTITY_PREFIX.match(description)
+        if match:
+            quantity = match.group(1)
+            description = description[match.end():]
+        if not _LETTERS.search(description):
+            continue
+        item = grouped.get((description, price))
+        if item is None:
+            grouped[(description, price)] = LineItem(description, price, parse_amount(price), quantity, float(quantity))
+        else:
+            item.add_quantity(float(quantity))
+    for item in grouped.values():
+        if item.quantity_value != 1:
+            item.description = f"{item.quantity}x {item.description}"
+
+    if merchant_name is None and total is None:
+        return ReceiptRecord.failure(filename, "No receipt text found", engine=LOCAL_OCR)
+    return ReceiptRecord(
+        filename=filename,
+        success=True,
+        merchant_name=merchant_name,
+        total=total,
+        total_amount=parse_amount(total),
+        currency=parse_currency(total),
+        date=date,
+        items=tuple(grouped.values()),
+        engine=LOCAL_OCR,
+    )
+
+
+def tesseract_text(image_bytes):
+    """Text of a receipt image read with Tesseract"""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        # --psm 4: a single column of text of variable sizes, the usual receipt layout
+        return pytesseract.image_to_string(image.convert("L"), config="--psm 4")
+
+
+def tesseract_installed():
+    """True when pytesseract, Pillow and the tesseract binary are all available"""
+    if pytesseract is None or Image is None:
+        return False
+    try:
+        pytesseract.get_tesseract_version()
+    except Exception:
+        return False
+    return True
+
+
+def _ocr_receipt(ocr, image_bytes, filename):
+    """Process pool task: OCR one image and parse it into records"""
+    try:
+        text = ocr(image_bytes)
+    except Exception as e:
+        return (ReceiptRecord.failure(filename, f"Local OCR failed: {str(e)}", engine=LOCAL_OCR),)
+    return (parse_receipt_text(text, filename),)
+
+
+class AnalyzerBackend:
+    """Interface of an engine that turns an upload into receipt records
+
+    analyze() returns a tuple with one ReceiptRecord per receipt found, and
+    raises when the engine itself failed rather than the receipt.
+    """
+
+    name = None
+
+    def available(self):
+        return True
+
+    def has_capacity(self):
+        """Whether a call now would start without waiting for earlier ones"""
+        return True
+
+    def analyze(self, image_data, image_hash, filename):
+        raise NotImplementedError
+
+    def stats(self):
+        return {}
+
+
+class LocalOcrBackend(AnalyzerBackend):
+    """Offline fallback: OCR in a process pool plus regex extraction of merchant, total, date and items
+
+    Tesseract is CPU-bound, so it runs in separate processes, created on first
+    use in each worker. Results are coarser than the receipt model's and are
+    not cached, so the next upload of the same file gets a full analysis.
+    `ocr` replaces Tesseract with any picklable image-bytes-to-text function.
+    """
+
+    name = LOCAL_OCR
+
+    def __init__(self, enabled=True, max_workers=2, ocr=None):
+        self.enabled = enabled
+        self.max_workers = max_workers
+        self.ocr = ocr or tesseract_text
+        self._installed = True if ocr is not None else None
+        self._executor = None
+        self._pid = None
+        self._lock = threading.Lock()
+        self._pending = 0
+        self._analyses = 0
+        self._failures = 0
+
+    def available(self):
+        if not self.enabled:
+            return False
+        if self._installed is None:
+            with self._lock:
+                if self._installed is None:
+                    self._installed = tesseract_installed()
+                    if not self._installed:
+                        logger.warning("Local OCR fallback disabled: pytesseract, Pillow or tesseract is missing")
+        return self._installed
+
+    def has_capacity(self):
+        return self._pending < self.max_workers
+
+    def _pool(self):
+        # Pools do not survive fork, so each worker process starts its own; spawned children hold no locks
+        with self._lock:
+            if self._executor is None or self._pid != os.getpid():
+                self._executor = ProcessPoolExecutor(
+                    max_workers=self.max_workers, mp_context=multiprocessing.get_context("spawn")
+                )
+                self._pid = os.getpid()
+            return self._executor
+
+    def submit(self, image_data, filename):
+        """Queue an upload for OCR; returns a Future of its records"""
+        if is_pdf(image_data):
+            future = Future()
+            future.set_result((ReceiptRecord.failure(filename, "Local OCR reads images only", engine=LOCAL_OCR),))
+            return future
+        image_bytes = image_data.getvalue() if isinstance(image_data, SpooledUpload) else bytes(image_data)
+        with self._lock:
+            self._pending += 1
+        future = self._pool().submit(_ocr_receipt, self.ocr, image_bytes, filename)
+        future.add_done_callback(self._done)
+        return future
+
+    def _done(self, future):
+        failed = future.exception() is not None or not all(record.success for record in future.result())
+        with self._lock:
+            self._pending -= 1
+            self._analyses += 1
+            self._failures += failed
+
+    def analyze(self, image_data, image_hash, filename):
+        return self.submit(image_data, filename).result()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "available": bool(self.enabled and self._installed),
+                "workers": self.max_workers,
+                "pending": self._pending,
+                "analyses": self._analyses,
+                "failures": self._failures,
+            }
+
+
+class BackendRouter:
+    """Sends each upload to the primary backend, or to the fallback while the primary is failing or backed up
+
+    The fallback takes over while the circuit breaker is open. It also sheds
+    load when `max_queue_depth` or more calls are waiting for the primary and
+    the fallback has an idle worker. A primary call that fails with an outage
+    (throttling, 5xx, connection errors) counts towards opening the breaker
+    and is answered by the fallback. Other errors reach the caller as before.
+    """
+
+    def __init__(self, primary, fallback, breaker, queue_depth, max_queue_depth=32):
+        self.primary = primary
+        self.fallback = fallback
+        self.breaker = breaker
+        self.queue_depth = queue_depth
+        self.max_queue_depth = max_queue_depth
+        self._lock = threading.Lock()
+        self._routed = {}
+        self._fallbacks = {"breaker_open": 0, "queue_depth": 0, "outage": 0}
+
+    def _count(self, backend, reason=None):
+        with self._lock:
+            self._routed[backend.name] = self._routed.get(backend.name, 0) + 1
+            if reason:
+                self._fallbacks[reason] += 1
+
+    def select(self):
+        """Backend for the next upload; the primary unless the fallback should take it"""
+        fallback = self.fallback if self.fallback is not None and self.fallback.available() else None
+        if fallback is not None:
+            # Checked before the breaker, so shedding never claims a half-open breaker's trial call
+            if self.max_queue_depth and self.queue_depth() >= self.max_queue_depth and fallback.has_capacity():
+                self._count(fallback, "queue_depth")
+                return fallback
+            if not self.breaker.allow():
+                self._count(fallback, "breaker_open")
+                return fallback
+        self._count(self.primary)
+        return self.primary
+
+    def succeeded(self):
+        self.breaker.record_success()
+
+    def failed(self, error):
+        """Record a failed primary call; returns the backend to retry it on, or None to raise the error"""
+        if not is_outage(error):
+            # The service answered; the request itself was bad
+            self.breaker.record_success()
+            return None
+        self.breaker.record_failure()
+        if self.fallback is None or not self.fallback.available():
+            return None
+        self._count(self.fallback, "outage")
+        return self.fallback
+
+    def _fallback_for(self, error, filename):
+        """The backend to answer a failed primary call with; re-raises `error` when there is none"""
+        fallback = self.failed(error)
+        if fallback is None:
+            raise error
+        logger.warning(f"Receipt {filename} analysis failed, using {fallback.name}: {str(error)}")
+        return fallback
+
+    def analyze(self, image_data, image_hash, filename):
+        """Records for an upload from whichever backend should handle it now"""
+        backend = self.select()
+        if backend is self.primary:
+            try:
+                records = backend.analyze(image_data, image_hash, filename)
+            except Exception as e:
+                backend = self._fallback_for(e, filename)
+            else:
+                self.succeeded()
+                return records
+        return backend.analyze(image_data, image_hash, filename)
+
+    async def analyze_async(self, image_data, image_hash, filename, analyze_primary):
+        """analyze() for the asyncio path: `analyze_primary` is the primary's coroutine function
+
+        The other backends are synchronous, so they run in a thread; local OCR
+        waits on its process pool from there.
+        """
+        backend = self.select()
+        if backend is self.primary:
+            try:
+                records = await analyze_primary(image_data, image_hash, filename)
+            except Exception as e:
+                backend = self._fallback_for(e, filename)
+            else:
+                self.succeeded()
+                return records
+        return await asyncio.to_thread(backend.analyze, image_data, image_hash, filename)
+
+    def stats(self):
+        with self._lock:
+            routed = dict(self._routed)
+            fallbacks = dict(self._fallbacks)
+        return {
+            "routed": routed,
+            "fallbacks": fallbacks,
+            "queue_depth": self.queue_depth(),
+            "max_queue_depth": self.max_queue_depth,
+            "breaker": self.breaker.stats(),
+            "fallback": self.fallback.stats() if self.fallback is not None else None,
+        }
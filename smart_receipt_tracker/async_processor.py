@@ -0,0 +1,159 @@
+import os
+import asyncio
+import logging
+from functools import partial
+from azure.ai.documentintelligence.aio import DocumentIntelligenceClient as AsyncDocumentIntelligenceClient
+from azure.core.credentials import AzureKeyCredential
+from metrics import AzureCallMetricsPolicy, timer
+from smart_receipt_tracker.uploads import SpooledUpload, upload_hash
+from smart_receipt_tracker.rate_limiter import backoff_delay, classify_error, retry_after_seconds
+from smart_receipt_tracker.smart_receipt_processor import (
+    _MAX_ANALYSIS_RETRIES,
+    _build_tasks,
+    _create_error_response,
+    _limiter,
+    _pdf_splitter,
+    _polling_policy,
+    _polling_stats,
+    _preprocessor,
+    _router,
+    cache_result,
+    extract_receipts,
+    get_endpoint,
+    join_in_flight,
+    label_records,
+    leave_in_flight,
+    lookup_cached_result,
+)
+
+logger = logging.getLogger(__name__)
+
+# Analyses kept in flight per batch; each one is a coroutine waiting on polling, not an OS thread
+DEFAULT_CONCURRENCY = int(os.environ.get("RECEIPT_ASYNC_CONCURRENCY", "32"))
+
+
+def create_async_client():
+    """Create an async Document Intelligence client; it is bound to the event loop that uses it"""
+    endpoint = get_endpoint()
+    key = os.environ.get("DOCUMENT_INTELLIGENCE_KEY")
+    return AsyncDocumentIntelligenceClient(
+        endpoint=endpoint, credential=AzureKeyCredential(key),
+        per_call_policies=[AzureCallMetricsPolicy("document_intelligence")]
+    )
+
+
+async def process_receipt_file_async(client, image_data, filename="receipt.jpg"):
+    """Process an uploaded image or PDF with the async client, sharing the sync pipeline's caches
+
+    Returns a tuple with one ReceiptRecord per receipt found, like process_receipt_file.
+    """
+    try:
+        with timer("receipt_stage_duration_seconds", stage="hash"):
+            image_hash = upload_hash(image_data)
+        cached = lookup_cached_result(image_hash)
+        if cached is not None:
+            return label_records(cached, filename)
+
+        # Coalesces with identical analyses from threads and coroutines alike
+        future, leader = join_in_flight(image_hash)
+        if not leader:
+            return label_records(await asyncio.wrap_future(future), filename)
+        try:
+            records = await _router.analyze_async(image_data, image_hash, filename, partial(_analyze_upload, client))
+            future.set_result(records)
+            return records
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            leave_in_flight(image_hash)
+    except Exception as e:
+        logger.error(f"Error processing receipt {filename}: {str(e)}")
+        return (_create_error_response(filename, str(e)),)
+
+
+async def _analyze_upload(client, image_data, image_hash, filename):
+    """Analyze an upload with Document Intelligence, page ranges of a long PDF concurrently, and cache the records"""
+    # Splitting parses the PDF, so like re-encoding it runs off the event loop
+    ranges = await asyncio.to_thread(_pdf_splitter.split, image_data)
+    if ranges is None:
+        results = [await _analyze_with_retries(client, image_data, filename)]
+    else:
+        results = await asyncio.gather(
+            *(_analyze_with_retries(client, part, filename, preprocess=False) for part in ranges)
+        )
+    with timer("receipt_stage_duration_seconds", stage="extract"):
+        records = extract_receipts(results, filename)
+    cache_result(image_hash, records)
+    return records
+
+
+async def _analyze_with_retries(client, image_data, filename, preprocess=True):
+    """Analyze under the shared concurrency limiter, retrying throttled and transient failures"""
+    upload = image_data
+    if preprocess:
+        # Re-encoding is CPU-bound, so it runs off the event loop
+        with timer("receipt_stage_duration_seconds", stage="preprocess"):
+            upload = await asyncio.to_thread(_preprocessor.process, image_data)
+    if isinstance(upload, SpooledUpload):
+        # aiohttp may close file bodies after sending them, so retries upload bytes instead;
+        # the concurrency limit bounds how many are held at once
+        upload = await asyncio.to_thread(upload.getvalue)
+    for attempt in range(_MAX_ANALYSIS_RETRIES + 1):
+        async with _limiter.slot_async() as outcome:
+            try:
+                # Only the submit skips SDK status retries; polls keep them (see _analyze_document)
+                polling = _polling_policy.create_async(len(upload), get_endpoint())
+                with timer("receipt_stage_duration_seconds", stage="submit"):
+                    poller = await client.begin_analyze_document(
+                        model_id="prebuilt-receipt",
+                        body=upload,
+                        content_type="application/octet-stream",
+                        polling=polling,
+                        retry_status=0
+                    )
+                with timer("receipt_stage_duration_seconds", stage="poll"):
+                    result = await poller.result()
+                _polling_stats.record(polling)
+                return result
+            except Exception as e:
+                kind = classify_error(e)
+                retry_after = retry_after_seconds(e)
+                if kind == "throttled":
+                    outcome.throttle(retry_after)
+                else:
+                    outcome.fail()
+                if kind is None or attempt == _MAX_ANALYSIS_RETRIES:
+                    raise
+        delay = backoff_delay(attempt, retry_after)
+        logger.warning(f"Receipt {filename} {kind} (attempt {attempt + 1}), retrying in {delay:.1f}s")
+        await asyncio.sleep(delay)
+
+
+async def process_multiple_receipts_async(images_data, concurrency=None, client=None):
+    """Process receipts with up to `concurrency` files in flight; results keep input order
+
+    A file holding several receipts contributes one record per receipt in place.
+    """
+    if not images_data:
+        return {"results": []}
+
+    semaphore = asyncio.Semaphore(concurrency or DEFAULT_CONCURRENCY)
+
+    async def run(data, name):
+        async with semaphore:
+            return await process_receipt_file_async(client, data, name)
+
+    async def run_all():
+        files = await asyncio.gather(*(run(d, n) for d, n in _build_tasks(images_data)))
+        return {"results": [record for records in files for record in records]}
+
+    if client is not None:
+        return await run_all()
+    async with create_async_client() as client:
+        return await run_all()
+
+
+def run_multiple_receipts(images_data, concurrency=None):
+    """Synchronous entry point: run the async pipeline on a fresh event loop in this thread"""
+    return asyncio.run(process_multiple_receipts_async(images_data, concurrency))
@@ -0,0 +1,72 @@
+import io
+import threading
+from smart_receipt_tracker.uploads import SpooledUpload, rewind, upload_size
+
+try:
+    from PIL import Image, ImageOps
+except ImportError:
+    Image = None
+    ImageOps = None
+
+
+class ImagePreprocessor:
+    """Downscale, grayscale and re-encode receipt photos as compact JPEG before analysis
+
+    Anything Pillow cannot open (PDFs, TIFF pages it rejects, corrupt files) and
+    any image that would not get smaller is passed through unchanged.
+    """
+
+    def __init__(self, enabled=True, max_dimension=2048, quality=80):
+        self.enabled = enabled and Image is not None
+        self.max_dimension = max_dimension
+        self.quality = quality
+        self._lock = threading.Lock()
+        self._images = 0
+        self._converted = 0
+        self._bytes_in = 0
+        self._bytes_out = 0
+
+    def process(self, image_data):
+        """Return the bytes (or the unchanged upload) to send for an image"""
+        if not self.enabled:
+            return image_data
+        output = self._normalize(image_data)
+        with self._lock:
+            self._images += 1
+            self._bytes_in += upload_size(image_data)
+            self._bytes_out += upload_size(output)
+            if output is not image_data:
+                self._converted += 1
+        return output
+
+    def _normalize(self, image_data):
+        """Re-encoded image, or the original bytes if it cannot or need not be shrunk"""
+        source = rewind(image_data) if isinstance(image_data, SpooledUpload) else io.BytesIO(image_data)
+        try:
+            with Image.open(source) as image:
+                if getattr(image, "n_frames", 1) > 1:
+                    # Multi-page TIFFs are analyzed page by page by the service
+                    return image_data
+                image = ImageOps.exif_transpose(image)
+                image = image.convert("L")
+                image.thumbnail((self.max_dimension, self.max_dimension), Image.LANCZOS)
+                buffer = io.BytesIO()
+                image.save(buffer, format="JPEG", quality=self.quality, optimize=True)
+        except Exception:
+            return image_data
+        output = buffer.getvalue()
+        return output if len(output) < upload_size(image_data) else image_data
+
+    def stats(self):
+        """Counts of processed and converted images and the upload bytes saved"""
+        with self._lock:
+            saved = self._bytes_in - self._bytes_out
+            return {
+                "enabled": self.enabled,
+                "images": self._images,
+                "converted": self._converted,
+                "bytes_in": self._bytes_in,
+                "bytes_out": self._bytes_out,
+                "bytes_saved": saved,
+                "saved_ratio": round(saved / self._bytes_in, 3) if self._bytes_in else 0.0,
+            }
@@ -0,0 +1,83 @@
+import io
+import threading
+from smart_receipt_tracker.uploads import SpooledUpload, rewind
+
+try:
+    from pypdf import PdfReader, PdfWriter
+except ImportError:
+    PdfReader = None
+    PdfWriter = None
+
+
+def is_pdf(image_data):
+    """True when an upload (bytes or SpooledUpload) starts with the PDF header"""
+    if isinstance(image_data, SpooledUpload):
+        header = rewind(image_data).read(5)
+        rewind(image_data)
+        return header == b"%PDF-"
+    return bytes(image_data[:5]) == b"%PDF-"
+
+
+class PdfPageSplitter:
+    """Split multi-page PDFs into smaller PDFs of consecutive pages that can be analyzed in parallel
+
+    Each range is a standalone PDF holding only its own pages, so the upload
+    bytes are divided between the ranges rather than repeated for each one.
+    A document that crosses a range boundary comes back as partial receipts,
+    so only PDFs of at least `min_pages` pages (expense reports, not a long
+    invoice) are split. Images, shorter PDFs and anything pypdf cannot read
+    (encrypted or corrupt files) are not split.
+    """
+
+    def __init__(self, enabled=True, pages_per_range=2, min_pages=10):
+        self.enabled = enabled and PdfReader is not None
+        self.pages_per_range = max(pages_per_range, 1)
+        self.min_pages = min_pages
+        self._lock = threading.Lock()
+        self._pdfs = 0
+        self._split = 0
+        self._pages = 0
+        self._ranges = 0
+
+    def split(self, image_data):
+        """Return a list of page-range PDFs as bytes, or None to analyze the upload as it is"""
+        if not self.enabled or not is_pdf(image_data):
+            return None
+        try:
+            reader = PdfReader(rewind(image_data) if isinstance(image_data, SpooledUpload) else io.BytesIO(image_data))
+            page_count = len(reader.pages)
+            ranges = None
+            if page_count >= self.min_pages and page_count > self.pages_per_range:
+                ranges = [self._write_range(reader, start) for start in range(0, page_count, self.pages_per_range)]
+        except Exception:
+            return None
+        finally:
+            rewind(image_data)
+        with self._lock:
+            self._pdfs += 1
+            self._pages += page_count
+            if ranges:
+                self._split += 1
+                self._ranges += len(ranges)
+        return ranges
+
+    def _write_range(self, reader, start):
+        writer = PdfWriter()
+        for page in reader.pages[start:start + self.pages_per_range]:
+            writer.add_page(page)
+        buffer = io.BytesIO()
+        writer.write(buffer)
+        return buffer.getvalue()
+
+    def stats(self):
+        """Counts of PDFs seen, PDFs split, their pages and the ranges analyzed"""
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "pages_per_range": self.pages_per_range,
+                "min_pages": self.min_pages,
+                "pdfs": self._pdfs,
+                "split": self._split,
+                "pages": self._pages,
+                "ranges": self._ranges,
+            }
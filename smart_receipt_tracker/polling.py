@@ -0,0 +1,119 @@
+import time
+import threading
+from collections import deque
+from datetime import datetime
+from azure.core.polling.base_polling import LROBasePolling
+from azure.core.polling.async_base_polling import AsyncLROBasePolling
+from smart_receipt_tracker.rate_limiter import THROTTLE_STATUS_CODES, retry_after_from_headers
+
+
+class PollingPolicy:
+    """Polling schedule for analyze operations: a short first interval growing exponentially to a cap.
+
+    Larger documents take longer to analyze, so their first interval is scaled
+    up rather than spending status requests on polls that cannot succeed yet.
+    Document Intelligence sends Retry-After: 1 on every running poll, so the
+    hint only sets the wait after a throttled (429/503) response, and only when
+    honor_retry_after is on; otherwise it would hold every poll to a second.
+    Operation config passed to create() applies to every status poll, so
+    per-request options such as retry_status belong on the submit call only.
+    """
+
+    # (upper size bound in bytes, initial interval multiplier)
+    SIZE_SCALING = ((256 * 1024, 1.0), (2 * 1024 * 1024, 2.0), (float("inf"), 4.0))
+
+    def __init__(self, initial_interval=0.25, multiplier=1.5, max_interval=1.0, honor_retry_after=True):
+        self.initial_interval = initial_interval
+        self.multiplier = multiplier
+        self.max_interval = max_interval
+        self.honor_retry_after = honor_retry_after
+
+    def initial_interval_for(self, size_bytes):
+        for upper_bound, scale in self.SIZE_SCALING:
+            if size_bytes <= upper_bound:
+                return min(self.initial_interval * scale, self.max_interval)
+        return self.max_interval
+
+    def create(self, size_bytes, endpoint, **operation_config):
+        """Polling method for begin_analyze_document(polling=...) on the sync client"""
+        return AdaptiveLROPolling(self, size_bytes, path_format_arguments={"endpoint": endpoint}, **operation_config)
+
+    def create_async(self, size_bytes, endpoint, **operation_config):
+        """Polling method for begin_analyze_document(polling=...) on the aio client"""
+        return AsyncAdaptiveLROPolling(
+            self, size_bytes, path_format_arguments={"endpoint": endpoint}, **operation_config
+        )
+
+
+class _AdaptiveDelayMixin:
+    """Replaces the fixed polling interval with the policy schedule and records poll timing"""
+
+    def __init__(self, policy, size_bytes, **kwargs):
+        self._policy = policy
+        self._next_interval = policy.initial_interval_for(size_bytes)
+        self.polls = 0
+        self.poll_wait_seconds = 0.0
+        self.started_at = time.monotonic()
+        super().__init__(timeout=self._next_interval, **kwargs)
+
+    def _extract_delay(self):
+        delay = self._next_interval
+        self._next_interval = min(self._next_interval * self._policy.multiplier, self._policy.max_interval)
+        response = self._pipeline_response.http_response
+        if self._policy.honor_retry_after and response.status_code in THROTTLE_STATUS_CODES:
+            delay = max(delay, retry_after_from_headers(response.headers) or 0)
+        self.polls += 1
+        self.poll_wait_seconds += delay
+        return delay
+
+    def service_analysis_seconds(self):
+        """Analysis time reported by the service (lastUpdatedDateTime - createdDateTime), if available"""
+        try:
+            body = self._pipeline_response.http_response.json()
+            created = datetime.fromisoformat(body["createdDateTime"])
+            updated = datetime.fromisoformat(body["lastUpdatedDateTime"])
+            return max((updated - created).total_seconds(), 0.0)
+        except Exception:
+            return None
+
+
+class AdaptiveLROPolling(_AdaptiveDelayMixin, LROBasePolling):
+    pass
+
+
+class AsyncAdaptiveLROPolling(_AdaptiveDelayMixin, AsyncLROBasePolling):
+    pass
+
+
+class PollingStats:
+    """Analysis time versus time spent waiting on polls, over recent analyses"""
+
+    def __init__(self, max_samples=500):
+        self._samples = deque(maxlen=max_samples)  # (total, service analysis or None, polls, poll wait)
+        self._lock = threading.Lock()
+
+    def record(self, polling_method):
+        total = time.monotonic() - polling_method.started_at
+        with self._lock:
+            self._samples.append((
+                total,
+                polling_method.service_analysis_seconds(),
+                polling_method.polls,
+                polling_method.poll_wait_seconds,
+            ))
+
+    def stats(self):
+        with self._lock:
+            samples = list(self._samples)
+        if not samples:
+            return {"analyses": 0}
+        totals = sorted(s[0] for s in samples)
+        # Overhead is the time between the service finishing and the client noticing
+        overheads = sorted(s[0] - s[1] for s in samples if s[1] is not None)
+        return {
+            "analyses": len(samples),
+            "p50_total_seconds": round(totals[len(totals) // 2], 3),
+            "p50_poll_overhead_seconds": round(overheads[len(overheads) // 2], 3) if overheads else None,
+            "mean_polls": round(sum(s[2] for s in samples) / len(samples), 2),
+            "mean_poll_wait_seconds": round(sum(s[3] for s in samples) / len(samples), 3),
+        }
@@ -0,0 +1,267 @@
+import time
+import random
+import asyncio
+import threading
+from collections import deque
+from contextlib import contextmanager, asynccontextmanager
+from email.utils import parsedate_to_datetime
+from azure.core.exceptions import HttpResponseError, ServiceRequestError, ServiceResponseError
+
+# "Service busy" statuses shrink the concurrency limit; transient server errors are only retried
+THROTTLE_STATUS_CODES = {429, 503}
+TRANSIENT_STATUS_CODES = {500, 502, 504}
+
+
+class AdaptiveConcurrencyLimiter:
+    """AIMD concurrency limit shared by every Document Intelligence call in the process.
+
+    Each successful call raises the limit by 1/limit (about +1 per full window
+    of calls); a throttled call halves it and pauses new calls for the
+    service's Retry-After period. Other failed calls leave it unchanged, so
+    the limit never grows while the service is erroring.
+    """
+
+    def __init__(self, initial_limit=4, min_limit=1, max_limit=16, decrease_factor=0.5, window_seconds=60):
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.decrease_factor = decrease_factor
+        self.window_seconds = window_seconds
+        self._limit = float(initial_limit)
+        self._in_flight = 0
+        self._waiting = 0
+        self._paused_until = 0.0
+        self._last_decrease = 0.0
+        self._events = deque()  # (timestamp, throttled) for the throttle rate window
+        self._condition = threading.Condition()
+
+    @property
+    def limit(self):
+        return max(self.min_limit, int(self._limit))
+
+    @property
+    def waiting(self):
+        """Calls queued for a slot right now"""
+        return self._waiting
+
+    def _can_start(self):
+        return self._in_flight < self.limit and time.monotonic() >= self._paused_until
+
+    def try_acquire(self):
+        """Take a slot if one is free right now"""
+        with self._condition:
+            if not self._can_start():
+                return False
+            self._in_flight += 1
+            return True
+
+    def acquire(self):
+        """Block until a slot is free and no throttling pause is active"""
+        with self._condition:
+            self._waiting += 1
+            try:
+                while not self._can_start():
+                    self._condition.wait(timeout=max(self._paused_until - time.monotonic(), 0.05))
+            finally:
+                self._waiting -= 1
+            self._in_flight += 1
+
+    async def acquire_async(self):
+        """Async variant of acquire that never blocks the event loop"""
+        if self.try_acquire():
+            return
+        with self._condition:
+            self._waiting += 1
+        try:
+            while not self.try_acquire():
+                await asyncio.sleep(max(min(self._paused_until - time.monotonic(), 1.0), 0.05))
+        finally:
+            with self._condition:
+                self._waiting -= 1
+
+    def release(self, throttled=False, retry_after=None, failed=False):
+        """Return a slot and adjust the limit from the call's outcome"""
+        now = time.monotonic()
+        with self._condition:
+            self._in_flight -= 1
+            self._events.append((now, throttled))
+            if throttled:
+                # One decrease per burst: throttles from calls already in flight do not compound
+                if now - self._last_decrease >= 1.0:
+                    self._limit = max(self.min_limit, self._limit * self.decrease_factor)
+                    self._last_decrease = now
+                if retry_after:
+                    self._paused_until = max(self._paused_until, now + retry_after)
+            elif not failed:
+                self._limit = min(self.max_limit, self._limit + 1 / self._limit)
+            self._condition.notify_all()
+
+    @contextmanager
+    def slot(self):
+        """Hold a slot for a call; mark a failed call with outcome.throttle(retry_after) or outcome.fail()"""
+        self.acquire()
+        outcome = _Outcome()
+        try:
+            yield outcome
+        finally:
+            self.release(outcome.throttled, outcome.retry_after, outcome.failed)
+
+    @asynccontextmanager
+    async def slot_async(self):
+        await self.acquire_async()
+        outcome = _Outcome()
+        try:
+            yield outcome
+        finally:
+            self.release(outcome.throttled, outcome.retry_after, outcome.failed)
+
+    def stats(self):
+        now = time.monotonic()
+        with self._condition:
+            while self._events and now - self._events[0][0] > self.window_seconds:
+                self._events.popleft()
+            calls = len(self._events)
+            throttled = sum(1 for _, was_throttled in self._events if was_throttled)
+            return {
+                "limit": self.limit,
+                "in_flight": self._in_flight,
+                "waiting": self._waiting,
+                "calls_in_window": calls,
+                "throttled_in_window": throttled,
+                "throttle_rate": round(throttled / calls, 3) if calls else 0.0,
+                "paused_for_seconds": round(max(self._paused_until - now, 0.0), 2),
+            }
+
+
+class CircuitBreaker:
+    """Stops sending work to a failing service for a while, then lets a single trial call through
+
+    Closed: every call is allowed. `failure_threshold` consecutive failures
+    open the breaker, and calls are refused for `reset_seconds`. After that it
+    is half-open: one trial call is allowed, and its outcome closes the breaker
+    or opens it again.
+    """
+
+    def __init__(self, failure_threshold=5, reset_seconds=30.0):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+        self._opened = 0
+        self._refused = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._state()
+
+    def _state(self):
+        if self._opened_at is None:
+            return "closed"
+        if time.monotonic() - self._opened_at < self.reset_seconds:
+            return "open"
+        return "half_open"
+
+    def allow(self):
+        """Whether a call may go to the service now; a half-open breaker admits one trial at a time"""
+        with self._lock:
+            state = self._state()
+            if state == "closed":
+                return True
+            if state == "half_open" and not self._trial_running:
+                self._trial_running = True
+                return True
+            self._refused += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self._failures = 0
+            self._opened_at = None
+            self._trial_running = False
+
+    def record_failure(self):
+        with self._lock:
+            self._failures += 1
+            if self._trial_running or self._failures >= self.failure_threshold:
+                if self._opened_at is None or self._trial_running:
+                    self._opened += 1
+                self._opened_at = time.monotonic()
+            self._trial_running = False
+
+    def stats(self):
+        with self._lock:
+            state = self._state()
+            return {
+                "state": state,
+                "consecutive_failures": self._failures,
+                "opened": self._opened,
+                "refused": self._refused,
+                "open_for_seconds": round(max(self._opened_at + self.reset_seconds - time.monotonic(), 0.0), 2)
+                if state == "open" else 0.0,
+            }
+
+
+class _Outcome:
+    def __init__(self):
+        self.throttled = False
+        self.retry_after = None
+        self.failed = False
+
+    def throttle(self, retry_after=None):
+        self.throttled = True
+        self.retry_after = retry_after
+
+    def fail(self):
+        """The call failed without throttling (5xx, connection or request errors): no limit change"""
+        self.failed = True
+
+
+def retry_after_seconds(error):
+    """Read Retry-After (seconds or HTTP date) from an HttpResponseError"""
+    response = getattr(error, "response", None)
+    return retry_after_from_headers(response.headers) if response is not None else None
+
+
+def retry_after_from_headers(headers):
+    """Seconds to wait from retry-after-ms, x-ms-retry-after-ms or Retry-After (seconds or HTTP date)"""
+    for name in ("retry-after-ms", "x-ms-retry-after-ms"):
+        value = headers.get(name)
+        if value:
+            try:
+                return max(float(value) / 1000, 0.0)
+            except ValueError:
+                pass
+    value = headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except ValueError:
+        pass
+    try:
+        return max(parsedate_to_datetime(value).timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def classify_error(error):
+    """Return "throttled", "transient" or None for an exception raised by an analysis call"""
+    if isinstance(error, HttpResponseError):
+        if error.status_code in THROTTLE_STATUS_CODES:
+            return "throttled"
+        if error.status_code in TRANSIENT_STATUS_CODES:
+            return "transient"
+    return None
+
+
+def is_outage(error):
+    """True for failures that mean the service is busy or unreachable, not that the request was bad"""
+    return classify_error(error) is not None or isinstance(error, (ServiceRequestError, ServiceResponseError))
+
+
+def backoff_delay(attempt, retry_after=None, base=1.0, cap=30.0):
+    """Retry-After when given, else exponential backoff; both with up to 50% added jitter"""
+    delay = retry_after if retry_after else min(cap, base * 2 ** attempt)
+    return min(cap, delay + random.uniform(0, delay * 0.5))
@@ -0,0 +1,67 @@
+import hashlib
+import threading
+from collections import OrderedDict
+
+
+def content_hash(image_data):
+    """Single-pass BLAKE2b digest of the image bytes (faster than MD5 on 64-bit CPUs)"""
+    return hashlib.blake2b(image_data, digest_size=16).hexdigest()
+
+
+class ReceiptCache:
+    """Thread-safe LRU cache of packed receipt results (ReceiptRecord.to_bytes) bounded by total size"""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()  # hash -> (size, result)
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, key):
+        """Return the cached result and mark it most recently used, or None"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+            return entry[1]
+
+    def put(self, key, result):
+        """Cache a result, evicting least recently used entries to stay within the byte budget"""
+        size = len(result)
+        if size > self.max_bytes:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[0]
+            self._entries[key] = (size, result)
+            self._bytes += size
+            while self._bytes > self.max_bytes:
+                _, (evicted_size, _) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self._evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self):
+        """Hit, miss and eviction counters plus current usage"""
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_bytes": self.max_bytes,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
@@ -0,0 +1,162 @@
+import io
+import csv
+import zlib
+from smart_receipt_tracker.receipt_records import DOCUMENT_INTELLIGENCE, parse_quantity
+
+try:
+    import pyarrow
+    import pyarrow.ipc
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+# Rows per CSV chunk or Arrow record batch; memory stays proportional to this, not to the export size
+EXPORT_CHUNK_ROWS = 500
+
+RECEIPT_COLUMNS = ("filename", "success", "merchant_name", "total", "total_amount", "currency", "date", "items",
+                   "items_count", "error", "engine")
+ITEM_COLUMNS = ("filename", "merchant_name", "date", "item_index", "description", "total_price", "amount",
+                "quantity", "quantity_value")
+# Arrow types of the non-string columns
+_COLUMN_TYPES = {"success": "bool_", "total_amount": "float64", "amount": "float64", "item_index": "int64",
+                 "items_count": "int64", "quantity_value": "float64"}
+
+FORMATS = {
+    # format: (mimetype, file extension, gzip the stream)
+    "csv": ("text/csv", "csv", True),
+    "arrow": ("application/vnd.apache.arrow.stream", "arrows", True),
+    # Parquet pages are already compressed
+    "parquet": ("application/vnd.apache.parquet", "parquet", False),
+}
+
+
+class ExportFormatError(ValueError):
+    """Raised for an unknown export format, or a columnar one without pyarrow installed"""
+
+
+def receipt_rows(results):
+    """One row per receipt, with its items flattened into a single text column like the browser export"""
+    for result in results:
+        items = result.get("items") or []
+        yield (
+            result.get("filename"),
+            bool(result.get("success")),
+            result.get("merchant_name"),
+            result.get("total"),
+            result.get("total_amount"),
+            result.get("currency"),
+            result.get("date"),
+            "; ".join(f"{item.get('description') or 'Item'}: {item.get('total_price') or 'N/A'}" for item in items),
+            len(items),
+            result.get("error"),
+            result.get("engine") or DOCUMENT_INTELLIGENCE,
+        )
+
+
+def item_rows(results):
+    """One row per line item from extract_items; receipts without items produce no rows"""
+    for result in results:
+        for index, item in enumerate(result.get("items") or []):
+            yield (
+                result.get("filename"),
+                result.get("merchant_name"),
+                result.get("date"),
+                index,
+                item.get("description"),
+                item.get("total_price"),
+                item.get("amount"),
+                item.get("quantity"),
+                item["quantity_value"] if "quantity_value" in item else parse_quantity(item.get("quantity")),
+            )
+
+
+def _chunks(rows, size):
+    chunk = []
+    for row in rows:
+        chunk.append(row)
+        if len(chunk) == size:
+            yield chunk
+            chunk = []
+    if chunk:
+        yield chunk
+
+
+def iter_csv(rows, columns, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Encode rows as CSV, yielding one bytes chunk per chunk_rows rows"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(columns)
+    for chunk in _chunks(rows, chunk_rows):
+        writer.writerows(chunk)
+        yield buffer.getvalue().encode("utf-8")
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        # Header only: nothing was exported
+        yield buffer.getvalue().encode("utf-8")
+
+
+class _DrainingSink(io.RawIOBase):
+    """Write-only file that hands back whatever was written since the last drain"""
+
+    def __init__(self):
+        self._pending = []
+
+    def writable(self):
+        return True
+
+    def write(self, data):
+        self._pending.append(bytes(data))
+        return len(data)
+
+    def drain(self):
+        data = b"".join(self._pending)
+        self._pending = []
+        return data
+
+
+def iter_columnar(rows, columns, fmt, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Encode rows as an Arrow IPC stream or Parquet file, one record batch (row group) per chunk"""
+    schema = pyarrow.schema([(name, getattr(pyarrow, _COLUMN_TYPES.get(name, "string"))()) for name in columns])
+    sink = _DrainingSink()
+    if fmt == "parquet":
+        writer = pyarrow.parquet.ParquetWriter(sink, schema)
+    else:
+        writer = pyarrow.ipc.new_stream(sink, schema)
+    for chunk in _chunks(rows, chunk_rows):
+        writer.write_batch(pyarrow.RecordBatch.from_arrays(
+            [pyarrow.array(values, type=field.type) for values, field in zip(zip(*chunk), schema)], schema=schema
+        ))
+        yield sink.drain()
+    writer.close()
+    yield sink.drain()
+
+
+def gzip_stream(chunks, level=6):
+    """Gzip a stream of bytes chunks incrementally, flushing each one so clients receive rows as they are encoded"""
+    compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+    for chunk in chunks:
+        yield compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH)
+    yield compressor.flush()
+
+
+def export_results(results, fmt="csv", per="receipt", compress=False, chunk_rows=EXPORT_CHUNK_ROWS):
+    """Stream receipt results as an export; returns (bytes chunk iterator, mimetype, extension, compressed)
+
+    `per` is "receipt" for one row per receipt or "item" for one row per line
+    item. Results are consumed lazily, so a generator over a job's results
+    keeps memory flat however many receipts are exported.
+    """
+    if fmt not in FORMATS:
+        raise ExportFormatError(f"Unknown export format {fmt!r}; use one of {', '.join(FORMATS)}")
+    if per not in ("receipt", "item"):
+        raise ExportFormatError(f"Unknown row type {per!r}; use receipt or item")
+    if fmt != "csv" and pyarrow is None:
+        raise ExportFormatError(f"{fmt} export needs pyarrow installed")
+    mimetype, extension, compressible = FORMATS[fmt]
+    rows, columns = (receipt_rows(results), RECEIPT_COLUMNS) if per == "receipt" else (item_rows(results), ITEM_COLUMNS)
+    chunks = iter_csv(rows, columns, chunk_rows) if fmt == "csv" else iter_columnar(rows, columns, fmt, chunk_rows)
+    compress = compress and compressible
+    if compress:
+        chunks = gzip_stream(chunks)
+    return chunks, mimetype, extension, compress
@@ -0,0 +1,203 @@
+import time
+import uuid
+import logging
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from smart_receipt_tracker.receipt_records import ReceiptRecord
+
+logger = logging.getLogger(__name__)
+
+
+class JobQueueFullError(Exception):
+    """Raised when accepting a job would exceed the queued file limit"""
+
+
+class JobExpiredError(Exception):
+    """Raised when a job's results are dropped while they are still being read"""
+
+
+class ReceiptJob:
+    """A batch of receipts processed in the background, with results recorded as each file finishes
+
+    Each file's result is a tuple of records, one per receipt found in it;
+    the accessors below flatten them, giving every record its file's index.
+    """
+
+    def __init__(self, filenames):
+        self.id = uuid.uuid4().hex
+        self.filenames = filenames
+        self.created_at = time.time()
+        self.finished_at = None
+        self.results = [None] * len(filenames)
+        self.completion_order = []
+        self.result_bytes = 0
+        self.expired = False
+        self._condition = threading.Condition()
+
+    @property
+    def total(self):
+        return len(self.filenames)
+
+    @property
+    def done(self):
+        return len(self.completion_order) == self.total
+
+    def _record(self, index, records):
+        with self._condition:
+            self.results[index] = records
+            self.completion_order.append(index)
+            self.result_bytes += sum(len(record.to_bytes()) for record in records)
+            if self.done:
+                self.finished_at = time.time()
+            self._condition.notify_all()
+
+    def _expire(self):
+        with self._condition:
+            self.expired = True
+            self.results = [None] * self.total
+            self._condition.notify_all()
+
+    def wait(self, timeout=None):
+        """Block until every file has finished; returns False on timeout"""
+        with self._condition:
+            return self._condition.wait_for(lambda: self.done or self.expired, timeout)
+
+    def iter_results(self, timeout=None):
+        """Yield (index, record) pairs in completion order, blocking until each file finishes
+
+        Raises JobExpiredError if the job expires first, so a reader never
+        mistakes the results it got for all of them.
+        """
+        position = 0
+        while position < self.total:
+            with self._condition:
+                if not self._condition.wait_for(
+                        lambda: len(self.completion_order) > position or self.expired, timeout):
+                    return
+                if self.expired:
+                    raise JobExpiredError(f"Job {self.id} expired after {position} of {self.total} files")
+                finished = self.completion_order[position:]
+                ready = [(i, record) for i in finished for record in self.results[i]]
+            position += len(finished)
+            yield from ready
+
+    def status(self, since=0):
+        """Job progress plus results completed after the first `since` completions"""
+        with self._condition:
+            if self.expired:
+                state = "expired"
+            elif self.done:
+                state = "completed"
+            elif self.completion_order:
+                state = "running"
+            else:
+                state = "queued"
+            return {
+                "job_id": self.id,
+                "status": state,
+                "total": self.total,
+                "completed": len(self.completion_order),
+                "results": [
+                    {"index": i, "result": record}
+                    for i in self.completion_order[since:] for record in self.results[i]
+                ] if not self.expired else [],
+                "next": len(self.completion_order),
+            }
+
+    def ordered_results(self, timeout=None):
+        """Wait for every file and return the records in input order; None for files still pending"""
+        with self._condition:
+            self._condition.wait_for(lambda: self.done or self.expired, timeout)
+            return [record for records in self.results for record in (records or (None,))]
+
+
+class ReceiptJobManager:
+    """In-process job queue backed by a bounded worker pool, with job expiry and a result memory limit
+
+    `process(data, filename)` returns a tuple of records for one file.
+    """
+
+    def __init__(self, process, max_workers=8, job_ttl_seconds=600, max_result_bytes=32 * 1024 * 1024,
+                 max_queued_files=200):
+        self._process = process
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="receipt-job")
+        self.job_ttl_seconds = job_ttl_seconds
+        self.max_result_bytes = max_result_bytes
+        self.max_queued_files = max_queued_files
+        self._jobs = {}
+        self._queued_files = 0
+        self._lock = threading.Lock()
+        self._capacity = threading.Condition(self._lock)
+
+    def submit(self, tasks, retain=True, wait=False):
+        """Queue (data, filename) tasks as one job and return it immediately.
+
+        Jobs that are not retained cannot be looked up by id and never expire,
+        which suits callers that wait for the results themselves. With `wait`,
+        a job that does not fit in the queue blocks until enough queued files
+        finish instead of raising JobQueueFullError; it must not hold more
+        than max_queued_files tasks.
+        """
+        if wait and len(tasks) > self.max_queued_files:
+            raise ValueError(f"A waiting job holds at most {self.max_queued_files} files, got {len(tasks)}")
+        self._expire_jobs()
+        job = ReceiptJob([name for _, name in tasks])
+        with self._lock:
+            if wait:
+                self._capacity.wait_for(lambda: self._queued_files + len(tasks) <= self.max_queued_files)
+            elif self._queued_files + len(tasks) > self.max_queued_files:
+                raise JobQueueFullError(
+                    f"Receipt queue is full ({self._queued_files} files waiting, limit {self.max_queued_files})"
+                )
+            self._queued_files += len(tasks)
+            if retain:
+                self._jobs[job.id] = job
+        for index, (data, name) in enumerate(tasks):
+            self._executor.submit(self._run, job, index, data, name)
+        return job
+
+    def get(self, job_id):
+        """Return a job that has not expired, or None"""
+        self._expire_jobs()
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job, index, data, name):
+        try:
+            records = self._process(data, name)
+        except Exception as e:
+            # The file still finishes with a failure record, so nothing waiting on the job hangs
+            logger.error(f"Error processing receipt {name}: {str(e)}")
+            records = (ReceiptRecord.failure(name, f"Processing failed: {str(e)}"),)
+        finally:
+            with self._lock:
+                self._queued_files -= 1
+                self._capacity.notify_all()
+        job._record(index, records)
+
+    def _expire_jobs(self):
+        """Drop finished jobs past their TTL, then the oldest finished jobs while over the memory limit"""
+        now = time.time()
+        with self._lock:
+            finished = sorted(
+                (job for job in self._jobs.values() if job.finished_at is not None),
+                key=lambda job: job.finished_at,
+            )
+            stored_bytes = sum(job.result_bytes for job in self._jobs.values())
+            expired = []
+            for job in finished:
+                if now - job.finished_at > self.job_ttl_seconds or stored_bytes > self.max_result_bytes:
+                    stored_bytes -= job.result_bytes
+                    expired.append(self._jobs.pop(job.id))
+        for job in expired:
+            job._expire()
+
+    def stats(self):
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "running_jobs": sum(1 for job in self._jobs.values() if not job.done),
+                "queued_files": self._queued_files,
+                "result_bytes": sum(job.result_bytes for job in self._jobs.values()),
+                "max_result_bytes": self.max_result_bytes,
+            }
@@ -0,0 +1,210 @@
+import re
+import marshal
+from dataclasses import dataclass, replace
+from json.encoder import encode_basestring_ascii
+
+# Engine that produced a record: the Document Intelligence receipt model, or the local OCR fallback
+DOCUMENT_INTELLIGENCE = "document_intelligence"
+LOCAL_OCR = "local_ocr"
+
+_AMOUNT = re.compile(r"-?\d[\d,.]*")
+_CURRENCY = re.compile(r"[^\d\s.,+-]+")
+
+
+def _json_value(value):
+    """JSON text of a None, bool, str or number field, as json.dumps would write it"""
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, str):
+        return encode_basestring_ascii(value)
+    return repr(value)
+
+
+def parse_amount(text):
+    """Numeric value of printed money such as "$ 12.30", "1,234.50" or "12,30"; None if there is none"""
+    if not text:
+        return None
+    match = _AMOUNT.search(text)
+    if match is None:
+        return None
+    number = match.group().rstrip(".,")
+    if "," in number and "." not in number and len(number.rsplit(",", 1)[1]) == 2:
+        # Decimal comma: "12,30"
+        number = number.replace(",", ".")
+    try:
+        return float(number.replace(",", ""))
+    except ValueError:
+        return None
+
+
+def parse_currency(text):
+    """Currency symbol or code printed around an amount ("$" in "$12.30", "EUR" in "12.30 EUR"), or None"""
+    if not text:
+        return None
+    match = _CURRENCY.search(text)
+    return match.group() if match else None
+
+
+def parse_quantity(value):
+    """Numeric value of a quantity such as 2, "3" or "0.75"; None for text that is not a plain number ("1.5 lb")"""
+    if value is None:
+        return None
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def format_quantity(value):
+    """Printed form of a summed quantity: "3" for whole counts, "1.5" otherwise"""
+    return str(int(value)) if value.is_integer() else str(round(value, 6))
+
+
+@dataclass(slots=True)
+class LineItem:
+    """One grouped receipt line
+
+    `total_price` and `quantity` are the printed text; `amount` and
+    `quantity_value` their numeric values, None when the text is not a number
+    (a weighed "1.5 lb").
+    """
+
+    description: str
+    total_price: str | None = None
+    amount: float | None = None
+    quantity: str = "1"
+    quantity_value: float | None = 1.0
+
+    def add_quantity(self, value):
+        """Count another identical line; only called when both quantities are numeric"""
+        self.quantity_value += value
+        self.quantity = format_quantity(self.quantity_value)
+
+    def to_dict(self):
+        return {
+            "description": self.description,
+            "total_price": self.total_price,
+            "amount": self.amount,
+            "quantity": self.quantity,
+            "quantity_value": self.quantity_value,
+        }
+
+    def to_json(self):
+        return (f'{{"description":{_json_value(self.description)},"total_price":{_json_value(self.total_price)},'
+                f'"amount":{_json_value(self.amount)},"quantity":{_json_value(self.quantity)},'
+                f'"quantity_value":{_json_value(self.quantity_value)}}}')
+
+
+@dataclass(slots=True)
+class ReceiptRecord:
+    """Result of processing one receipt, successful or not
+
+    `total` keeps the printed text the page displays; `total_amount` and
+    `currency` hold the parsed value. `engine` tells Document Intelligence
+    results apart from the coarser local OCR fallback.
+    """
+
+    filename: str
+    success: bool
+    merchant_name: str | None = None
+    total: str | None = None
+    total_amount: float | None = None
+    currency: str | None = None
+    date: str | None = None
+    items: tuple = ()
+    error: str | None = None
+    engine: str = DOCUMENT_INTELLIGENCE
+
+    @classmethod
+    def failure(cls, filename, error, engine=DOCUMENT_INTELLIGENCE):
+        return cls(filename, False, error=error, engine=engine)
+
+    def with_filename(self, filename):
+        """The same result under another upload's filename (duplicates served from the cache)"""
+        return self if filename == self.filename else replace(self, filename=filename)
+
+    def to_dict(self):
+        """The API's JSON shape: the earlier dict results plus the numeric fields"""
+        data = {
+            "filename": self.filename,
+            "success": self.success,
+            "merchant_name": self.merchant_name,
+            "total": self.total,
+            "total_amount": self.total_amount,
+            "currency": self.currency,
+            "date": self.date,
+            "items": [item.to_dict() for item in self.items],
+            "engine": self.engine,
+        }
+        if not self.success:
+            data["error"] = self.error
+        return data
+
+    def to_json(self):
+        """Compact JSON text of to_dict(), written directly from the fields without building dicts"""
+        error = "" if self.success else f',"error":{_json_value(self.error)}'
+        return (f'{{"filename":{_json_value(self.filename)},"success":{_json_value(self.success)},'
+                f'"merchant_name":{_json_value(self.merchant_name)},"total":{_json_value(self.total)},'
+                f'"total_amount":{_json_value(self.total_amount)},"currency":{_json_value(self.currency)},'
+                f'"date":{_json_value(self.date)},"items":[{",".join(item.to_json() for item in self.items)}],'
+                f'"engine":{_json_value(self.engine)}{error}}}')
+
+    def to_bytes(self):
+        """Compact binary form for the in-process cache (marshal: readable only by the same Python version)"""
+        return marshal.dumps((
+            self.filename, self.success, self.merchant_name, self.total, self.total_amount, self.currency,
+            self.date, tuple((i.description, i.total_price, i.amount, i.quantity, i.quantity_value) for i in self.items), self.error,
+            self.engine,
+        ))
+
+    @classmethod
+    def from_bytes(cls, data):
+        *fields, items, error, engine = marshal.loads(data)
+        return cls(*fields, tuple(LineItem(*item) for item in items), error, engine)
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a record from its JSON shape, including results stored before the numeric fields existed"""
+        items = tuple(
+            LineItem(
+                item.get("description") or "",
+                item.get("total_price"),
+                item["amount"] if "amount" in item else parse_amount(item.get("total_price")),
+                str(item.get("quantity") or "1"),
+                item["quantity_value"] if "quantity_value" in item else parse_quantity(item.get("quantity") or "1"),
+            )
+            for item in data.get("items") or ()
+        )
+        total = data.get("total")
+        return cls(
+            data.get("filename"),
+            bool(data.get("success")),
+            data.get("merchant_name"),
+            total,
+            data["total_amount"] if "total_amount" in data else parse_amount(total),
+            data["currency"] if "currency" in data else parse_currency(total),
+            data.get("date"),
+            items,
+            data.get("error"),
+            data.get("engine") or DOCUMENT_INTELLIGENCE,
+        )
+
+
+def pack_records(records):
+    """Packed form of the records of one upload, for the in-process cache"""
+    return marshal.dumps(tuple(record.to_bytes() for record in records))
+
+
+def unpack_records(data):
+    return tuple(ReceiptRecord.from_bytes(item) for item in marshal.loads(data))
+
+
+def json_default(obj):
+    """`default` hook for json.dumps and the Flask JSON provider"""
+    if isinstance(obj, (ReceiptRecord, LineItem)):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
@@ -0,0 +1,158 @@
+import os
+import json
+import time
+import logging
+import sqlite3
+import threading
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS receipts (
+    hash TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created_at REAL NOT NULL,
+    accessed_at REAL NOT NULL
+)
+"""
+_META_SCHEMA = "CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value REAL NOT NULL)"
+
+# Reads only refresh accessed_at when it is older than this, so hits rarely need a write lock
+_TOUCH_INTERVAL_SECONDS = 60
+# Size is enforced every N writes rather than on every insert
+_EVICTION_CHECK_INTERVAL = 20
+
+logger = logging.getLogger(__name__)
+
+
+class ReceiptStore:
+    """Persistent receipt results in SQLite (WAL mode), shared by all worker processes on a host
+
+    WAL needs shared memory between the processes, so the file must be on
+    local disk, never on a network share. Every compact_interval_seconds one
+    process claims the compaction in the database and runs it on a background
+    thread; 0 leaves compaction to explicit compact() calls.
+    """
+
+    def __init__(self, path, max_bytes, compact_interval_seconds=0):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.compact_interval_seconds = compact_interval_seconds
+        self._local = threading.local()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+        self._evictions = 0
+        self._compactions = 0
+        conn = self._connection()
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute(_SCHEMA)
+        conn.execute("CREATE INDEX IF NOT EXISTS receipts_accessed_at ON receipts (accessed_at)")
+        conn.execute(_META_SCHEMA)
+        conn.execute("INSERT OR IGNORE INTO store_meta (key, value) VALUES ('compacted_at', ?)", (time.time(),))
+
+    def _connection(self):
+        """One connection per thread and process; connections are never shared across fork"""
+        conn = getattr(self._local, "conn", None)
+        if conn is None or self._local.pid != os.getpid():
+            conn = sqlite3.connect(self.path, timeout=10, isolation_level=None, check_same_thread=False)
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+            self._local.pid = os.getpid()
+        return conn
+
+    def get(self, key):
+        """Return the stored result for a content hash, or None"""
+        conn = self._connection()
+        row = conn.execute("SELECT result, accessed_at FROM receipts WHERE hash = ?", (key,)).fetchone()
+        with self._lock:
+            if row is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+        now = time.time()
+        if now - row[1] > _TOUCH_INTERVAL_SECONDS:
+            conn.execute("UPDATE receipts SET accessed_at = ? WHERE hash = ?", (now, key))
+        return json.loads(row[0])
+
+    def put(self, key, result):
+        """Store a result, evicting least recently used rows when over the size limit"""
+        payload = json.dumps(result, default=str)
+        now = time.time()
+        conn = self._connection()
+        conn.execute(
+            "INSERT OR REPLACE INTO receipts (hash, result, size, created_at, accessed_at) VALUES (?, ?, ?, ?, ?)",
+            (key, payload, len(payload), now, now),
+        )
+        with self._lock:
+            self._writes += 1
+            check = self._writes % _EVICTION_CHECK_INTERVAL == 0
+        if check:
+            self.evict()
+            if self._claim_compaction():
+                threading.Thread(target=self._compact_in_background, name="receipt-store-compact", daemon=True).start()
+
+    def evict(self):
+        """Delete least recently used rows until the stored results fit in max_bytes"""
+        conn = self._connection()
+        cursor = conn.execute(
+            """
+            DELETE FROM receipts WHERE hash IN (
+                SELECT hash FROM (
+                    SELECT hash, SUM(size) OVER (ORDER BY accessed_at DESC, hash) AS running
+                    FROM receipts
+                ) WHERE running > ?
+            )
+            """,
+            (self.max_bytes,),
+        )
+        with self._lock:
+            self._evictions += cursor.rowcount
+        return cursor.rowcount
+
+    def _claim_compaction(self):
+        """True in the one process whose update moves compacted_at on once the interval has passed"""
+        if not self.compact_interval_seconds:
+            return False
+        now = time.time()
+        cursor = self._connection().execute(
+            "UPDATE store_meta SET value = ? WHERE key = 'compacted_at' AND value <= ?",
+            (now, now - self.compact_interval_seconds),
+        )
+        return cursor.rowcount == 1
+
+    def _compact_in_background(self):
+        try:
+            self.compact()
+        except Exception as e:
+            logger.warning(f"Receipt store compaction failed: {str(e)}")
+
+    def compact(self):
+        """Evict, fold the WAL back into the database file and reclaim free pages"""
+        self.evict()
+        conn = self._connection()
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        conn.execute("VACUUM")
+        conn.execute("UPDATE store_meta SET value = ? WHERE key = 'compacted_at'", (time.time(),))
+        with self._lock:
+            self._compactions += 1
+
+    def stats(self):
+        """Row counts and size for the shared file plus this process's hit/miss counters"""
+        conn = self._connection()
+        entries, size = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM receipts").fetchone()
+        compacted_at = conn.execute("SELECT value FROM store_meta WHERE key = 'compacted_at'").fetchone()[0]
+        with self._lock:
+            lookups = self._hits + self._misses
+            return {
+                "path": self.path,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                "hits": self._hits,
+                "misses": self._misses,
+                "evictions": self._evictions,
+                "compactions": self._compactions,
+                "compacted_at": compacted_at,
+                "hit_ratio": round(self._hits / lookups, 3) if lookups else 0.0,
+            }
@@ -1,9 +1,28 @@
 import os
+import time
 import logging
-import hashlib
+import tempfile
+import threading
+from collections.abc import Mapping
 from azure.ai.documentintelligence import DocumentIntelligenceClient
 from azure.core.credentials import AzureKeyCredential
-from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import Future, ThreadPoolExecutor
+from metrics import AzureCallMetricsPolicy, timer
+from smart_receipt_tracker.receipt_cache import ReceiptCache
+from smart_receipt_tracker.receipt_store import ReceiptStore
+from smart_receipt_tracker.receipt_jobs import JobQueueFullError, ReceiptJobManager
+from smart_receipt_tracker.polling import PollingPolicy, PollingStats
+from smart_receipt_tracker.image_preprocess import ImagePreprocessor
+from smart_receipt_tracker.pdf_pages import PdfPageSplitter
+from smart_receipt_tracker.analyzer_backends import AnalyzerBackend, BackendRouter, LocalOcrBackend
+from smart_receipt_tracker.uploads import SpooledUpload, rewind, upload_hash, upload_size
+from smart_receipt_tracker.receipt_records import (
+    DOCUMENT_INTELLIGENCE, LineItem, ReceiptRecord, pack_records, parse_amount, parse_currency, parse_quantity,
+    unpack_records
+)
+from smart_receipt_tracker.rate_limiter import (
+    AdaptiveConcurrencyLimiter, CircuitBreaker, backoff_delay, classify_error, retry_after_seconds
+)
 
 # Configure logging - reduce verbosity for production
 logging.basicConfig(level=logging.WARNING)
@@ -11,62 +30,314 @@ logger = logging.getLogger(__name__)
 
 # Global client and cache
 _client = None
-_receipt_cache = {}
-_MAX_CACHE_SIZE = 100
+_receipt_cache = ReceiptCache(max_bytes=int(os.environ.get("RECEIPT_CACHE_MAX_BYTES", str(8 * 1024 * 1024))))
+
+# "threads" runs batches on the job worker pool, "async" on the aio client with many analyses in flight
+_PIPELINE = os.environ.get("RECEIPT_PIPELINE", "threads")
+
+# Analyses currently running, keyed by content hash, so duplicates can wait on them
+_in_flight = {}
+_in_flight_lock = threading.Lock()
+_coalesced_calls = 0
+
+# Adaptive limit on concurrent analyses across every pipeline in this process
+_limiter = AdaptiveConcurrencyLimiter(
+    initial_limit=int(os.environ.get("RECEIPT_CONCURRENCY_INITIAL", "4")),
+    max_limit=int(os.environ.get("RECEIPT_CONCURRENCY_MAX", "16")),
+)
+_MAX_ANALYSIS_RETRIES = int(os.environ.get("RECEIPT_MAX_RETRIES", "4"))
+
+# Analyze operations are polled on a short, growing schedule instead of the SDK's fixed interval
+_polling_policy = PollingPolicy(
+    initial_interval=float(os.environ.get("RECEIPT_POLL_INITIAL_SECONDS", "0.25")),
+    multiplier=float(os.environ.get("RECEIPT_POLL_MULTIPLIER", "1.5")),
+    max_interval=float(os.environ.get("RECEIPT_POLL_MAX_SECONDS", "1.0")),
+    honor_retry_after=os.environ.get("RECEIPT_POLL_HONOR_RETRY_AFTER", "true").lower() == "true",
+)
+_polling_stats = PollingStats()
+
+# Opt-in: camera photos are shrunk before upload; results stay keyed by the original bytes.
+# Off by default until receipt_preprocess.py --compare has shown unchanged fields on real receipts
+_preprocessor = ImagePreprocessor(
+    enabled=os.environ.get("RECEIPT_PREPROCESS", "false").lower() == "true",
+    max_dimension=int(os.environ.get("RECEIPT_PREPROCESS_MAX_DIMENSION", "2048")),
+    quality=int(os.environ.get("RECEIPT_PREPROCESS_JPEG_QUALITY", "80")),
+)
+
+# Opt-in: long PDFs of one receipt per page are split into page ranges analyzed in parallel.
+# A receipt that spans a range boundary would be cut in parts, so PDFs are analyzed whole by default
+_pdf_splitter = PdfPageSplitter(
+    enabled=os.environ.get("RECEIPT_PDF_SPLIT", "false").lower() == "true",
+    pages_per_range=int(os.environ.get("RECEIPT_PDF_PAGES_PER_RANGE", "2")),
+    min_pages=int(os.environ.get("RECEIPT_PDF_SPLIT_MIN_PAGES", "10")),
+)
+# Ranges get their own pool: job workers wait on them, so sharing the job pool could deadlock
+_range_executor = ThreadPoolExecutor(
+    max_workers=int(os.environ.get("RECEIPT_PDF_RANGE_WORKERS", "8")), thread_name_prefix="receipt-range"
+)
+
+class DocumentIntelligenceBackend(AnalyzerBackend):
+    """The prebuilt receipt model, with retries under the shared limiter and cached results"""
+
+    name = DOCUMENT_INTELLIGENCE
+
+    def analyze(self, image_data, image_hash, filename):
+        return _analyze_receipt(image_data, image_hash, filename)
+
+# Uploads go to Document Intelligence unless its circuit breaker is open or too many calls are queued
+# for the limiter; then local OCR answers instead, so bursts and outages degrade rather than fail
+_router = BackendRouter(
+    DocumentIntelligenceBackend(),
+    LocalOcrBackend(
+        enabled=os.environ.get("RECEIPT_LOCAL_OCR", "false").lower() == "true",
+        max_workers=int(os.environ.get("RECEIPT_LOCAL_OCR_WORKERS", "2")),
+    ),
+    CircuitBreaker(
+        failure_threshold=int(os.environ.get("RECEIPT_BREAKER_FAILURES", "5")),
+        reset_seconds=float(os.environ.get("RECEIPT_BREAKER_RESET_SECONDS", "30")),
+    ),
+    queue_depth=lambda: _limiter.waiting,
+    max_queue_depth=int(os.environ.get("RECEIPT_FALLBACK_QUEUE_DEPTH", "32")),
+)
+
+# Background job queue shared by the job API and process_multiple_receipts;
+# the limiter, not the pool size, decides how many analyses run at once
+_job_manager = ReceiptJobManager(
+    lambda data, name: _process_job_task(data, name),
+    max_workers=int(os.environ.get("RECEIPT_JOB_WORKERS", "16")),
+    job_ttl_seconds=int(os.environ.get("RECEIPT_JOB_TTL_SECONDS", "600")),
+    max_result_bytes=int(os.environ.get("RECEIPT_JOB_MAX_RESULT_BYTES", str(32 * 1024 * 1024))),
+    max_queued_files=int(os.environ.get("RECEIPT_JOB_MAX_QUEUED_FILES", "200")),
+)
+
+def _open_store():
+    """Open the persistent result store; set RECEIPT_STORE_PATH to an empty string to disable it
+
+    The default is in the local temp directory: the app directory may be a
+    network share (as on App Service), where SQLite's WAL mode is unsafe.
+    """
+    path = os.environ.get("RECEIPT_STORE_PATH", os.path.join(tempfile.gettempdir(), "receipt_results.sqlite3"))
+    if not path:
+        return None
+    try:
+        return ReceiptStore(
+            path,
+            max_bytes=int(os.environ.get("RECEIPT_STORE_MAX_BYTES", str(256 * 1024 * 1024))),
+            compact_interval_seconds=float(os.environ.get("RECEIPT_STORE_COMPACT_SECONDS", "86400")),
+        )
+    except Exception as e:
+        logger.warning(f"Receipt result store disabled: {str(e)}")
+        return None
+
+_receipt_store = _open_store()
 
 def get_client():
     """Get or create Document Intelligence client (singleton pattern)"""
     global _client
     if not _client:
-        endpoint = os.environ.get("DOCUMENT_INTELLIGENCE_ENDPOINT")
+        endpoint = get_endpoint()
         key = os.environ.get("DOCUMENT_INTELLIGENCE_KEY")
-        _client = DocumentIntelligenceClient(endpoint=endpoint, credential=AzureKeyCredential(key))
+        _client = DocumentIntelligenceClient(
+            endpoint=endpoint, credential=AzureKeyCredential(key),
+            per_call_policies=[AzureCallMetricsPolicy("document_intelligence")]
+        )
     return _client
 
-def process_receipt_image(image_data, filename="receipt.jpg"):
-    """Process a single receipt with caching"""
-    # Check cache first
+def get_endpoint():
+    """Document Intelligence endpoint from the environment"""
+    return os.environ.get("DOCUMENT_INTELLIGENCE_ENDPOINT")
+
+def process_receipt_file(image_data, filename="receipt.jpg"):
+    """Process an uploaded image or PDF (bytes or a SpooledUpload) with caching
+
+    Returns a tuple with one ReceiptRecord per receipt found in the upload,
+    or a single failed record. The router picks Document Intelligence or,
+    while it is failing or backed up, the local OCR fallback.
+    """
     try:
-        image_hash = hashlib.md5(image_data).hexdigest()
-        if image_hash in _receipt_cache:
-            return _receipt_cache[image_hash]
-    except Exception:
-        pass
+        # Check cache first; duplicates keep their own filename
+        with timer("receipt_stage_duration_seconds", stage="hash"):
+            image_hash = upload_hash(image_data)
+        cached = lookup_cached_result(image_hash)
+        if cached is not None:
+            return label_records(cached, filename)
+
+        # Identical images already being analyzed wait for that analysis instead of starting another
+        future, leader = join_in_flight(image_hash)
+        if not leader:
+            return label_records(future.result(), filename)
+        try:
+            records = _router.analyze(image_data, image_hash, filename)
+            future.set_result(records)
+            return records
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            leave_in_flight(image_hash)
+    except Exception as e:
+        logger.error(f"Error processing receipt {filename}: {str(e)}")
+        return (_create_error_response(filename, str(e)),)
+
+def process_receipt_image(image_data, filename="receipt.jpg"):
+    """Process an upload expected to hold one receipt and return its first ReceiptRecord"""
+    return process_receipt_file(image_data, filename)[0]
+
+def label_records(records, filename):
+    """The records of one upload under its filename; several receipts are numbered "name#1", "name#2", ..."""
+    if len(records) == 1:
+        return (records[0].with_filename(filename),)
+    return tuple(record.with_filename(f"{filename}#{number}") for number, record in enumerate(records, 1))
+
+def join_in_flight(image_hash):
+    """Return (future, is_leader) for an image hash, registering a new analysis if none is running"""
+    global _coalesced_calls
+    with _in_flight_lock:
+        future = _in_flight.get(image_hash)
+        if future is not None:
+            _coalesced_calls += 1
+            return future, False
+        future = Future()
+        _in_flight[image_hash] = future
+        return future, True
+
+def leave_in_flight(image_hash):
+    """Forget a finished analysis; later duplicates are served from the cache"""
+    with _in_flight_lock:
+        _in_flight.pop(image_hash, None)
+
+def _analyze_receipt(image_data, image_hash, filename):
+    """Run Document Intelligence on an upload, page ranges of a long PDF in parallel, and cache the records"""
+    client = get_client()
+    ranges = _pdf_splitter.split(image_data)
+    if ranges is None:
+        with timer("receipt_stage_duration_seconds", stage="preprocess"):
+            upload = _preprocessor.process(image_data)
+        results = [_analyze_document(client, upload, filename)]
+    else:
+        # Every range holds a limiter slot while it is analyzed, like any other receipt
+        results = list(_range_executor.map(lambda part: _analyze_document(client, part, filename), ranges))
+    with timer("receipt_stage_duration_seconds", stage="extract"):
+        records = extract_receipts(results, filename)
     
+    # Cache result
+    cache_result(image_hash, records)
+    return records
+
+def _analyze_document(client, upload, filename):
+    """Analyze one upload under the shared concurrency limiter, retrying throttled and transient failures"""
+    for attempt in range(_MAX_ANALYSIS_RETRIES + 1):
+        with _limiter.slot() as outcome:
+            try:
+                # Submit status retries are done here rather than in the SDK so throttling reaches the
+                # limiter; polls keep the SDK retries, so a throttled poll never re-uploads the document
+                polling = _polling_policy.create(upload_size(upload), get_endpoint())
+                with timer("receipt_stage_duration_seconds", stage="submit"):
+                    poller = client.begin_analyze_document(
+                        model_id="prebuilt-receipt",
+                        body=rewind(upload),
+                        content_type="application/octet-stream",
+                        polling=polling,
+                        retry_status=0
+                    )
+                with timer("receipt_stage_duration_seconds", stage="poll"):
+                    result = poller.result()
+                _polling_stats.record(polling)
+                break
+            except Exception as e:
+                kind = classify_error(e)
+                retry_after = retry_after_seconds(e)
+                if kind == "throttled":
+                    outcome.throttle(retry_after)
+                else:
+                    outcome.fail()
+                if kind is None or attempt == _MAX_ANALYSIS_RETRIES:
+                    raise
+        delay = backoff_delay(attempt, retry_after)
+        logger.warning(f"Receipt {filename} {kind} (attempt {attempt + 1}), retrying in {delay:.1f}s")
+        time.sleep(delay)
+    return result
+
+def lookup_cached_result(image_hash):
+    """Return the cached records of an upload from memory or the persistent store, or None"""
+    cached = _receipt_cache.get(image_hash)
+    if cached is not None:
+        return unpack_records(cached)
+    return _load_stored_result(image_hash)
+
+def cache_result(image_hash, records):
+    """Cache an upload's records in memory in packed form, and persist them when every extraction succeeded"""
+    _receipt_cache.put(image_hash, pack_records(records))
+    if all(record.success for record in records):
+        _save_stored_result(image_hash, records)
+
+def _load_stored_result(image_hash):
+    """Look up the persistent store and promote hits into the in-memory cache"""
+    if _receipt_store is None:
+        return None
     try:
-        client = get_client()
-        poller = client.begin_analyze_document(
-            model_id="prebuilt-receipt",
-            body=image_data,
-            content_type="application/octet-stream"
-        )
-        result = poller.result()
-        data = extract_receipt_data(result, filename)
-        
-        # Cache result
-        _cache_result(image_data, data)
-        return data
+        stored = _receipt_store.get(image_hash)
     except Exception as e:
-        logger.error(f"Error processing receipt {filename}: {str(e)}")
-        return _create_error_response(filename, str(e))
+        logger.warning(f"Receipt store read failed: {str(e)}")
+        return None
+    if stored is None:
+        return None
+    records = tuple(ReceiptRecord.from_dict(data) for data in _stored_receipts(stored))
+    _receipt_cache.put(image_hash, pack_records(records))
+    return records
 
-def _cache_result(image_data, result):
-    """Cache a processed result"""
+def _stored_receipts(stored):
+    """Receipt dicts of a stored row: uploads with several receipts are stored as {"receipts": [...]}"""
+    return stored["receipts"] if "receipts" in stored else (stored,)
+
+def _save_stored_result(image_hash, records):
+    """Persist successful records; store failures never fail the request"""
+    if _receipt_store is None:
+        return
     try:
-        image_hash = hashlib.md5(image_data).hexdigest()
-        if len(_receipt_cache) >= _MAX_CACHE_SIZE:
-            # Simple LRU - remove first item
-            _receipt_cache.pop(next(iter(_receipt_cache)))
-        _receipt_cache[image_hash] = result
-    except Exception:
-        pass
-
-def process_multiple_receipts(images_data):
-    """Process multiple receipts in parallel using thread pool"""
-    if not images_data:
-        return {"results": []}
-    
-    # Create processing tasks
+        if len(records) == 1:
+            _receipt_store.put(image_hash, records[0].to_dict())
+        else:
+            _receipt_store.put(image_hash, {"receipts": [record.to_dict() for record in records]})
+    except Exception as e:
+        logger.warning(f"Receipt store write failed: {str(e)}")
+
+def compact_store():
+    """Evict over-budget rows and compact the persistent store file"""
+    if _receipt_store is not None:
+        _receipt_store.compact()
+
+def preprocessing_enabled():
+    """Whether uploads are shrunk before analysis; the web page shrinks images in the browser to match"""
+    return _preprocessor.enabled
+
+def get_cache_stats():
+    """Receipt cache statistics for this worker process"""
+    stats = {"memory": _receipt_cache.stats()}
+    if _receipt_store is not None:
+        try:
+            stats["store"] = _receipt_store.stats()
+        except Exception as e:
+            stats["store"] = {"error": str(e)}
+    return stats
+
+def get_processor_stats():
+    """Cache, in-flight, job queue, rate limiter, polling, preprocessing, PDF and backend statistics for this worker"""
+    with _in_flight_lock:
+        in_flight = {"analyses": len(_in_flight), "coalesced": _coalesced_calls}
+    return {
+        "cache": get_cache_stats(),
+        "in_flight": in_flight,
+        "jobs": _job_manager.stats(),
+        "rate_limiter": _limiter.stats(),
+        "polling": _polling_stats.stats(),
+        "preprocess": _preprocessor.stats(),
+        "pdf_pages": _pdf_splitter.stats(),
+        "backends": _router.stats(),
+    }
+
+def _build_tasks(images_data):
+    """Normalize raw bytes or {"data", "filename"} dicts into (data, filename) tasks"""
     tasks = []
     for img in images_data:
         if isinstance(img, dict) and "data" in img:
@@ -76,57 +347,152 @@ def process_multiple_receipts(images_data):
             data = img
             name = "receipt.jpg"
         tasks.append((data, name))
+    return tasks
+
+def _process_job_task(image_data, filename):
+    """Process one queued receipt; jobs own their spooled uploads and delete them when done"""
+    try:
+        return process_receipt_file(image_data, filename)
+    finally:
+        if isinstance(image_data, SpooledUpload):
+            image_data.close()
+
+def submit_receipt_job(images_data, retain=True):
+    """Queue receipts for background processing and return the job without waiting"""
+    tasks = _build_tasks(images_data)
+    try:
+        return _job_manager.submit(tasks, retain=retain)
+    except JobQueueFullError:
+        # A rejected job never runs, so its spooled uploads are deleted here
+        for data, _ in tasks:
+            if isinstance(data, SpooledUpload):
+                data.close()
+        raise
+
+def get_receipt_job(job_id):
+    """Look up a background job by id; None if unknown or expired"""
+    return _job_manager.get(job_id)
+
+def process_multiple_receipts(images_data, pipeline=None):
+    """Process multiple receipts in parallel on the shared job worker pool or the asyncio pipeline
+
+    Results keep input order; a file holding several receipts contributes one
+    record per receipt in place.
+    """
+    if not images_data:
+        return {"results": []}
+
+    if (pipeline or _PIPELINE) == "async":
+        # Imported lazily: the async pipeline builds on this module
+        from smart_receipt_tracker.async_processor import run_multiple_receipts
+        return run_multiple_receipts(images_data)
     
-    # Process in parallel with thread pool (optimized for I/O bound operations)
-    with ThreadPoolExecutor(max_workers=4) as executor:
-        results = list(executor.map(
-            lambda args: process_receipt_image(*args),
-            tasks
-        ))
-    
-    return {"results": results}
+    # Unlike the job API, a blocking batch is never rejected: it is queued in pieces
+    # the queue can hold, each waiting for room behind the work already queued
+    tasks = _build_tasks(images_data)
+    size = _job_manager.max_queued_files
+    jobs = [
+        _job_manager.submit(tasks[start:start + size], retain=False, wait=True) for start in range(0, len(tasks), size)
+    ]
+    return {"results": [record for job in jobs for record in job.ordered_results()]}
+
+def extract_receipts(results, filename):
+    """One record per receipt document across the analyze results of an upload (its page ranges, in order)"""
+    try:
+        documents = [document for result in results for document in (result.documents or ())]
+    except Exception as e:
+        logger.error(f"Error extracting receipt data: {str(e)}")
+        return (_create_error_response(filename, f"Data extraction failed: {str(e)}"),)
+    if not documents:
+        return (_create_error_response(filename, "No receipt found"),)
+    return label_records(tuple(extract_document_data(document, filename) for document in documents), filename)
 
 def extract_receipt_data(result, filename):
-    """Extract data from receipt with simplified logic"""
+    """Extract the first receipt of an analyze result"""
     try:
         if not result.documents or len(result.documents) == 0:
             return _create_error_response(filename, "No receipt found")
-        
-        document = result.documents[0]
+    except Exception as e:
+        logger.error(f"Error extracting receipt data: {str(e)}")
+        return _create_error_response(filename, f"Data extraction failed: {str(e)}")
+    return extract_document_data(result.documents[0], filename)
+
+def extract_document_data(document, filename):
+    """Extract data from one receipt document with simplified logic"""
+    try:
         fields = document.fields or {}
         
         merchant_name = extract_field(fields.get("MerchantName")) or extract_field(fields.get("Merchant"))
-        total = extract_field(fields.get("Total")) or extract_field(fields.get("TotalAmount"))
+        total_field = fields.get("Total") or fields.get("TotalAmount")
+        total = extract_field(total_field)
+        total_amount, currency = extract_amount(total_field)
         date = extract_field(fields.get("TransactionDate")) or extract_field(fields.get("Date"))
         
-        return {
-            "filename": filename,
-            "success": True,
-            "merchant_name": merchant_name,
-            "total": total,
-            "date": date,
-            "items": extract_items(fields.get("Items"))
-        }
+        return ReceiptRecord(
+            filename=filename,
+            success=True,
+            merchant_name=merchant_name,
+            total=total,
+            total_amount=total_amount,
+            currency=currency,
+            date=date,
+            items=extract_items(fields.get("Items"))
+        )
     except Exception as e:
         logger.error(f"Error extracting receipt data: {str(e)}")
         return _create_error_response(filename, f"Data extraction failed: {str(e)}")
 
+# REST names of the DocumentField properties read during extraction. SDK models are Mappings over the
+# REST payload, and reading them by key is far cheaper than through their attribute properties.
+_REST_KEYS = {
+    "content": "content",
+    "value_string": "valueString",
+    "value_date": "valueDate",
+    "value_number": "valueNumber",
+    "value_currency": "valueCurrency",
+    "value_array": "valueArray",
+    "value_object": "valueObject",
+    "value": "value",
+}
+_DESCRIPTION_FIELDS = ("Description", "Name", "ProductName", "ItemName")
+_PRICE_FIELDS = ("TotalPrice", "Price", "Amount")
+_field_readers = {}
+
+def _read_by_key(field, name):
+    return field.get(_REST_KEYS[name])
+
+def _read_by_attribute(field, name):
+    return getattr(field, name, None)
+
+def _field_reader(field):
+    """Accessor for a field's type, resolved once per type: by REST key for Mappings, else by attribute"""
+    field_type = type(field)
+    reader = _field_readers.get(field_type)
+    if reader is None:
+        reader = _field_readers[field_type] = _read_by_key if isinstance(field, Mapping) else _read_by_attribute
+    return reader
+
 def extract_field(field):
     """Unified field extraction for all field types"""
     if not field:
         return None
+    read = _field_reader(field)
     
     # Try different field attributes in order of likelihood
-    if hasattr(field, 'content') and field.content:
-        return str(field.content).strip()
-    if hasattr(field, 'value_string') and field.value_string:
-        return str(field.value_string).strip()
-    if hasattr(field, 'value_date') and field.value_date:
-        return str(field.value_date)
-    if hasattr(field, 'value_number') and field.value_number is not None:
-        return str(field.value_number)
-    if hasattr(field, 'value_currency') and field.value_currency:
-        currency = field.value_currency
+    value = read(field, "content")
+    if value:
+        return str(value).strip()
+    value = read(field, "value_string")
+    if value:
+        return str(value).strip()
+    value = read(field, "value_date")
+    if value:
+        return str(value)
+    value = read(field, "value_number")
+    if value is not None:
+        return str(value)
+    currency = read(field, "value_currency")
+    if currency:
         symbol = currency.get('currencySymbol', '')
         amount = currency.get('amount', '')
         try:
@@ -134,93 +500,89 @@ def extract_field(field):
         except Exception:
             amount = str(amount)
         return f"{symbol} {amount}" if symbol and amount else str(currency)
-    if hasattr(field, 'value') and field.value is not None:
-        return str(field.value).strip()
-    if isinstance(field, dict):
-        # Simplified dict handling
-        if "content" in field:
-            return str(field["content"]).strip()
+    value = read(field, "value")
+    if value is not None:
+        return str(value).strip()
     
-    return str(field).strip() if field else None
+    return str(field).strip()
+
+def extract_amount(field):
+    """(amount, currency) of a money field: the service's parsed value, else parsed from the printed text"""
+    if not field:
+        return None, None
+    read = _field_reader(field)
+    currency = read(field, "value_currency")
+    if currency:
+        amount = currency.get('amount')
+        code = currency.get('currencyCode') or currency.get('currencySymbol')
+        if amount is not None:
+            return float(amount), code
+    number = read(field, "value_number")
+    if number is not None:
+        return float(number), None
+    text = extract_field(field)
+    return parse_amount(text), parse_currency(text)
+
+def _extract_quantity(field):
+    """(printed text, numeric value) of a Quantity field; ("1", 1.0) when there is none"""
+    text = extract_field(field)
+    if not text:
+        return "1", 1.0
+    number = _field_reader(field)(field, "value_number")
+    return text, float(number) if number is not None else parse_quantity(text)
+
+def _first_field(fields, names):
+    """(field, text) of the first of `names` with any text, or (None, None)"""
+    for name in names:
+        field = fields.get(name)
+        text = extract_field(field)
+        if text:
+            return field, text
+    return None, None
 
 def extract_items(items_field):
-    """Extract and group receipt items with simplified logic"""
-    items = []
+    """Extract receipt items and group identical lines into LineItem records in a single pass"""
+    if not items_field:
+        return ()
+    grouped = {}  # (description, printed price) -> LineItem
     
     try:
         # Get items list based on field type
-        items_list = None
-        if hasattr(items_field, 'value_array'):
-            items_list = items_field.value_array
-        elif hasattr(items_field, 'value') and isinstance(items_field.value, list):
+        items_list = _field_reader(items_field)(items_field, "value_array")
+        if items_list is None and isinstance(getattr(items_field, 'value', None), list):
             items_list = items_field.value
-            
         if not items_list:
-            return items
+            return ()
         
-        # Process each item
         for idx, item in enumerate(items_list):
-            if not item or not hasattr(item, 'value_object'):
+            if not item:
+                continue
+            fields = _field_reader(item)(item, "value_object")
+            if fields is None:
                 continue
-                
-            fields = item.value_object
-            
-            # Extract item fields
-            description = (extract_field(fields.get('Description')) or 
-                          extract_field(fields.get('Name')) or 
-                          extract_field(fields.get('ProductName')) or 
-                          extract_field(fields.get('ItemName')) or 
-                          f'Item {idx + 1}')
-            
-            price = (extract_field(fields.get('TotalPrice')) or 
-                    extract_field(fields.get('Price')) or 
-                    extract_field(fields.get('Amount')))
-            
-            quantity = extract_field(fields.get('Quantity'))
             
-            items.append({
-                'description': description,
-                'total_price': price,
-                'quantity': quantity or "1"
-            })
-        
-        # Group identical items
-        grouped = {}
-        for item in items:
-            key = f"{item['description']}|{item['total_price']}"
+            description = _first_field(fields, _DESCRIPTION_FIELDS)[1] or f'Item {idx + 1}'
+            price_field, price = _first_field(fields, _PRICE_FIELDS)
+            quantity, quantity_value = _extract_quantity(fields.get('Quantity'))
             
-            if key in grouped:
-                current_qty = int(grouped[key]['quantity']) if grouped[key]['quantity'].isdigit() else 1
-                new_qty = int(item['quantity']) if item['quantity'].isdigit() else 1
-                grouped[key]['quantity'] = str(current_qty + new_qty)
+            # Identical lines (same description and printed price) are counted, not repeated;
+            # a line whose quantity is not a number ("1.5 lb") is kept on its own
+            key = (description, price) if quantity_value is not None else (description, price, idx)
+            line = grouped.get(key)
+            if line is None:
+                grouped[key] = LineItem(description, price, extract_amount(price_field)[0], quantity, quantity_value)
             else:
-                grouped[key] = item.copy()
-        
-        # Format descriptions with quantity prefix
-        final_items = []
-        for item in grouped.values():
-            qty = item['quantity']
-            desc = item['description']
-            
-            if qty != "1" and not desc.startswith(f"{qty}x "):
-                item['description'] = f"{qty}x {desc}"
-            
-            final_items.append(item)
-        
-        return final_items
+                line.add_quantity(quantity_value)
     
     except Exception as e:
         logger.error(f"Error extracting items: {str(e)}")
-        return items  # Return empty list on error
+    
+    # Format descriptions with quantity prefix
+    for line in grouped.values():
+        if line.quantity_value != 1 and not line.description.startswith(f"{line.quantity}x "):
+            line.description = f"{line.quantity}x {line.description}"
+    return tuple(grouped.values())
 
 def _create_error_response(filename, error_message):
     """Create consistent error response"""
-    return {
-        "filename": filename,
-        "success": False,
-        "error": error_message,
-        "merchant_name": None,
-        "total": None,
-        "date": None,
-        "items": []
-    }
\ No newline at end of file
+    return ReceiptRecord.failure(filename, error_message)
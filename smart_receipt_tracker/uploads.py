@@ -0,0 +1,100 @@
+import io
+import hashlib
+import tempfile
+from metrics import timer
+from smart_receipt_tracker.receipt_cache import content_hash
+
+_CHUNK_SIZE = 64 * 1024
+
+
+class SpooledUpload(io.RawIOBase):
+    """An uploaded receipt spooled to memory or a temp file, hashed while it is written
+
+    Small uploads stay in memory; larger ones roll over to a temporary file that
+    is deleted when the upload is closed or garbage collected. The digest matches
+    content_hash() of the same bytes, so cache keys do not depend on how a
+    receipt arrived.
+    """
+
+    def __init__(self, filename="receipt.jpg", max_memory=256 * 1024):
+        super().__init__()
+        self.filename = filename
+        self.size = 0
+        self._file = tempfile.SpooledTemporaryFile(max_size=max_memory)
+        self._hash = hashlib.blake2b(digest_size=16)
+
+    @property
+    def hash(self):
+        return self._hash.hexdigest()
+
+    def readable(self):
+        return True
+
+    def writable(self):
+        return True
+
+    def seekable(self):
+        return True
+
+    def write(self, data):
+        self._hash.update(data)
+        self.size += len(data)
+        return self._file.write(data)
+
+    def read(self, size=-1):
+        return self._file.read(size)
+
+    def readinto(self, buffer):
+        data = self._file.read(len(buffer))
+        buffer[:len(data)] = data
+        return len(data)
+
+    def seek(self, offset, whence=io.SEEK_SET):
+        return self._file.seek(offset, whence)
+
+    def tell(self):
+        return self._file.tell()
+
+    def getvalue(self):
+        """Whole upload as bytes, for consumers that cannot stream"""
+        self._file.seek(0)
+        return self._file.read()
+
+    def close(self):
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
+def spool_upload(stream, filename="receipt.jpg", max_memory=256 * 1024):
+    """Copy a readable stream into a SpooledUpload in fixed-size chunks and rewind it"""
+    with timer("receipt_stage_duration_seconds", stage="upload"):
+        upload = SpooledUpload(filename, max_memory=max_memory)
+        while True:
+            chunk = stream.read(_CHUNK_SIZE)
+            if not chunk:
+                break
+            upload.write(chunk)
+        upload.seek(0)
+    return upload
+
+
+def upload_hash(image_data):
+    """Content hash of raw bytes or a SpooledUpload, without re-reading spooled data"""
+    if isinstance(image_data, SpooledUpload):
+        return image_data.hash
+    return content_hash(image_data)
+
+
+def upload_size(image_data):
+    """Size in bytes of raw bytes or a SpooledUpload"""
+    if isinstance(image_data, SpooledUpload):
+        return image_data.size
+    return len(image_data)
+
+
+def rewind(image_data):
+    """Return the upload ready to be sent from its first byte"""
+    if isinstance(image_data, SpooledUpload):
+        image_data.seek(0)
+    return image_data
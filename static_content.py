@@ -0,0 +1,121 @@
+import os
+import gzip
+import hashlib
+import logging
+import mimetypes
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+# Pages are not versioned, so browsers may reuse them briefly and then revalidate with If-None-Match
+PAGE_MAX_AGE = int(os.environ.get("PAGE_CACHE_MAX_AGE", "60"))
+PAGE_CACHE_CONTROL = f"public, max-age={PAGE_MAX_AGE}, must-revalidate"
+# Versioned asset URLs change whenever the content does, so their responses never need revalidating
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+
+# Content-Encoding values in order of preference; identity is the fallback
+ENCODINGS = ("br", "gzip")
+
+
+def compress_variants(body):
+    """Return {content_encoding: bytes} with identity plus every encoding that makes the body smaller"""
+    variants = {"identity": body}
+    if brotli is not None:
+        compressed = brotli.compress(body, quality=11)
+        if len(compressed) < len(body):
+            variants["br"] = compressed
+    compressed = gzip.compress(body, compresslevel=9, mtime=0)
+    if len(compressed) < len(body):
+        variants["gzip"] = compressed
+    return variants
+
+
+def negotiate_encoding(variants, accept_encodings):
+    """Pick the preferred encoding the client accepts among the available variants"""
+    for encoding in ENCODINGS:
+        if encoding in variants and accept_encodings[encoding] > 0:
+            return encoding
+    return "identity"
+
+
+class PrebuiltResponse:
+    """A response body built once and served precompressed, with a strong ETag per encoding
+
+    Each encoding is a different representation, so each gets its own ETag.
+    A matching If-None-Match is answered with an empty 304, and byte ranges
+    are served from the uncompressed body.
+    """
+
+    def __init__(self, body, mimetype, cache_control=PAGE_CACHE_CONTROL):
+        if isinstance(body, str):
+            body = body.encode("utf-8")
+        self.mimetype = mimetype
+        self.cache_control = cache_control
+        self.length = len(body)
+        self.variants = compress_variants(body)
+        digest = hashlib.blake2b(body, digest_size=16).hexdigest()
+        self.version = digest[:12]
+        self.etags = {encoding: digest if encoding == "identity" else f"{digest}-{encoding}"
+                      for encoding in self.variants}
+
+    def response(self, cache_control=None):
+        """Build the response for the current request"""
+        # Range offsets refer to the uncompressed bytes, so range requests always get the identity body
+        encoding = "identity" if request.range else negotiate_encoding(self.variants, request.accept_encodings)
+        response = Response(self.variants[encoding], mimetype=self.mimetype)
+        if encoding != "identity":
+            response.headers["Content-Encoding"] = encoding
+        response.set_etag(self.etags[encoding])
+        response.headers["Cache-Control"] = cache_control or self.cache_control
+        response.vary.add("Accept-Encoding")
+        return response.make_conditional(request, accept_ranges=True, complete_length=self.length)
+
+    def stats(self):
+        return {encoding: len(body) for encoding, body in self.variants.items()}
+
+
+class StaticAssets:
+    """Files from an explicit manifest, read once at startup and served from memory
+
+    Only manifest paths are served. Each file is available at its plain path,
+    which browsers revalidate, and at a versioned URL that embeds a content
+    hash and is cached as immutable.
+    """
+
+    def __init__(self, root, manifest, prefix="/static"):
+        self.prefix = prefix
+        self._assets = {}
+        for path in manifest:
+            try:
+                with open(os.path.join(root, path), "rb") as f:
+                    body = f.read()
+            except OSError as e:
+                logger.warning(f"Static asset {path} not loaded: {e}")
+                continue
+            mimetype = mimetypes.guess_type(path)[0] or "application/octet-stream"
+            self._assets[path] = PrebuiltResponse(body, mimetype)
+
+    def url(self, path):
+        """Versioned URL of a manifest file, for links that should be cached forever"""
+        return f"{self.prefix}/{self._assets[path].version}/{path}"
+
+    def response(self, path, version=None):
+        """Response for a manifest file, or None if the path is not in the manifest
+
+        With a `version` the response is cacheable as immutable; a stale version
+        is answered with the file's current content, revalidated like a plain path.
+        """
+        asset = self._assets.get(path)
+        if asset is None:
+            return None
+        if version == asset.version:
+            return asset.response(IMMUTABLE_CACHE_CONTROL)
+        return asset.response()
+
+    def stats(self):
+        return {path: asset.stats() for path, asset in self._assets.items()}